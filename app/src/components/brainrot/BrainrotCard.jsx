@@ -3,6 +3,7 @@ import { useDraggable } from '@dnd-kit/core'
 import { useBulkSelection } from '../../contexts/BulkSelectionContext'
 import { Check, X, ChevronDown, ChevronUp, Search, Plus, Minus, GripVertical, ArrowRight } from 'lucide-react'
 import { MUTATIONS, TRAITS, quickCalculateIncome } from '../../utils/incomeCalculator'
+import { placeholderStyle, clearPlaceholder } from '../../utils/thumbnailPlaceholder'
 
 /**
  * Brainrot Card - Individual brainrot card in detail view
@@ -163,11 +164,14 @@ export default function BrainrotCard({
             src={`/${brainrot.image}`}
             alt={brainrot.name}
             className="w-full h-32 object-contain rounded-t-lg bg-slate-900/30 p-2 transition-all"
-            style={isOwned && collectionEntry?.mutation && collectionEntry.mutation !== 'none' 
-              ? { 
-                  boxShadow: `0 0 0 2px ${MUTATIONS[collectionEntry.mutation]?.color || '#888'}` 
-                }
-              : {}}
+            loading="lazy"
+            style={{
+              ...placeholderStyle(brainrot),
+              ...(isOwned && collectionEntry?.mutation && collectionEntry.mutation !== 'none'
+                ? { boxShadow: `0 0 0 2px ${MUTATIONS[collectionEntry.mutation]?.color || '#888'}` }
+                : {})
+            }}
+            onLoad={clearPlaceholder}
             onError={(e) => {
               e.target.style.display = 'none'
             }}
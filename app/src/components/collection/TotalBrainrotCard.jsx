@@ -1,5 +1,6 @@
 import { Users, TrendingUp, DollarSign } from 'lucide-react'
 import { MUTATIONS, TRAITS } from '../../utils/incomeCalculator'
+import { placeholderStyle, clearPlaceholder } from '../../utils/thumbnailPlaceholder'
 
 /**
  * Total Brainrot Card - Shows brainrot ownership across all accounts
@@ -59,6 +60,9 @@ export default function TotalBrainrotCard({ brainrot, accounts, collections, onV
             src={`/${brainrot.image}`}
             alt={brainrot.name}
             className="w-full h-36 object-contain rounded-t-lg bg-slate-900/30 p-2"
+            loading="lazy"
+            style={placeholderStyle(brainrot)}
+            onLoad={clearPlaceholder}
             onError={(e) => {
               e.target.style.display = 'none'
             }}
@@ -0,0 +1,23 @@
+/**
+ * Thumbnail Placeholder
+ * Blur-up for card thumbnails: the tiny `image_placeholder` data URI from
+ * brainrots.json (scripts/build_placeholders.py) is drawn as the <img>
+ * background until the real thumbnail has loaded
+ */
+
+// Background style showing a brainrot's placeholder (empty if it has none)
+export function placeholderStyle(brainrot) {
+  if (!brainrot?.image_placeholder) return {}
+  return {
+    backgroundImage: `url(${brainrot.image_placeholder})`,
+    backgroundSize: 'contain',
+    backgroundPosition: 'center',
+    backgroundRepeat: 'no-repeat',
+    backgroundOrigin: 'content-box'
+  }
+}
+
+// onLoad handler: drop the placeholder so it doesn't show through transparent pixels
+export function clearPlaceholder(e) {
+  e.target.style.backgroundImage = 'none'
+}
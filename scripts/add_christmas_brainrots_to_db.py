@@ -3,34 +3,30 @@
 Add Christmas brainrots to main database
 """
 
-import json
 import re
 
+from catalogue_db import CatalogueConflict, CatalogueDB
+from catalogue_io import load_json
+
 def kebab_case(text):
     """Convert text to kebab-case"""
     text = re.sub(r'[^\w\s-]', '', text.lower())
     text = re.sub(r'[-\s]+', '-', text)
     return text.strip('-')
 
-def load_json(filename):
-    """Load JSON file"""
-    with open(filename, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def save_json(data, filename):
-    """Save JSON file"""
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
 def main():
     print("=" * 80)
     print("🎄 ADDING CHRISTMAS BRAINROTS TO DATABASE")
     print("=" * 80)
     
-    # Load existing database
+    # Open the catalogue database (app/public/brainrots.json is exported from it)
     print("\n📖 Loading current database...")
-    current_db = load_json('app/public/brainrots.json')
-    print(f"   Current count: {len(current_db)}")
+    try:
+        db = CatalogueDB()
+    except CatalogueConflict as e:
+        print(f"❌ {e}")
+        return
+    print(f"   Current count: {db.count()}")
     
     # Load Christmas brainrots
     print("\n🎅 Loading Christmas brainrots...")
@@ -96,16 +92,16 @@ def main():
     christmas_br.extend(additional_christmas)
     
     # Create a set of existing names
-    existing_names = {br['name'].lower() for br in current_db}
+    existing_names = {br['name'].lower() for br in db.all()}
     
     # Add Christmas brainrots to database
-    added_count = 0
+    new_entries = []
     skipped_count = 0
     
     for christmas in christmas_br:
         name = christmas['name']
         
-        if name.lower() in existing_names:
+        if name.lower() in existing_names or db.get(kebab_case(name)):
             print(f"  ⏭️  Skipping {name} (already exists)")
             skipped_count += 1
             continue
@@ -123,21 +119,20 @@ def main():
         image_name = name.replace(' ', '_')
         entry["image"] = f"thumbnails/{image_name}.png"
         
-        current_db.append(entry)
+        new_entries.append(entry)
+        existing_names.add(name.lower())
         print(f"  ✅ Added {name} ({christmas['rarity']}, ${christmas['income_per_second']:,}/s)")
-        added_count += 1
-    
-    # Sort by income (handle None values)
-    current_db.sort(key=lambda x: x.get('income_per_second', 0) or 0)
     
-    # Save updated database
+    # Insert in one transaction, then regenerate brainrots.json (sorted by income, then id)
     print(f"\n💾 Saving updated database...")
-    save_json(current_db, 'app/public/brainrots.json')
+    added_count = db.upsert_many(new_entries)
+    db.export_json()
     
     print(f"\n✅ Done!")
     print(f"   Added: {added_count}")
     print(f"   Skipped: {skipped_count}")
-    print(f"   New total: {len(current_db)}")
+    print(f"   New total: {db.count()}")
+    db.close()
     
     print("\n" + "=" * 80)
 
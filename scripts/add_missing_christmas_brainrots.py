@@ -3,19 +3,23 @@ Add Missing Christmas Brainrots
 Adds List List List Sahur and Please my Present to the database
 """
 
-import json
-import requests
 from pathlib import Path
 
+import thumbnail_store
+from catalogue_db import CatalogueConflict, CatalogueDB
+from wiki_page import scaled_image
+
 def add_missing_christmas_brainrots():
     """Add List List List Sahur and Please my Present to the database."""
     
-    # Load existing database
-    db_path = Path("app/public/brainrots.json")
-    with open(db_path, 'r', encoding='utf-8') as f:
-        brainrots = json.load(f)
+    # Open the catalogue database (app/public/brainrots.json is exported from it)
+    try:
+        db = CatalogueDB()
+    except CatalogueConflict as e:
+        print(f"❌ {e}")
+        return
     
-    print(f"📊 Current database has {len(brainrots)} brainrots")
+    print(f"📊 Current database has {db.count()} brainrots")
     
     # New brainrots to add
     new_brainrots = [
@@ -39,31 +43,28 @@ def add_missing_christmas_brainrots():
         }
     ]
     
-    # Check if already exist
-    existing_names = {br['name'] for br in brainrots}
+    # Check if already exist (indexed lookups by id and normalized name)
     added_count = 0
     
     for new_br in new_brainrots:
-        if new_br['name'] in existing_names:
+        if db.get(new_br['id']) or db.find_by_name(new_br['name']):
             print(f"⏭️  {new_br['name']} already exists - skipping")
         else:
-            brainrots.append(new_br)
+            db.upsert(new_br)
             added_count += 1
             print(f"✅ Added: {new_br['name']}")
     
     if added_count == 0:
         print("ℹ️  No new brainrots to add")
+        db.close()
         return
     
-    # Sort by income_per_second
-    brainrots.sort(key=lambda x: x.get('income_per_second') or 0)
-    
-    # Save updated database
-    with open(db_path, 'w', encoding='utf-8') as f:
-        json.dump(brainrots, f, indent=2, ensure_ascii=False)
+    # Regenerate brainrots.json (sorted by income, then id)
+    db.export_json()
     
-    print(f"\n✅ Database updated! Now has {len(brainrots)} brainrots")
+    print(f"\n✅ Database updated! Now has {db.count()} brainrots")
     print(f"📝 Added {added_count} new brainrots")
+    db.close()
 
 def download_thumbnails():
     """Download thumbnails for the new brainrots."""
@@ -75,6 +76,7 @@ def download_thumbnails():
     
     thumb_dir = Path("app/public/thumbnails")
     thumb_dir.mkdir(parents=True, exist_ok=True)
+    store = thumbnail_store.get_store()
     
     for name, url in thumbnails.items():
         # Convert name to filename
@@ -88,15 +90,13 @@ def download_thumbnails():
         
         try:
             print(f"📥 Downloading {name}...")
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            store.put_url(scaled_image(url), filename)
             
             print(f"✅ Downloaded: {filename}")
         except Exception as e:
             print(f"❌ Failed to download {name}: {e}")
+    
+    store.save()
 
 if __name__ == "__main__":
     print("🎄 Adding Missing Christmas Brainrots 🎄\n")
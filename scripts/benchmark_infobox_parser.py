@@ -0,0 +1,138 @@
+"""
+Benchmark Infobox Parser Backends
+Times each infobox_parser backend on saved wiki HTML and checks that they
+all extract the same fields as the full BeautifulSoup parse.
+
+Pages used:
+- data/wiki_brainrots_list_debug.html (large page, no infobox)
+- the same page with a sample brainrot infobox injected
+- recorded brainrot pages from the HTTP cache (data/http_cache/*.body)
+- any *.html files in --pages DIR
+"""
+
+import argparse
+import glob
+import os
+import time
+
+import infobox_parser
+
+DEBUG_HTML = 'data/wiki_brainrots_list_debug.html'
+CACHE_GLOB = 'data/http_cache/*.body'
+
+SAMPLE_INFOBOX = '''
+<aside role="region" class="portable-infobox pi-background pi-border-color pi-theme-wikia pi-layout-default">
+  <h2 class="pi-item pi-item-spacing pi-title" data-source="title1">Sample Brainrot</h2>
+  <figure class="pi-item pi-image" data-source="image1">
+    <a href="https://static.wikia.nocookie.net/stealabr/images/0/00/Sample.png/revision/latest" class="image image-thumbnail">
+      <img src="https://static.wikia.nocookie.net/stealabr/images/0/00/Sample.png/revision/latest/scale-to-width-down/268" class="pi-image-thumbnail" width="268" height="268">
+    </a>
+  </figure>
+  <div class="pi-item pi-data pi-item-spacing pi-border-color" data-source="rarity">
+    <h3 class="pi-data-label pi-secondary-font">Rarity</h3>
+    <div class="pi-data-value pi-font"><a href="/wiki/Secret">Secret</a></div>
+  </div>
+  <div class="pi-item pi-data pi-item-spacing pi-border-color" data-source="cost">
+    <h3 class="pi-data-label pi-secondary-font">Cost</h3>
+    <div class="pi-data-value pi-font">$<b>1.2B</b></div>
+  </div>
+  <div class="pi-item pi-data pi-item-spacing pi-border-color" data-source="income">
+    <h3 class="pi-data-label pi-secondary-font">Income</h3>
+    <div class="pi-data-value pi-font">$7.5M/s</div>
+  </div>
+</aside>
+'''
+
+
+def load_pages(pages_dir=None):
+    """Collect (label, html bytes) pairs to benchmark"""
+    pages = []
+
+    if os.path.exists(DEBUG_HTML):
+        with open(DEBUG_HTML, 'rb') as f:
+            debug = f.read()
+        pages.append(('brainrots list (no infobox)', debug))
+
+        marker = b'<div class="mw-parser-output">'
+        if marker in debug:
+            injected = debug.replace(marker, marker + SAMPLE_INFOBOX.encode('utf-8'), 1)
+        else:
+            injected = debug + SAMPLE_INFOBOX.encode('utf-8')
+        pages.append(('brainrots list + sample infobox', injected))
+
+    recorded = sorted(glob.glob(CACHE_GLOB))
+    if pages_dir:
+        recorded += sorted(glob.glob(os.path.join(pages_dir, '*.html')))
+
+    for path in recorded:
+        with open(path, 'rb') as f:
+            content = f.read()
+        if b'portable-infobox' in content:
+            pages.append((os.path.basename(path), content))
+
+    return pages
+
+
+def time_backend(backend, html, repeat):
+    """Best-of-`repeat` seconds for one parse"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        infobox_parser.parse_infobox(html, backend)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark infobox parser backends')
+    parser.add_argument('--pages', metavar='DIR', help='extra directory of saved brainrot pages (*.html)')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per page and backend (default: 5)')
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages)
+    if not pages:
+        print(f"❌ No pages found (expected {DEBUG_HTML} or {CACHE_GLOB})")
+        return
+
+    backends = infobox_parser.available_backends()
+    print("=" * 80)
+    print("⏱️  INFOBOX PARSER BENCHMARK")
+    print("=" * 80)
+    print(f"\nBackends: {', '.join(backends)}")
+    print(f"Pages: {len(pages)} (best of {args.repeat} runs each)\n")
+
+    totals = {backend: 0.0 for backend in backends}
+    mismatches = 0
+
+    for label, html in pages:
+        expected = infobox_parser.parse_infobox(html, 'soup')
+        timings = []
+
+        for backend in backends:
+            result = infobox_parser.parse_infobox(html, backend)
+            if result['fields'] != expected['fields'] or result['found'] != expected['found']:
+                mismatches += 1
+                print(f"  ⚠️  {backend} disagrees with soup on {label}")
+
+            seconds = time_backend(backend, html, args.repeat)
+            totals[backend] += seconds
+            timings.append(f"{backend} {seconds * 1000:7.2f} ms")
+
+        print(f"{label[:40]:40}  {len(html) // 1024:5} KB  " + '  '.join(timings))
+
+    print("\n" + "=" * 80)
+    print("📊 TOTAL")
+    print("=" * 80)
+    baseline = totals.get('soup') or 1
+    for backend in backends:
+        print(f"  {backend:10} {totals[backend] * 1000:9.2f} ms   {baseline / totals[backend]:6.1f}x vs soup")
+
+    if mismatches:
+        print(f"\n⚠️  {mismatches} result mismatches")
+    else:
+        print("\n✅ All backends extracted identical fields")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,10 @@ import json
 import os
 import re
 
+import catalogue_columns
+from catalogue_db import CatalogueDB
+from catalogue_io import save_brainrots
+
 def normalize_name(name):
     """Normalize brainrot name for ID generation"""
     # Remove special characters, convert to lowercase
@@ -183,9 +187,6 @@ def build_fresh_brainrots():
         
         fresh_brainrots.append(brainrot)
     
-    # Sort by name
-    fresh_brainrots.sort(key=lambda x: x['name'])
-    
     # Statistics
     print("\n" + "=" * 60)
     print("\n📊 Statistics:")
@@ -228,11 +229,15 @@ def build_fresh_brainrots():
         os.rename(output_path, backup_path)
         print(f"   Backed up old file to: {backup_path}")
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(fresh_brainrots, f, indent=2, ensure_ascii=False)
+    save_brainrots(fresh_brainrots, output_path)
     
     print(f"✅ Saved {len(fresh_brainrots)} brainrots")
     
+    # Columnar snapshot for the analysis tools (needs numpy)
+    if catalogue_columns.numpy is not None:
+        columns = catalogue_columns.build_columns(output_path)
+        print(f"✅ Columnar snapshot: {columns.directory}")
+    
     # Copy to app/public/
     print("\n📋 Copying to app/public/brainrots.json...")
     app_output_path = 'app/public/brainrots.json'
@@ -246,10 +251,13 @@ def build_fresh_brainrots():
         os.rename(app_output_path, app_backup_path)
         print(f"   Backed up app version to: {app_backup_path}")
     
-    with open(app_output_path, 'w', encoding='utf-8') as f:
-        json.dump(fresh_brainrots, f, indent=2, ensure_ascii=False)
+    # A fresh build replaces every row, so don't sync the (old) JSON into the database first
+    db = CatalogueDB(json_path=app_output_path, sync=False)
+    db.replace_all(fresh_brainrots)
+    db.export_json(force=True)
+    db.close()
     
-    print(f"✅ Copied to app/public/")
+    print(f"✅ Copied to app/public/ (through {db.path})")
     
     # Summary
     print("\n" + "=" * 60)
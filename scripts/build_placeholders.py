@@ -0,0 +1,129 @@
+"""
+Thumbnail Placeholders (LQIP)
+Adds an `image_placeholder` to every brainrot in app/public/brainrots.json:
+a 16px-wide WebP of its thumbnail as a data URI (~150 bytes), so cards can
+show a blurred preview immediately while the real thumbnail loads
+(BrainrotCard / TotalBrainrotCard via app/src/utils/thumbnailPlaceholder.js):
+
+    {"image": "thumbnails/Strawberry_Elephant.png",
+     "image_placeholder": "data:image/webp;base64,UklGR..."}
+
+Placeholders are computed across a process pool and cached by the sha256 of
+the thumbnail in data/thumbnail_placeholders.json, so only new or changed
+thumbnails are processed. Rows that got a new placeholder are upserted into
+the catalogue database (catalogue_db.py), which then re-exports
+brainrots.json. Rerun after anything that rebuilds the catalogue from
+scratch (e.g. build_fresh_brainrots.py).
+
+    python scripts/build_placeholders.py
+"""
+
+import base64
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+import downloads
+import thumbnail_store
+from catalogue_db import JSON_PATH as DB_PATH, CatalogueConflict, CatalogueDB
+CACHE_PATH = Path('data/thumbnail_placeholders.json')
+PUBLIC_DIR = thumbnail_store.THUMB_DIR.parent
+
+PLACEHOLDER_WIDTH = 16
+WEBP_QUALITY = 40
+
+
+def make_placeholder(path):
+    """data: URI of a tiny WebP version of an image
+
+    Top-level so process pools can pickle it.
+    """
+    with Image.open(path) as image:
+        image = image.convert('RGBA')
+        width, height = image.size
+        small = image.resize((PLACEHOLDER_WIDTH, max(1, round(height * PLACEHOLDER_WIDTH / width))),
+                             Image.Resampling.BOX)
+
+    buffer = io.BytesIO()
+    small.save(buffer, format='WEBP', quality=WEBP_QUALITY)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def build_placeholders(brainrots, cache, workers=None):
+    """Set `image_placeholder` on every brainrot with a thumbnail on disk
+
+    `cache` is {sha256: placeholder} and is updated in place (entries for
+    thumbnails no longer in use are dropped). Returns the number of
+    placeholders computed.
+    """
+    digests = {}
+    for br in brainrots:
+        path = PUBLIC_DIR / br['image'] if br.get('image') else None
+        if path and path.is_file():
+            digests[br['image']] = thumbnail_store.hash_file(path)[0]
+
+    # One job per image that is not cached yet (shared images only once)
+    todo = {}
+    for image, digest in digests.items():
+        if digest not in cache:
+            todo.setdefault(digest, str(PUBLIC_DIR / image))
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for digest, placeholder in zip(todo, pool.map(make_placeholder, todo.values(), chunksize=8)):
+                cache[digest] = placeholder
+
+    for br in brainrots:
+        digest = digests.get(br.get('image'))
+        if digest:
+            br['image_placeholder'] = cache[digest]
+        else:
+            br.pop('image_placeholder', None)
+
+    for digest in set(cache) - set(digests.values()):
+        del cache[digest]
+
+    return len(todo)
+
+
+def main():
+    print("=" * 80)
+    print("🌫️  BUILDING THUMBNAIL PLACEHOLDERS")
+    print("=" * 80)
+
+    try:
+        db = CatalogueDB()
+    except CatalogueConflict as e:
+        print(f"❌ {e}")
+        return
+    brainrots = db.all()
+
+    cache = {}
+    if CACHE_PATH.exists():
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+
+    before = [br.get('image_placeholder') for br in brainrots]
+    computed = build_placeholders(brainrots, cache)
+    changed = sum(1 for old, br in zip(before, brainrots) if old != br.get('image_placeholder'))
+
+    downloads.write_bytes(CACHE_PATH, json.dumps(dict(sorted(cache.items())), indent=2).encode('utf-8'))
+
+    if changed:
+        # Only the rows that got a new placeholder are rewritten
+        db.upsert_many(brainrots)
+        db.export_json()
+    db.close()
+
+    with_placeholder = sum(1 for br in brainrots if br.get('image_placeholder'))
+    print(f"\n✅ {with_placeholder}/{len(brainrots)} brainrots have a placeholder")
+    print(f"🔄 Computed: {computed}, updated in catalogue: {changed}")
+    if not changed:
+        print(f"⏭️  {DB_PATH} unchanged, not rewritten")
+
+
+if __name__ == '__main__':
+    main()
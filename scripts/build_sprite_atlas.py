@@ -0,0 +1,231 @@
+"""
+Sprite Atlas Builder
+Packs every brainrot thumbnail into a few large WebP atlases so the Total
+Collection grid can draw ~440 cards from a handful of image requests.
+
+Each thumbnail is scaled to fit a TILE_SIZE box and placed with shelf
+(first-fit decreasing height) bin packing. app/public/thumbnail_atlas.json
+maps every brainrot id to its sprite:
+
+    {"sprites": {"strawberry-elephant": {"atlas": "thumbnails/atlas/atlas-0.webp",
+                                         "x": 0, "y": 0, "w": 128, "h": 120}},
+     "atlases": {"atlas-0.webp": {"width": 2048, "height": 1536,
+                                  "members": {"strawberry-elephant": "<sha256>"}}}}
+
+Brainrots keep the atlas they were placed in, so adding, removing or
+changing a thumbnail only re-renders the atlas it belongs to. Identical
+images (same sha256) in one atlas share a single sprite.
+
+    python scripts/build_sprite_atlas.py            # rebuild changed atlases
+    python scripts/build_sprite_atlas.py --force    # repack everything
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+import downloads
+import thumbnail_store
+from catalogue_io import load_brainrots
+
+DB_PATH = Path('app/public/brainrots.json')
+PUBLIC_DIR = thumbnail_store.THUMB_DIR.parent
+ATLAS_DIR = thumbnail_store.THUMB_DIR / 'atlas'
+MANIFEST_PATH = PUBLIC_DIR / 'thumbnail_atlas.json'
+
+# Card image size in CSS pixels; atlases are square textures of ATLAS_SIZE
+TILE_SIZE = 128
+ATLAS_SIZE = 2048
+PADDING = 2
+WEBP_OPTIONS = {'format': 'WEBP', 'quality': 85, 'method': 6}
+
+
+def tile_size(size, box=TILE_SIZE):
+    """Size of an image scaled down (never up) to fit a box x box tile"""
+    width, height = size
+    scale = min(1, box / width, box / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def pack(sizes, width=ATLAS_SIZE, height=ATLAS_SIZE, padding=PADDING):
+    """Shelf packing (first-fit, decreasing height)
+
+    `sizes` is {key: (w, h)}. Returns ({key: (x, y)}, used height), or None
+    if the items do not fit in one width x height atlas.
+    """
+    shelves = []  # [top, height, used width]
+    placements = {}
+    bottom = 0
+
+    for key, (w, h) in sorted(sizes.items(), key=lambda item: (-item[1][1], -item[1][0], item[0])):
+        padded_w, padded_h = w + padding, h + padding
+        for shelf in shelves:
+            if padded_h <= shelf[1] and shelf[2] + padded_w <= width:
+                placements[key] = (shelf[2], shelf[0])
+                shelf[2] += padded_w
+                break
+        else:
+            if bottom + padded_h > height or padded_w > width:
+                return None
+            shelves.append([bottom, padded_h, padded_w])
+            placements[key] = (0, bottom)
+            bottom += padded_h
+
+    return placements, bottom
+
+
+def render_atlas(path, tiles, placements, height):
+    """Draw one atlas. `tiles` is {digest: (source path, (w, h))}
+
+    Top-level so process pools can pickle it.
+    """
+    atlas = Image.new('RGBA', (ATLAS_SIZE, max(1, height)), (0, 0, 0, 0))
+    for digest, (source, size) in tiles.items():
+        with Image.open(source) as image:
+            tile = image.convert('RGBA').resize(size, Image.Resampling.LANCZOS)
+        atlas.paste(tile, placements[digest])
+
+    with downloads.atomic_write(path) as f:
+        atlas.save(f, **WEBP_OPTIONS)
+    return path
+
+
+def load_members(db_path=DB_PATH):
+    """{id: {'path', 'sha256', 'size'}} for every brainrot with a thumbnail on disk"""
+    brainrots = load_brainrots(db_path, mutable=False)
+
+    members = {}
+    for br in brainrots:
+        path = PUBLIC_DIR / br['image'] if br.get('id') and br.get('image') else None
+        if not path or not path.is_file():
+            continue
+        with Image.open(path) as image:
+            size = tile_size(image.size)
+        members[br['id']] = {'path': str(path), 'sha256': thumbnail_store.hash_file(path)[0], 'size': size}
+    return members
+
+
+def atlas_sizes(ids, members):
+    """Tile sizes to pack for a set of ids (one tile per unique image)"""
+    return {members[i]['sha256']: members[i]['size'] for i in ids}
+
+
+def build_atlases(force=False, workers=None):
+    """Place new thumbnails, re-render changed atlases and rewrite the manifest
+
+    Returns (atlases rendered, atlases unchanged).
+    """
+    members = load_members()
+    settings = {'tile_size': TILE_SIZE, 'atlas_size': ATLAS_SIZE, 'padding': PADDING, 'webp': WEBP_OPTIONS}
+
+    manifest = {}
+    if MANIFEST_PATH.exists() and not force:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    if manifest.get('settings') != settings:
+        manifest = {}
+    old_atlases = manifest.get('atlases', {})
+    old_sprites = manifest.get('sprites', {})
+
+    # Keep every brainrot in its previous atlas; an atlas is dirty when any member changed
+    atlases = {}
+    dirty = set()
+    placed = set()
+    for name, atlas in old_atlases.items():
+        ids = [i for i in atlas['members'] if i in members]
+        if not ids:
+            continue
+        atlases[name] = ids
+        placed.update(ids)
+        if (len(ids) != len(atlas['members'])
+                or any(atlas['members'][i] != members[i]['sha256'] for i in ids)
+                or not (ATLAS_DIR / name).exists()):
+            dirty.add(name)
+
+    # A changed thumbnail may no longer fit: move the overflow out
+    queue = sorted(set(members) - placed)
+    for name in sorted(dirty):
+        while len(atlases[name]) > 1 and pack(atlas_sizes(atlases[name], members)) is None:
+            queue.append(atlases[name].pop())
+
+    # New brainrots go into the first atlas with room, else a new atlas
+    for br_id in queue:
+        for name, ids in atlases.items():
+            if pack(atlas_sizes(ids + [br_id], members)) is not None:
+                ids.append(br_id)
+                dirty.add(name)
+                break
+        else:
+            index = 0
+            while f"atlas-{index}.webp" in atlases:
+                index += 1
+            name = f"atlas-{index}.webp"
+            atlases[name] = [br_id]
+            dirty.add(name)
+
+    ATLAS_DIR.mkdir(parents=True, exist_ok=True)
+    result = {'settings': settings, 'sprites': {}, 'atlases': {}}
+    jobs = []
+    for name, ids in sorted(atlases.items()):
+        atlas_path = (ATLAS_DIR / name).relative_to(PUBLIC_DIR).as_posix()
+        if name in dirty:
+            placements, height = pack(atlas_sizes(ids, members))
+            tiles = {members[i]['sha256']: (members[i]['path'], members[i]['size']) for i in ids}
+            jobs.append((str(ATLAS_DIR / name), tiles, placements, height))
+            for i in ids:
+                (x, y), (w, h) = placements[members[i]['sha256']], members[i]['size']
+                result['sprites'][i] = {'atlas': atlas_path, 'x': x, 'y': y, 'w': w, 'h': h}
+        else:
+            height = old_atlases[name]['height']
+            for i in ids:
+                result['sprites'][i] = old_sprites[i]
+        result['atlases'][name] = {
+            'width': ATLAS_SIZE,
+            'height': height,
+            'members': {i: members[i]['sha256'] for i in sorted(ids)}
+        }
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(render_atlas, *zip(*jobs)))
+
+    # Atlases left without members
+    for path in ATLAS_DIR.glob('*.webp'):
+        if path.name not in atlases:
+            os.remove(path)
+
+    result['sprites'] = dict(sorted(result['sprites'].items()))
+    downloads.write_bytes(MANIFEST_PATH, json.dumps(result, indent=2).encode('utf-8'))
+
+    return len(jobs), len(atlases) - len(jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pack thumbnails into sprite atlases')
+    parser.add_argument('--force', action='store_true', help='repack and re-render every atlas')
+    parser.add_argument('--workers', type=int, help='processes to use (default: one per core)')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("🧩 BUILDING SPRITE ATLASES")
+    print("=" * 80)
+
+    rendered, unchanged = build_atlases(args.force, args.workers)
+
+    with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    print(f"\n🖼️  Sprites:  {len(manifest['sprites'])}")
+    for name, atlas in manifest['atlases'].items():
+        print(f"   {name}: {len(atlas['members'])} brainrots, {atlas['width']}x{atlas['height']}")
+    print(f"✅ Rendered: {rendered}")
+    print(f"⏭️  Unchanged: {unchanged}")
+    print(f"📄 Manifest: {MANIFEST_PATH}")
+
+
+if __name__ == '__main__':
+    main()
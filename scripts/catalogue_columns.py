@@ -0,0 +1,276 @@
+"""
+Columnar Catalogue Snapshot
+Writes a catalogue file (data/brainrots.json by default) as a folder of
+NumPy arrays (one .npy file per column) that analysis tools memory-map
+instead of parsing the JSON. Each source file gets its own folder:
+
+    data/catalogue_columns/data_brainrots/        (app/public/brainrots.json
+                                                   -> app_public_brainrots/)
+        cost.npy        int64   (MISSING = -1)
+        income.npy      int64   income_per_second (MISSING = -1)
+        rarity.npy      uint8   code into meta.json "rarities"
+        has_image.npy   bool
+        id.npy / id_offsets.npy      UTF-8 string table
+        name.npy / name_offsets.npy  UTF-8 string table
+        meta.json       row count, rarity table, source file signature
+
+Loading maps the files (np.load(mmap_mode='r')), so startup cost does not
+grow with the catalogue; aggregates are vectorized:
+
+    columns = load_columns()
+    columns.rarity_counts()          # {'secret': 143, 'brainrot_god': 79, ...}
+    columns.rarity_counts(~columns.has_image)
+
+The snapshot records the content hash of the JSON it was built from
+(catalogue_io.content_hash, read from the .sha256 sidecar when there is
+one); load_columns() rebuilds it when that hash changed. NumPy is
+optional for the rest of the scripts (pip install numpy).
+
+    python scripts/catalogue_columns.py            # build if stale + stats
+    python scripts/catalogue_columns.py --build    # always rebuild
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+import downloads
+from catalogue_io import DATA_DB_PATH, content_hash, load_brainrots
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+COLUMNS_ROOT = Path('data/catalogue_columns')
+FORMAT_VERSION = 1
+
+MISSING = -1
+
+# Fixed codes for the known rarities (display order); others get appended
+RARITIES = ['common', 'rare', 'epic', 'legendary', 'mythic', 'brainrot_god', 'og', 'secret', 'unknown']
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("numpy is not installed (pip install numpy)")
+
+
+def columns_dir(source=DATA_DB_PATH):
+    """Snapshot folder for a catalogue file (data/brainrots.json -> data_brainrots)"""
+    return COLUMNS_ROOT / Path(source).with_suffix('').as_posix().strip('./').replace('/', '_')
+
+
+def _source_signature(path):
+    return {'path': os.fspath(path), 'sha256': content_hash(path)}
+
+
+def _int_column(records, field):
+    """int64 column with MISSING for absent/null values (fractions are rounded)"""
+    values = [record.get(field) for record in records]
+    return numpy.array([MISSING if value is None else round(value) for value in values], dtype=numpy.int64)
+
+
+def _string_table(strings):
+    """(UTF-8 bytes as uint8, int64 end offsets) for a list of strings"""
+    encoded = [(s or '').encode('utf-8') for s in strings]
+    offsets = numpy.cumsum([len(b) for b in encoded], dtype=numpy.int64)
+    return numpy.frombuffer(b''.join(encoded), dtype=numpy.uint8), offsets
+
+
+def _save_array(directory, name, array):
+    with downloads.atomic_write(directory / f"{name}.npy") as f:
+        numpy.save(f, array, allow_pickle=False)
+
+
+class StringTable:
+    """Read-only list of strings over a memory-mapped UTF-8 blob + offsets"""
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        start = int(self.offsets[index - 1]) if index > 0 else 0
+        return bytes(self.data[start:int(self.offsets[index])]).decode('utf-8')
+
+    def take(self, indices):
+        """Strings at an index array or boolean mask"""
+        if getattr(indices, 'dtype', None) == bool:
+            indices = numpy.flatnonzero(indices)
+        return [self[int(i)] for i in indices]
+
+
+class CatalogueColumns:
+    """Column arrays of one snapshot plus vectorized aggregates"""
+
+    def __init__(self, directory, meta, mmap_mode='r'):
+        self.directory = Path(directory)
+        self.meta = meta
+        self.rarities = meta['rarities']
+
+        def array(name):
+            return numpy.load(self.directory / f"{name}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+
+        self.cost = array('cost')
+        self.income = array('income')
+        self.rarity = array('rarity')
+        self.has_image = array('has_image')
+        self.ids = StringTable(array('id'), array('id_offsets'))
+        self.names = StringTable(array('name'), array('name_offsets'))
+
+    def __len__(self):
+        return self.meta['count']
+
+    def rarity_code(self, rarity):
+        return self.rarities.index(rarity)
+
+    def rarity_mask(self, rarity):
+        return self.rarity == self.rarity_code(rarity)
+
+    def rarity_counts(self, mask=None):
+        """{rarity: count} in RARITIES order, optionally only for rows in `mask`"""
+        codes = self.rarity if mask is None else self.rarity[mask]
+        counts = numpy.bincount(codes, minlength=len(self.rarities))
+        return {rarity: int(count) for rarity, count in zip(self.rarities, counts) if count}
+
+    def complete(self):
+        """Mask of rows that have both cost and income"""
+        return (self.cost != MISSING) & (self.income != MISSING)
+
+    def income_per_cost(self):
+        """float64 income/cost ratio (NaN where either is missing or cost is 0)"""
+        valid = self.complete() & (self.cost > 0)
+        ratio = numpy.full(len(self), numpy.nan)
+        ratio[valid] = self.income[valid] / self.cost[valid]
+        return ratio
+
+    def names_by_rarity(self, mask):
+        """{rarity: sorted names} for rows in `mask`"""
+        grouped = {}
+        for code, rarity in enumerate(self.rarities):
+            selected = mask & (self.rarity == code)
+            if selected.any():
+                grouped[rarity] = sorted(self.names.take(selected))
+        return grouped
+
+
+def build_columns(source=DATA_DB_PATH, directory=None):
+    """Write the snapshot for `source`; returns the loaded CatalogueColumns"""
+    _require_numpy()
+    directory = Path(directory or columns_dir(source))
+    signature = _source_signature(source)
+    records = load_brainrots(source, mutable=False)
+
+    rarities = list(RARITIES)
+    for record in records:
+        rarity = record.get('rarity') or 'unknown'
+        if rarity not in rarities:
+            rarities.append(rarity)
+    if len(rarities) > 255:
+        raise ValueError(f"Too many distinct rarities for a uint8 code: {len(rarities)}")
+    codes = {rarity: code for code, rarity in enumerate(rarities)}
+
+    ids, id_offsets = _string_table([record.get('id') for record in records])
+    names, name_offsets = _string_table([record.get('name') for record in records])
+    columns = {
+        'cost': _int_column(records, 'cost'),
+        'income': _int_column(records, 'income_per_second'),
+        'rarity': numpy.array([codes[record.get('rarity') or 'unknown'] for record in records], dtype=numpy.uint8),
+        'has_image': numpy.array([bool(record.get('image')) for record in records], dtype=bool),
+        'id': ids,
+        'id_offsets': id_offsets,
+        'name': names,
+        'name_offsets': name_offsets,
+    }
+
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, array in columns.items():
+        _save_array(directory, name, array)
+
+    # meta.json goes last: a snapshot is only valid once it matches the source
+    meta = {'version': FORMAT_VERSION, 'count': len(records), 'rarities': rarities, 'source': signature}
+    downloads.write_bytes(directory / 'meta.json', json.dumps(meta, indent=2).encode('utf-8'))
+    return CatalogueColumns(directory, meta)
+
+
+def read_meta(directory):
+    path = Path(directory) / 'meta.json'
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def is_current(meta, source=DATA_DB_PATH):
+    """True if the snapshot was built from the current contents of `source`"""
+    return (meta is not None
+            and meta.get('version') == FORMAT_VERSION
+            and meta.get('source') == _source_signature(source))
+
+
+def load_columns(source=DATA_DB_PATH, directory=None, rebuild=True):
+    """Memory-mapped snapshot of `source`, rebuilt first if it is stale
+
+    With rebuild=False a stale or missing snapshot returns None.
+    """
+    _require_numpy()
+    directory = directory or columns_dir(source)
+    meta = read_meta(directory)
+    if is_current(meta, source):
+        return CatalogueColumns(directory, meta)
+    if not rebuild:
+        return None
+    return build_columns(source, directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Columnar catalogue snapshot')
+    parser.add_argument('--source', default=DATA_DB_PATH, help=f'catalogue JSON (default: {DATA_DB_PATH})')
+    parser.add_argument('--build', action='store_true', help='rebuild even if the snapshot is current')
+    args = parser.parse_args()
+
+    if numpy is None:
+        print("❌ numpy is not installed (pip install numpy)")
+        return
+
+    print("=" * 80)
+    print("🧮 COLUMNAR CATALOGUE SNAPSHOT")
+    print("=" * 80)
+
+    directory = columns_dir(args.source)
+    if args.build or not is_current(read_meta(directory), args.source):
+        columns = build_columns(args.source)
+        print(f"\n💾 Built {directory} from {args.source}")
+    else:
+        columns = load_columns(args.source)
+        print(f"\n⏭️  {directory} is up to date")
+
+    complete = columns.complete()
+    print(f"\n📊 Brainrots: {len(columns)}")
+    print(f"   Complete data (cost+income): {int(complete.sum())}")
+    print(f"   Has thumbnail: {int(columns.has_image.sum())}")
+
+    print("\n   Rarity breakdown:")
+    for rarity, count in columns.rarity_counts().items():
+        print(f"      {rarity}: {count}")
+
+    missing = columns.rarity_counts(~columns.has_image)
+    if missing:
+        print("\n   Without thumbnail:")
+        for rarity, count in missing.items():
+            print(f"      {rarity}: {count}")
+
+    ratio = columns.income_per_cost()
+    if (~numpy.isnan(ratio)).any():
+        print(f"\n   Median income/cost: {numpy.nanmedian(ratio):.6f}")
+
+
+if __name__ == '__main__':
+    main()
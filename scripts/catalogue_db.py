@@ -0,0 +1,265 @@
+"""
+Catalogue Database (SQLite)
+data/catalogue.sqlite3 holds one row per brainrot, indexed by id and by
+normalized name, and is the source of truth for the catalogue.
+app/public/brainrots.json is an export of it:
+
+- upserts and point updates touch one row (O(log n) through the indexes)
+  instead of a linear scan over the whole list
+- the exporter writes the rows in canonical form (catalogue_io.save_brainrots),
+  and only when something changed since the last export
+
+Every script that changes the catalogue writes rows here (upsert/upsert_many
+for point changes, replace_all for whole-list rebuilds and cleanups) and then
+calls export_json(); none of them writes brainrots.json itself.
+
+If brainrots.json was changed by hand since the last import or export (or the
+database does not exist yet), it is imported on open. If the database
+also has changes that were never exported, opening it raises
+CatalogueConflict instead of discarding either side; resolve it with
+--import (keep the JSON) or --export --force (keep the database).
+
+    db = CatalogueDB()
+    db.update_fields_by_name('La Jolly Grande', cost=3500000000)
+    db.export_json()
+
+    python scripts/catalogue_db.py --import    # reload rows from brainrots.json
+    python scripts/catalogue_db.py --export    # write brainrots.json if rows changed
+    python scripts/catalogue_db.py --export --force   # overwrite brainrots.json with the rows
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+from pathlib import Path
+
+from catalogue_io import content_hash, load_brainrots, save_brainrots
+
+DB_PATH = Path('data/catalogue.sqlite3')
+JSON_PATH = Path('app/public/brainrots.json')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS brainrots (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    income_per_second REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS brainrots_name_key ON brainrots (name_key);
+CREATE INDEX IF NOT EXISTS brainrots_order ON brainrots (income_per_second, id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class CatalogueConflict(RuntimeError):
+    """brainrots.json and the database were both changed since the last sync"""
+
+
+def name_key(name):
+    """Lookup key for a name: lowercase letters and digits only ("Admin Lucky Block" == "AdminLuckyBlock")"""
+    return re.sub(r'[^a-z0-9]', '', (name or '').lower())
+
+
+def encode(record):
+    """Stable JSON text of one record (used to detect real changes)"""
+    return json.dumps(record, sort_keys=True, ensure_ascii=False)
+
+
+class CatalogueDB:
+    """Brainrot catalogue rows keyed by id, with a change-tracked JSON export"""
+
+    def __init__(self, path=DB_PATH, json_path=JSON_PATH, sync=True):
+        self.path = Path(path)
+        self.json_path = Path(json_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+
+        if sync and self.json_changed():
+            if self.has_unexported_changes():
+                revision = self.revision
+                self.conn.close()
+                raise CatalogueConflict(
+                    f"{self.json_path} was changed outside the database, which also has unexported "
+                    f"changes (revision {revision}); run catalogue_db.py --import to keep the JSON "
+                    f"or --export --force to keep the database")
+            self.import_json()
+
+    # --- bookkeeping -------------------------------------------------
+
+    def _meta(self, key, default=None):
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self.conn.execute('INSERT INTO meta (key, value) VALUES (?, ?) '
+                          'ON CONFLICT(key) DO UPDATE SET value = excluded.value', (key, str(value)))
+
+    @property
+    def revision(self):
+        """Bumped on every change to the rows"""
+        return int(self._meta('revision', 0))
+
+    def _bump(self):
+        self._set_meta('revision', self.revision + 1)
+
+    def json_changed(self):
+        """True if the JSON file differs from what was last imported or exported"""
+        return self.json_path.exists() and content_hash(self.json_path) != self._meta(f'synced:{self.json_path}')
+
+    def has_unexported_changes(self):
+        """True if rows changed since the JSON file was last imported or exported"""
+        return self.revision > 0 and self._meta(f'exported:{self.json_path}') != str(self.revision)
+
+    # --- reads -------------------------------------------------------
+
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM brainrots').fetchone()[0]
+
+    def get(self, br_id):
+        """The record with this id, or None"""
+        row = self.conn.execute('SELECT data FROM brainrots WHERE id = ?', (br_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find_by_name(self, name):
+        """Records whose normalized name matches `name`"""
+        rows = self.conn.execute('SELECT data FROM brainrots WHERE name_key = ? ORDER BY id', (name_key(name),))
+        return [json.loads(data) for data, in rows]
+
+    def all(self):
+        """Every record, in export order (income, then id)"""
+        rows = self.conn.execute('SELECT data FROM brainrots ORDER BY COALESCE(income_per_second, 0), id')
+        return [json.loads(data) for data, in rows]
+
+    # --- writes ------------------------------------------------------
+
+    def _upsert(self, record):
+        if not record.get('id'):
+            raise ValueError(f"Brainrot without an id: {record.get('name')!r}")
+        cursor = self.conn.execute(
+            'INSERT INTO brainrots (id, name, name_key, income_per_second, data) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT(id) DO UPDATE SET name = excluded.name, name_key = excluded.name_key, '
+            'income_per_second = excluded.income_per_second, data = excluded.data '
+            'WHERE brainrots.data != excluded.data',
+            (record['id'], record.get('name', ''), name_key(record.get('name')),
+             record.get('income_per_second'), encode(record)))
+        return cursor.rowcount > 0
+
+    def upsert(self, record):
+        """Insert or replace one record; returns True if the row changed"""
+        return self.upsert_many([record]) == 1
+
+    def upsert_many(self, records):
+        """Insert or replace records in one transaction; returns how many rows changed"""
+        with self.conn:
+            changed = sum(1 for record in records if self._upsert(record))
+            if changed:
+                self._bump()
+        return changed
+
+    def update_fields(self, br_id, **fields):
+        """Set some fields of one record; returns the updated record (None if no such id)"""
+        record = self.get(br_id)
+        if record is None:
+            return None
+        record.update(fields)
+        self.upsert(record)
+        return record
+
+    def update_fields_by_name(self, name, **fields):
+        """update_fields() for the record(s) with this name; returns the updated records"""
+        return [self.update_fields(record['id'], **fields) for record in self.find_by_name(name)]
+
+    def _replace(self, records):
+        """Make the rows exactly `records` (inside a transaction); returns rows changed"""
+        ids = {record['id'] for record in records}
+        stale = [br_id for br_id, in self.conn.execute('SELECT id FROM brainrots') if br_id not in ids]
+        self.conn.executemany('DELETE FROM brainrots WHERE id = ?', [(br_id,) for br_id in stale])
+        changed = sum(1 for record in records if self._upsert(record)) + len(stale)
+        if changed:
+            self._bump()
+        return changed
+
+    def replace_all(self, records):
+        """Make the rows match a full list of records (others are deleted); returns rows changed
+
+        Only rows whose data actually differs are rewritten.
+        """
+        with self.conn:
+            return self._replace(records)
+
+    def delete(self, br_id):
+        with self.conn:
+            deleted = self.conn.execute('DELETE FROM brainrots WHERE id = ?', (br_id,)).rowcount > 0
+            if deleted:
+                self._bump()
+        return deleted
+
+    # --- JSON --------------------------------------------------------
+
+    def import_json(self, path=None):
+        """Make the rows match a brainrots.json file; returns rows changed"""
+        path = Path(path or self.json_path)
+        records = load_brainrots(path, mutable=False)
+
+        with self.conn:
+            changed = self._replace(records)
+            # The file already reflects these rows
+            self._set_meta(f'exported:{path}', self.revision)
+            self._set_meta(f'synced:{path}', content_hash(path))
+        return changed
+
+    def export_json(self, path=None, force=False):
+        """Write the rows to a brainrots.json file if they changed since it was last written
+
+        Returns True if the file was rewritten.
+        """
+        path = Path(path or self.json_path)
+        if not force and path.exists() and self._meta(f'exported:{path}') == str(self.revision):
+            return False
+
+        digest, written = save_brainrots(self.all(), path)
+
+        with self.conn:
+            self._set_meta(f'exported:{path}', self.revision)
+            self._set_meta(f'synced:{path}', digest)
+        return written
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite catalogue store')
+    parser.add_argument('--import', dest='import_json', action='store_true', help=f'reload rows from {JSON_PATH}')
+    parser.add_argument('--export', action='store_true', help=f'write {JSON_PATH} if rows changed')
+    parser.add_argument('--force', action='store_true', help='export even if nothing changed')
+    args = parser.parse_args()
+
+    # Explicit --import/--force settle a conflict, so don't sync on open for them
+    try:
+        db = CatalogueDB(sync=not (args.import_json or args.force))
+    except CatalogueConflict as e:
+        print(f"❌ {e}")
+        return
+
+    if args.import_json:
+        print(f"📥 Imported {JSON_PATH}: {db.import_json()} rows changed")
+
+    if args.export or args.force:
+        if db.export_json(force=args.force):
+            print(f"💾 Exported {db.count()} brainrots to {JSON_PATH}")
+        else:
+            print(f"⏭️  {JSON_PATH} already up to date")
+
+    print(f"🗄️  {db.path}: {db.count()} brainrots, revision {db.revision}")
+    db.close()
+
+
+if __name__ == '__main__':
+    main()
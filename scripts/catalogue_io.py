@@ -0,0 +1,212 @@
+"""
+Catalogue I/O
+One place to read and write the JSON files the scripts share
+(app/public/brainrots.json, data/brainrots.json, reports, corrections):
+
+- load_brainrots() always returns a list of records, whether the file holds
+  a list or {"brainrots": [...]}
+- files are cached per process, keyed by path + mtime/size, so scripts
+  chained in one process read each file once and read-only callers
+  (mutable=False) share one parsed copy; saving through save_json() drops
+  the cached copy
+- orjson is used for parsing and writing when it is installed (falls back
+  to the json module, same output format: 2-space indent, UTF-8)
+- save_brainrots() writes the canonical form: records ordered by income,
+  then id; fields in RECORD_FIELDS order, then the rest sorted; integral
+  floats written as ints. The same catalogue always gives the same bytes,
+  so a changed value is a one-line diff. Its sha256 goes to a sidecar
+  (brainrots.json.sha256, `sha256sum -c` format) that later stages
+  compare through content_hash() to skip work
+
+    from catalogue_io import load_brainrots, save_brainrots
+
+    brainrots = load_brainrots('data/brainrots.json')
+    save_brainrots(brainrots, 'app/public/brainrots.json')
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+
+import downloads
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+APP_DB_PATH = 'app/public/brainrots.json'
+DATA_DB_PATH = 'data/brainrots.json'
+
+# Canonical field order of a brainrot record; other fields follow, sorted
+RECORD_FIELDS = ['id', 'name', 'cost', 'income_per_second', 'base_income', 'rarity', 'image']
+HASH_SUFFIX = '.sha256'
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def loads(data):
+    """Parse JSON bytes or text"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, indent=True):
+    """Serialize to UTF-8 bytes (non-ASCII kept as is), indented by 2 spaces by default"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_json(path, mutable=True):
+    """Parsed contents of a JSON file, read from disk at most once per change
+
+    With mutable=False one shared parsed object is returned and must not be
+    modified. Otherwise the caller gets its own copy, parsed from the cached
+    bytes (with orjson that is several times faster than a deepcopy).
+    """
+    path = os.fspath(path)
+    signature = _signature(path)
+
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is None or cached[0] != signature:
+            with open(path, 'rb') as f:
+                cached = [signature, f.read(), None]
+            _cache[path] = cached
+
+        if mutable:
+            raw = cached[1]
+        else:
+            if cached[2] is None:
+                cached[2] = loads(cached[1])
+            return cached[2]
+
+    return loads(raw)
+
+
+def save_json(data, path, indent=True):
+    """Write a JSON file atomically and invalidate its cached copy"""
+    path = os.fspath(path)
+    downloads.write_bytes(path, dumps(data, indent))
+    with _cache_lock:
+        _cache.pop(path, None)
+
+
+def normalize_brainrots(data):
+    """The list of brainrot records from either file shape"""
+    if isinstance(data, dict):
+        return data.get('brainrots', [])
+    return data
+
+
+def load_brainrots(path=APP_DB_PATH, mutable=True):
+    """List of brainrot records from a brainrots.json file"""
+    return normalize_brainrots(load_json(path, mutable))
+
+
+def catalogue_order(record):
+    """Sort key of the canonical record order: income (missing = 0), then id"""
+    return record.get('income_per_second') or 0, record.get('id') or '', record.get('name') or ''
+
+
+def canonical_number(value):
+    """Integral floats as ints (3.5e9 -> 3500000000, -0.0 -> 0); NaN/inf are rejected"""
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError(f"Cannot write {value!r} to the catalogue")
+        if value.is_integer():
+            return int(value)
+    return value
+
+
+def canonical(obj, field_order=RECORD_FIELDS):
+    """Copy of `obj` with canonical key order and numbers"""
+    if isinstance(obj, dict):
+        rank = {field: i for i, field in enumerate(field_order)}
+        keys = sorted(obj, key=lambda key: (rank.get(key, len(rank)), key))
+        return {key: canonical(obj[key], field_order) for key in keys}
+    if isinstance(obj, (list, tuple)):
+        return [canonical(value, field_order) for value in obj]
+    return canonical_number(obj)
+
+
+def canonical_dumps(obj):
+    """Canonical UTF-8 bytes of `obj` (2-space indent, trailing newline)
+
+    Always the json module: orjson formats exponents differently (1e-05 vs
+    1e-5), and the bytes, and so the hash, must not depend on what is installed.
+    """
+    text = json.dumps(canonical(obj), indent=2, ensure_ascii=False, allow_nan=False)
+    return (text + '\n').encode('utf-8')
+
+
+def hash_path(path):
+    return os.fspath(path) + HASH_SUFFIX
+
+
+def content_hash(path):
+    """sha256 of a file, from its sidecar when that was written after the file"""
+    path = os.fspath(path)
+    sidecar = hash_path(path)
+    try:
+        if os.stat(sidecar).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            with open(sidecar, 'r', encoding='utf-8') as f:
+                return f.read().split()[0]
+    except (FileNotFoundError, IndexError):
+        pass
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _read_bytes(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def save_canonical(data, path):
+    """Write `data` canonically plus its hash sidecar
+
+    The file is left untouched (mtime included) when its bytes would not
+    change. Returns (sha256, written).
+    """
+    path = os.fspath(path)
+    encoded = canonical_dumps(data)
+    digest = hashlib.sha256(encoded).hexdigest()
+
+    written = _read_bytes(path) != encoded
+    if written:
+        downloads.write_bytes(path, encoded)
+        with _cache_lock:
+            _cache.pop(path, None)
+
+    sidecar = hash_path(path)
+    line = f"{digest}  {os.path.basename(path)}\n".encode('utf-8')
+    if written or _read_bytes(sidecar) != line:
+        downloads.write_bytes(sidecar, line)
+    return digest, written
+
+
+def save_brainrots(brainrots, path=APP_DB_PATH):
+    """Write brainrot records to a brainrots.json file in canonical form
+
+    Returns (sha256, written) like save_canonical().
+    """
+    return save_canonical(sorted(brainrots, key=catalogue_order), path)
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,275 @@
+"""
+Catalogue Change Log
+Append-only JSONL of field-level patches to a catalogue snapshot
+(app/public/brainrots.json), one line per changed field:
+
+    {"ts": "2025-12-12T06:15:40", "source": "update_existing_brainrots",
+     "id": "la-jolly-grande", "field": "cost", "old": 3000000000, "new": 3500000000}
+
+A whole record added or removed is logged with field "*". Intermediate saves
+append only the fields that changed since the last save; compaction replays
+the pending patches onto the snapshot, writes the changed rows to the
+catalogue database (catalogue_db.py) and exports the snapshot from it once. The log itself is
+never truncated, so it doubles as an audit trail (compaction only moves the
+offset stored in the state file).
+
+The state file also records the content hash of the snapshot the pending
+patches were diffed from. If the snapshot was exported again since (another
+script wrote the database) or edited by hand, a patch is only replayed
+while its "old" value still matches; the others are reported as conflicts
+instead of overwriting the newer edit.
+
+    python scripts/change_log.py                      # pending patches
+    python scripts/change_log.py --compact            # fold them into brainrots.json
+    python scripts/change_log.py --history la-jolly-grande
+"""
+
+import argparse
+import copy
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import downloads
+from catalogue_db import CatalogueConflict, CatalogueDB
+from catalogue_io import content_hash, load_brainrots
+
+SNAPSHOT_PATH = Path('app/public/brainrots.json')
+LOG_PATH = Path('data/brainrots.changes.jsonl')
+STATE_PATH = Path('data/brainrots.changes.state.json')
+
+WHOLE_RECORD = '*'
+
+
+def record_key(record):
+    return record.get('id') or record.get('name')
+
+
+def patch_applies(records, patch):
+    """True if the record/field still holds the patch's "old" value"""
+    key = patch['id']
+    if patch['field'] == WHOLE_RECORD:
+        return records.get(key) == patch['old']
+    if key not in records:
+        return False
+    return records[key].get(patch['field']) == patch['old']
+
+
+def apply_patch(records, patch):
+    """Apply one log entry to {key: record} (insertion order = file order)"""
+    key = patch['id']
+    if patch['field'] == WHOLE_RECORD:
+        if patch['new'] is None:
+            records.pop(key, None)
+        else:
+            records[key] = copy.deepcopy(patch['new'])
+    elif key in records:
+        if patch.get('unset'):
+            records[key].pop(patch['field'], None)
+        else:
+            records[key][patch['field']] = copy.deepcopy(patch['new'])
+
+
+def diff_records(old, new):
+    """[(field, old, new, unset)] for every top-level field that differs"""
+    changes = []
+    for field in list(old) + [f for f in new if f not in old]:
+        if field not in new:
+            changes.append((field, old[field], None, True))
+        elif field not in old or old[field] != new[field]:
+            changes.append((field, old.get(field), new[field], False))
+    return changes
+
+
+class ChangeLog:
+    """Snapshot + append-only patch log, with compaction"""
+
+    def __init__(self, snapshot_path=SNAPSHOT_PATH, log_path=LOG_PATH, state_path=STATE_PATH):
+        self.snapshot_path = Path(snapshot_path)
+        self.log_path = Path(log_path)
+        self.state_path = Path(state_path)
+        self.known = {}
+        self.conflicts = []
+        self.snapshot_hash = None
+
+    def _state(self):
+        """{'compacted_offset', 'snapshot_sha256'}"""
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_state(self, offset, snapshot_hash):
+        data = {'compacted_offset': offset, 'snapshot_sha256': snapshot_hash}
+        downloads.write_bytes(self.state_path, json.dumps(data, indent=2).encode('utf-8'))
+
+    def _offset(self):
+        """Byte offset in the log up to which patches are in the snapshot"""
+        return self._state().get('compacted_offset', 0)
+
+    def pending(self):
+        """Log entries not yet folded into the snapshot"""
+        if not self.log_path.exists():
+            return []
+        entries = []
+        with open(self.log_path, 'rb') as f:
+            f.seek(self._offset())
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # A crash mid-write leaves at most one torn line at the end
+                    continue
+        return entries
+
+    def load(self):
+        """The snapshot with every pending patch applied, as a list
+
+        If the snapshot changed since the pending patches were logged, patches
+        whose "old" value no longer matches are skipped and kept in
+        self.conflicts. Also remembers this state, so record() logs only
+        later changes.
+        """
+        snapshot = load_brainrots(self.snapshot_path)
+        snapshot_hash = content_hash(self.snapshot_path)
+
+        pending = self.pending()
+        # Replay blindly only onto the exact snapshot the patches were diffed from
+        checked = bool(pending) and self._state().get('snapshot_sha256') != snapshot_hash
+
+        records = {record_key(record): record for record in snapshot}
+        self.conflicts = []
+        for patch in pending:
+            if checked and not patch_applies(records, patch):
+                self.conflicts.append(patch)
+                continue
+            apply_patch(records, patch)
+
+        self.known = copy.deepcopy(records)
+        self.snapshot_hash = snapshot_hash
+        return list(records.values())
+
+    def record(self, brainrots, source):
+        """Append a patch for every field that changed since load()/the last record()
+
+        Returns the number of patches written.
+        """
+        timestamp = datetime.now().isoformat(timespec='seconds')
+        current = {record_key(record): record for record in brainrots}
+        patches = []
+
+        for key, record in current.items():
+            if key not in self.known:
+                patches.append({'id': key, 'field': WHOLE_RECORD, 'old': None, 'new': record})
+                continue
+            for field, old, new, unset in diff_records(self.known[key], record):
+                patch = {'id': key, 'field': field, 'old': old, 'new': new}
+                if unset:
+                    patch['unset'] = True
+                patches.append(patch)
+
+        for key, record in self.known.items():
+            if key not in current:
+                patches.append({'id': key, 'field': WHOLE_RECORD, 'old': record, 'new': None})
+
+        if patches:
+            if not self.pending():
+                # A new run of patches starts from the snapshot load() read
+                offset = self.log_path.stat().st_size if self.log_path.exists() else 0
+                self._save_state(offset, self.snapshot_hash)
+
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                # Terminate a torn last line so the next record starts cleanly
+                if f.tell() > 0:
+                    with open(self.log_path, 'rb') as check:
+                        check.seek(-1, os.SEEK_END)
+                        if check.read(1) != b'\n':
+                            f.write('\n')
+                for patch in patches:
+                    line = dict(ts=timestamp, source=source, **patch)
+                    f.write(json.dumps(line, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.known = copy.deepcopy(current)
+
+        return len(patches)
+
+    def compact(self):
+        """Fold pending patches into the catalogue database and re-export the snapshot
+
+        Only rows a patch changed are rewritten in the database. Returns how
+        many patches were applied; conflicting ones (see load()) are dropped
+        from the pending set and left in self.conflicts. Raises
+        catalogue_db.CatalogueConflict if the database has unexported changes
+        and the snapshot was also edited by hand.
+        """
+        offset = self.log_path.stat().st_size if self.log_path.exists() else 0
+        pending = self.pending()
+        if not pending:
+            return 0
+
+        db = CatalogueDB(json_path=self.snapshot_path)
+        try:
+            # Rows not exported yet go into the snapshot first, so the patches are checked against them
+            db.export_json()
+            db.replace_all(self.load())
+            db.export_json()
+        finally:
+            db.close()
+        self._save_state(offset, content_hash(self.snapshot_path))
+        return len(pending) - len(self.conflicts)
+
+    def history(self, key):
+        """Every logged patch for one record, oldest first"""
+        if not self.log_path.exists():
+            return []
+        entries = []
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry['id'] == key:
+                    entries.append(entry)
+        return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Catalogue change log')
+    parser.add_argument('--compact', action='store_true', help=f'fold pending patches into {SNAPSHOT_PATH}')
+    parser.add_argument('--history', metavar='ID', help='show every change to one brainrot')
+    args = parser.parse_args()
+
+    log = ChangeLog()
+
+    if args.history:
+        for entry in log.history(args.history):
+            if entry['field'] == WHOLE_RECORD:
+                change = 'added' if entry['new'] is not None else 'removed'
+            else:
+                change = f"{entry['field']}: {entry['old']!r} → {entry['new']!r}"
+            print(f"{entry['ts']}  {entry['source']:<28} {change}")
+        return
+
+    if args.compact:
+        try:
+            applied = log.compact()
+        except CatalogueConflict as e:
+            print(f"❌ {e}")
+            return
+        print(f"🗜️  Folded {applied} patches into {SNAPSHOT_PATH}" if applied else "✅ Nothing to compact")
+        for patch in log.conflicts:
+            print(f"   ⚠️  Dropped {patch['id']}.{patch['field']}: {SNAPSHOT_PATH} was changed since it was logged")
+        return
+
+    pending = log.pending()
+    print(f"📝 {len(pending)} pending patches in {LOG_PATH}")
+    for entry in pending[-10:]:
+        print(f"   {entry['id']}.{entry['field']}: {entry['old']!r} → {entry['new']!r}")
+
+
+if __name__ == '__main__':
+    main()
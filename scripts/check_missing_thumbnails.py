@@ -4,18 +4,19 @@ Identifies which brainrots are missing images and creates a plan
 """
 
 import json
-import os
+
+from catalogue_io import DATA_DB_PATH, load_brainrots
+from thumbnail_inventory import get_inventory
 
 def check_missing_thumbnails():
     # Load brainrots
-    with open('data/brainrots.json', 'r', encoding='utf-8') as f:
-        brainrots = json.load(f)
-    
-    if not isinstance(brainrots, list):
-        brainrots = brainrots.get('brainrots', [])
+    brainrots = load_brainrots(DATA_DB_PATH, mutable=False)
     
     print(f"=== Checking Thumbnails for {len(brainrots)} Brainrots ===\n")
     
+    # One directory scan instead of a stat per brainrot
+    inventory = get_inventory()
+    
     # Categorize brainrots
     has_image = []
     missing_image = []
@@ -27,14 +28,16 @@ def check_missing_thumbnails():
         rarity = br.get('rarity', 'unknown')
         
         if image:
-            # Check if file actually exists
-            if os.path.exists(f"app/public/{image}"):
+            # Check if file actually exists (and is not empty/truncated)
+            status = inventory.status(image)
+            if status == 'ok':
                 has_image.append(br)
             else:
                 image_not_found.append({
                     'name': name,
                     'rarity': rarity,
                     'image_path': image,
+                    'problem': status,
                     'brainrot': br
                 })
         else:
@@ -51,6 +54,11 @@ def check_missing_thumbnails():
     print(f"\n✅ Has Image: {len(has_image)} ({len(has_image)/len(brainrots)*100:.1f}%)")
     print(f"❌ Missing Image: {len(missing_image)} ({len(missing_image)/len(brainrots)*100:.1f}%)")
     print(f"⚠️  Image Path Set But File Not Found: {len(image_not_found)}")
+    broken = [item for item in image_not_found if item['problem'] != 'missing']
+    if broken:
+        print(f"   (of which {len(broken)} empty or truncated)")
+        for item in broken[:10]:
+            print(f"   - {item['image_path']}: {item['problem']}")
     
     # Group missing by rarity
     if missing_image:
@@ -113,7 +121,8 @@ def check_missing_thumbnails():
             {
                 'name': item['name'],
                 'rarity': item['rarity'],
-                'image_path': item['image_path']
+                'image_path': item['image_path'],
+                'problem': item['problem']
             }
             for item in image_not_found
         ]
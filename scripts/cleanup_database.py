@@ -6,19 +6,11 @@ Clean up brainrots database:
 3. Fix naming issues
 """
 
-import json
 import re
 from difflib import SequenceMatcher
 
-def load_json(filename):
-    """Load JSON file"""
-    with open(filename, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def save_json(data, filename):
-    """Save JSON file"""
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+from catalogue_db import CatalogueConflict, CatalogueDB
+from catalogue_io import save_json
 
 def kebab_case(text):
     """Convert text to kebab-case"""
@@ -232,9 +224,14 @@ def main():
     print("🧹 DATABASE CLEANUP")
     print("=" * 80)
     
-    # Load current database
+    # Load current database (app/public/brainrots.json is exported from it)
     print("\n📖 Loading current database...")
-    brainrots = load_json('app/public/brainrots.json')
+    try:
+        db = CatalogueDB()
+    except CatalogueConflict as e:
+        print(f"❌ {e}")
+        return
+    brainrots = db.all()
     original_count = len(brainrots)
     print(f"   Original count: {original_count}")
     
@@ -317,9 +314,11 @@ def main():
         if 'image' not in br:
             br['image'] = f"thumbnails/{br['name'].replace(' ', '_')}.png"
     
-    # Save cleaned database
+    # Save cleaned database: only rows that changed are rewritten, then brainrots.json is regenerated
     print("\n💾 Saving cleaned database...")
-    save_json(brainrots, 'app/public/brainrots.json')
+    changed = db.replace_all(brainrots)
+    db.export_json()
+    print(f"   {changed} rows changed")
     
     # Summary
     print("\n" + "=" * 80)
@@ -330,8 +329,9 @@ def main():
     print(f"  Duplicates removed: -{dup_removed if duplicates else 0}")
     print(f"  New brainrots added: +{added_count}")
     print(f"  Typos fixed:        {fixed_count}")
-    print(f"  Final count:        {len(brainrots)}")
-    print(f"\n  Net change:         {len(brainrots) - original_count:+d}")
+    print(f"  Final count:        {db.count()}")
+    print(f"\n  Net change:         {db.count() - original_count:+d}")
+    db.close()
     
     print("\n✅ Database cleaned successfully!")
     print("📁 Backup saved at: data/brainrots_backup.json")
@@ -3,10 +3,15 @@
 Compare wiki brainrots list to our database and find missing ones
 """
 
-import requests
 from bs4 import BeautifulSoup
 import json
 import re
+import requests
+import sys
+
+import wiki_client
+import wiki_titles
+from catalogue_io import APP_DB_PATH, load_brainrots
 
 def normalize_name(name):
     """Normalize brainrot name for comparison"""
@@ -20,7 +25,7 @@ def scrape_main_brainrots_page():
     print("🔍 Scraping main Brainrots wiki page...")
     url = 'https://stealabrainrot.fandom.com/wiki/Brainrots'
     
-    response = requests.get(url)
+    response = wiki_client.get(url)
     soup = BeautifulSoup(response.text, 'html.parser')
     
     brainrots_found = set()
@@ -59,8 +64,7 @@ def scrape_main_brainrots_page():
 def load_current_database():
     """Load our current brainrots database"""
     print("\n📖 Loading current database...")
-    with open('app/public/brainrots.json', 'r', encoding='utf-8') as f:
-        brainrots = json.load(f)
+    brainrots = load_brainrots(APP_DB_PATH, mutable=False)
     
     db_names = {normalize_name(br['name']) for br in brainrots}
     print(f"✅ Current database has {len(db_names)} brainrots")
@@ -142,8 +146,17 @@ def main():
     print("🔍 COMPARING WIKI TO DATABASE")
     print("=" * 80)
     
-    # Scrape wiki
-    wiki_brainrots = scrape_main_brainrots_page()
+    # Get wiki list (shared title set from category listings, or the old page scrape)
+    if '--html' in sys.argv:
+        wiki_brainrots = scrape_main_brainrots_page()
+    else:
+        try:
+            titles = wiki_titles.load_titles(refresh='--refresh-titles' in sys.argv)
+        except (wiki_titles.IncompleteTitleList, requests.RequestException) as e:
+            print(f"⚠️  {e}")
+            print("❌ Failed to fetch wiki brainrot list. Check network connection.")
+            return
+        wiki_brainrots = {normalize_name(title) for title in titles}
     
     # Load database
     db_brainrots, full_db = load_current_database()
@@ -1,14 +1,17 @@
 #!/usr/bin/env python3
 """
 Download missing thumbnails from the Steal a Brainrot wiki
+
+--sha1: look up each image through the wiki's imageinfo API first (50 files
+per request), skipping the page fetch and reusing stored identical images
+--original: download full-resolution originals instead of card-sized images
 """
 
-import requests
-from bs4 import BeautifulSoup
 import json
-import os
-import time
-from urllib.parse import unquote
+import sys
+
+import thumbnail_pipeline
+import wiki_image_info
 
 def load_missing_report():
     """Load the missing thumbnails report"""
@@ -26,76 +29,6 @@ def normalize_name_for_wiki(name):
     
     return name
 
-def search_wiki_for_image(brainrot_name):
-    """Search wiki for brainrot and get image URL"""
-    normalized_name = normalize_name_for_wiki(brainrot_name)
-    url = f'https://stealabrainrot.fandom.com/wiki/{normalized_name}'
-    
-    print(f"  🔍 Searching: {url}")
-    
-    try:
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code == 404:
-            print(f"     ❌ Page not found (404)")
-            return None
-        
-        if response.status_code != 200:
-            print(f"     ❌ Error: {response.status_code}")
-            return None
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find the main brainrot image (usually in an infobox or at the top)
-        # Try multiple selectors
-        image_selectors = [
-            'aside.portable-infobox img',  # Infobox image
-            '.pi-image img',  # Infobox image variant
-            '.image img',  # Generic image
-            'figure img',  # Figure image
-            'a.image img',  # Link image
-        ]
-        
-        for selector in image_selectors:
-            img = soup.select_one(selector)
-            if img:
-                img_src = img.get('src') or img.get('data-src')
-                if img_src and not img_src.endswith('.svg'):
-                    # Get the full resolution image (remove size parameters)
-                    if '/revision/latest' in img_src:
-                        img_src = img_src.split('/revision/latest')[0] + '/revision/latest'
-                    
-                    print(f"     ✅ Found image: {img_src[:80]}...")
-                    return img_src
-        
-        print(f"     ❌ No image found on page")
-        return None
-        
-    except Exception as e:
-        print(f"     ❌ Error: {e}")
-        return None
-
-def download_image(image_url, save_path):
-    """Download image from URL"""
-    try:
-        response = requests.get(image_url, timeout=10)
-        
-        if response.status_code == 200:
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            
-            with open(save_path, 'wb') as f:
-                f.write(response.content)
-            
-            print(f"     💾 Saved to: {save_path}")
-            return True
-        else:
-            print(f"     ❌ Download failed: {response.status_code}")
-            return False
-            
-    except Exception as e:
-        print(f"     ❌ Download error: {e}")
-        return False
-
 def try_alternative_names(brainrot_name):
     """Try alternative name variations"""
     alternatives = []
@@ -126,80 +59,38 @@ def main():
     
     print(f"   Found {len(missing)} brainrots without thumbnails")
     
-    # Download each
-    results = {
-        'found': [],
-        'not_found': [],
-        'download_failed': []
-    }
+    image_info = {}
+    if '--sha1' in sys.argv:
+        print("\n🔐 Looking up image SHA-1s through the wiki API...")
+        image_info = wiki_image_info.lookup_image_info(missing)
+        print(f"   {sum(1 for info in image_info.values() if info)}/{len(missing)} images found")
     
-    for i, brainrot in enumerate(missing, 1):
+    # Main name first, then the alternatives
+    jobs = []
+    for brainrot in missing:
+        info = image_info.get(brainrot['name']) or {}
         name = brainrot['name']
-        print(f"\n[{i}/{len(missing)}] 🔍 Searching for: {name}")
-        
-        # Try main name first
-        image_url = search_wiki_for_image(name)
-        
-        # If not found, try alternatives
-        if not image_url:
-            print(f"  🔄 Trying alternative names...")
-            alternatives = try_alternative_names(name)
-            
-            for alt_name in alternatives:
-                if alt_name != name:
-                    print(f"     Trying: {alt_name}")
-                    image_url = search_wiki_for_image(alt_name)
-                    if image_url:
-                        break
-        
-        if image_url:
-            # Download the image
-            clean_name = name.replace('(Lucky Block)', '').strip()
-            filename = clean_name.replace(' ', '_') + '.png'
-            save_path = f'app/public/thumbnails/{filename}'
-            
-            if download_image(image_url, save_path):
-                results['found'].append({
-                    'name': name,
-                    'filename': filename,
-                    'url': image_url
-                })
-            else:
-                results['download_failed'].append({
-                    'name': name,
-                    'url': image_url
-                })
-        else:
-            results['not_found'].append(name)
-        
-        # Be nice to the server
-        time.sleep(1)
-    
-    # Summary
-    print("\n" + "=" * 80)
-    print("📊 DOWNLOAD SUMMARY")
-    print("=" * 80)
-    
-    print(f"\n✅ Successfully downloaded: {len(results['found'])}")
-    for item in results['found']:
-        print(f"   • {item['name']} → {item['filename']}")
-    
-    print(f"\n❌ Not found on wiki: {len(results['not_found'])}")
-    for name in results['not_found']:
-        print(f"   • {name}")
-    
-    print(f"\n⚠️  Download failed: {len(results['download_failed'])}")
-    for item in results['download_failed']:
-        print(f"   • {item['name']}")
-    
-    # Save results
-    with open('data/thumbnail_download_results.json', 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
-    
-    print("\n📄 Full results saved to: data/thumbnail_download_results.json")
-    
+        clean_name = name.replace('(Lucky Block)', '').strip()
+        candidates = [name] + [alt for alt in try_alternative_names(name) if alt != name]
+        jobs.append(thumbnail_pipeline.make_job(
+            name,
+            clean_name.replace(' ', '_') + '.png',
+            wiki_names=[normalize_name_for_wiki(candidate) for candidate in candidates],
+            br_id=brainrot.get('id'),
+            image_url=info.get('url'),
+            sha1=info.get('sha1')
+        ))
+    
+    print(f"\n🚀 Resolving and downloading {len(jobs)} thumbnails in parallel...\n")
+    width = None if '--original' in sys.argv else thumbnail_pipeline.THUMBNAIL_WIDTH
+    results = thumbnail_pipeline.run_pipeline(jobs, width=width)
+    
+    thumbnail_pipeline.save_report(results, 'download_missing_thumbnails')
+    thumbnail_pipeline.print_report(results)
+    
+    downloaded = sum(1 for r in results if r['status'] in ('downloaded', 'skipped'))
     print("\n" + "=" * 80)
-    print(f"✅ Done! Downloaded {len(results['found'])}/{len(missing)} thumbnails")
+    print(f"✅ Done! Downloaded {downloaded}/{len(missing)} thumbnails")
     print("=" * 80)
 
 if __name__ == '__main__':
@@ -0,0 +1,91 @@
+"""
+Streaming, Atomic File Downloads
+Thumbnails are streamed to a temporary file next to the target in small
+chunks, checked against Content-Length, and only then renamed over the final
+path. An interrupted run leaves the old file (or no file) behind, never a
+truncated PNG, so reruns can trust whatever is on disk.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+import wiki_client
+
+CHUNK_SIZE = 64 * 1024
+
+
+class IncompleteDownload(IOError):
+    """The response ended before the expected number of bytes arrived"""
+
+
+@contextmanager
+def atomic_write(path):
+    """Open a temp file beside `path`; it replaces `path` only if the block succeeds"""
+    path = os.fspath(path)
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.part', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_bytes(path, data):
+    """Atomically replace `path` with `data`"""
+    with atomic_write(path) as f:
+        f.write(data)
+
+
+def download_file(url, path, chunk_size=CHUNK_SIZE, validators=None):
+    """Stream `url` into `path`, returning the number of bytes written
+
+    Raises requests.HTTPError for error responses and IncompleteDownload when
+    the body is empty or shorter than its Content-Length. The existing file
+    at `path` is left untouched on any failure.
+
+    `validators` ({'etag', 'last_modified'} from an earlier download) makes
+    the request conditional: on 304 Not Modified nothing is written and None
+    is returned. The dict is updated with the validators of a new body.
+    """
+    headers = {}
+    if validators:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
+    with wiki_client.get(url, stream=True, headers=headers) as response:
+        if response.status_code == 304 and headers:
+            return None
+        response.raise_for_status()
+
+        # Content-Length counts encoded bytes, so it only applies to identity bodies
+        expected = response.headers.get('Content-Length')
+        if response.headers.get('Content-Encoding', 'identity') != 'identity':
+            expected = None
+
+        with atomic_write(path) as f:
+            written = 0
+            for chunk in response.iter_content(chunk_size):
+                f.write(chunk)
+                written += len(chunk)
+
+            if expected is not None and written != int(expected):
+                raise IncompleteDownload(f"got {written} of {expected} bytes from {url}")
+            if written == 0:
+                raise IncompleteDownload(f"empty response from {url}")
+
+    if validators is not None:
+        validators['etag'] = response.headers.get('ETag')
+        validators['last_modified'] = response.headers.get('Last-Modified')
+    return written
@@ -3,64 +3,21 @@
 Explore the Steal a Brainrot wiki to find all categories and brainrot pages
 """
 
-import requests
-from bs4 import BeautifulSoup
+import argparse
 import json
-import time
+
+import wiki_api
+import wiki_client
+import wiki_titles
 
 def get_wiki_categories():
     """Get all categories from the wiki"""
     print("🔍 Finding all wiki categories...")
     
-    categories = [
-        'Brainrots',
-        'Secret_Brainrots',
-        'Brainrot_God',
-        'OG_Brainrots',
-        'Mythic_Brainrots',
-        'Legendary_Brainrots',
-        'Epic_Brainrots',
-        'Rare_Brainrots',
-        'Common_Brainrots',
-        'Halloween',
-        'Christmas',
-        'Limited_Brainrots',
-        'Event_Brainrots',
-        'Machines'
-    ]
+    categories = wiki_titles.BRAINROT_CATEGORIES + ['Machines']
     
     return categories
 
-def explore_category(category_name):
-    """Explore a specific category and list all pages"""
-    url = f'https://stealabrainrot.fandom.com/wiki/Category:{category_name}'
-    print(f"\n📂 Exploring: {category_name}")
-    print(f"   URL: {url}")
-    
-    try:
-        response = requests.get(url)
-        if response.status_code == 404:
-            print(f"   ❌ Category not found (404)")
-            return []
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find all category member links
-        members = soup.select('.category-page__member-link')
-        
-        pages = []
-        for member in members:
-            title = member.get('title', '').strip()
-            if title and not title.startswith('Category:'):
-                pages.append(title)
-        
-        print(f"   ✅ Found {len(pages)} pages")
-        return pages
-        
-    except Exception as e:
-        print(f"   ❌ Error: {e}")
-        return []
-
 def check_special_pages():
     """Check special event pages"""
     special_pages = [
@@ -87,7 +44,7 @@ def check_special_pages():
         print(f"\n🔍 Checking: {page}")
         
         try:
-            response = requests.get(url)
+            response = wiki_client.get(url)
             if response.status_code == 200:
                 print(f"   ✅ Found! {url}")
                 found_pages.append({
@@ -99,28 +56,50 @@ def check_special_pages():
                 print(f"   ❌ Not found ({response.status_code})")
         except Exception as e:
             print(f"   ❌ Error: {e}")
-        
-        time.sleep(0.5)  # Be nice to the server
     
     return found_pages
 
 def main():
+    parser = argparse.ArgumentParser(description='Explore wiki categories and special pages')
+    parser.add_argument('--api-fixture', metavar='PATH',
+                        help='serve API requests from a local JSON file instead of the wiki')
+    parser.add_argument('--skip-special', action='store_true',
+                        help='do not check the special event pages')
+    args = parser.parse_args()
+    
     print("=" * 80)
     print("🔍 EXPLORING STEAL A BRAINROT WIKI")
     print("=" * 80)
     
+    backend = wiki_api.get_backend(args.api_fixture)
     all_brainrot_pages = set()
     
-    # Explore categories
+    # Explore categories in parallel
     categories = get_wiki_categories()
+    print(f"\n📂 Listing {len(categories)} categories through the API...")
+    by_category, failed = wiki_titles.list_categories(backend, categories)
     
     for category in categories:
-        pages = explore_category(category)
-        all_brainrot_pages.update(pages)
-        time.sleep(0.5)  # Be nice to the server
+        if category in failed:
+            print(f"   {category}: FAILED")
+            continue
+        print(f"   {category}: {len(by_category[category])} pages")
+        all_brainrot_pages.update(by_category[category])
+    
+    # Save the shared title set used by compare/verify scripts (only if complete)
+    failed_brainrot_categories = [category for category in wiki_titles.BRAINROT_CATEGORIES if category in failed]
+    if failed_brainrot_categories:
+        print(f"\n⚠️  Not saving {wiki_titles.TITLES_PATH}: {len(failed_brainrot_categories)} categories failed to list")
+    else:
+        title_set = wiki_titles.title_set_from_categories(
+            {category: by_category[category] for category in wiki_titles.BRAINROT_CATEGORIES},
+            wiki_api.list_all_pages(backend)
+        )
+        wiki_titles.save_title_set(title_set)
+        print(f"\n💾 Saved {title_set['total_titles']} brainrot titles to {wiki_titles.TITLES_PATH}")
     
     # Check special pages
-    special_pages = check_special_pages()
+    special_pages = [] if args.skip_special else check_special_pages()
     
     # Save results
     print("\n" + "=" * 80)
@@ -131,7 +110,8 @@ def main():
         'total_brainrots': len(all_brainrot_pages),
         'brainrot_pages': sorted(list(all_brainrot_pages)),
         'special_event_pages': special_pages,
-        'categories_checked': categories
+        'categories_checked': categories,
+        'categories_failed': sorted(failed)
     }
     
     with open('data/wiki_exploration_results.json', 'w', encoding='utf-8') as f:
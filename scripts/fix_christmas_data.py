@@ -3,52 +3,42 @@
 Download Christmas brainrot thumbnails and fix database values
 """
 
+from pathlib import Path
+
 import requests
-from bs4 import BeautifulSoup
-import json
-import os
+
+import thumbnail_store
+from catalogue_db import CatalogueDB
+from wiki_page import WikiPage, scaled_image
 
 def download_image(url, save_path):
     """Download image from URL"""
     try:
         # Get the page first to extract image
-        response = requests.get(url, timeout=10)
-        if response.status_code != 200:
-            print(f"❌ Page error: {response.status_code}")
-            return False
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find image in infobox
-        img = soup.select_one('aside.portable-infobox img, .pi-image img, figure img')
-        
-        if not img:
-            print(f"❌ No image found on page")
+        page = WikiPage.fetch_url(url)
+        if not page.exists:
+            print(f"❌ Page error: {page.status_code}")
             return False
         
-        img_src = img.get('src') or img.get('data-src')
+        # Infobox image (or first article image), scaled to card size by the CDN
+        img_src = page.get('image_url')
         if not img_src:
-            print(f"❌ No image source")
+            print(f"❌ No image found on page")
             return False
-        
-        # Get full resolution
-        if '/revision/latest' in img_src:
-            img_src = img_src.split('/revision/latest')[0] + '/revision/latest'
+        img_src = scaled_image(img_src)
         
         print(f"  📥 Downloading from: {img_src[:80]}...")
         
         # Download image
-        img_response = requests.get(img_src, timeout=10)
-        if img_response.status_code == 200:
-            os.makedirs(os.path.dirname(save_path), exist_ok=True)
-            with open(save_path, 'wb') as f:
-                f.write(img_response.content)
-            print(f"  ✅ Saved to: {save_path}")
-            return True
-        else:
-            print(f"  ❌ Image download failed: {img_response.status_code}")
-            return False
+        store = thumbnail_store.get_store()
+        store.put_url(img_src, Path(save_path).name)
+        store.save()
+        print(f"  ✅ Saved to: {save_path}")
+        return True
             
+    except requests.exceptions.HTTPError as e:
+        print(f"  ❌ Image download failed: {e.response.status_code}")
+        return False
     except Exception as e:
         print(f"  ❌ Error: {e}")
         return False
@@ -83,9 +73,7 @@ def main():
     print("📝 Step 2: Fixing database values...")
     print("=" * 80)
     
-    # Load database
-    with open('app/public/brainrots.json', 'r', encoding='utf-8') as f:
-        brainrots = json.load(f)
+    db = CatalogueDB()
     
     updates = [
         {
@@ -104,27 +92,27 @@ def main():
     
     updated_count = 0
     for update in updates:
-        for br in brainrots:
-            if br['name'] == update['name']:
-                old_income = br.get('income_per_second', 0)
-                old_cost = br.get('cost', 0)
-                
-                br['income_per_second'] = update['income_per_second']
-                br['cost'] = update['cost']
-                br['image'] = update['image']
-                
-                print(f"\n✅ Updated: {update['name']}")
-                if old_income != update['income_per_second']:
-                    print(f"   Income: ${old_income:,}/s → ${update['income_per_second']:,}/s")
-                if old_cost != update['cost']:
-                    print(f"   Cost: ${old_cost:,} → ${update['cost']:,}")
-                
-                updated_count += 1
-                break
+        # Indexed lookup by normalized name instead of scanning every brainrot
+        for br in db.find_by_name(update['name'])[:1]:
+            old_income = br.get('income_per_second') or 0
+            old_cost = br.get('cost') or 0
+            
+            db.update_fields(br['id'],
+                             income_per_second=update['income_per_second'],
+                             cost=update['cost'],
+                             image=update['image'])
+            
+            print(f"\n✅ Updated: {update['name']}")
+            if old_income != update['income_per_second']:
+                print(f"   Income: ${old_income:,}/s → ${update['income_per_second']:,}/s")
+            if old_cost != update['cost']:
+                print(f"   Cost: ${old_cost:,} → ${update['cost']:,}")
+            
+            updated_count += 1
     
-    # Save updated database
-    with open('app/public/brainrots.json', 'w', encoding='utf-8') as f:
-        json.dump(brainrots, f, indent=2, ensure_ascii=False)
+    # Regenerate brainrots.json (only rewritten if a row changed)
+    db.export_json()
+    db.close()
     
     print("\n" + "=" * 80)
     print(f"✅ Updated {updated_count} brainrots in database")
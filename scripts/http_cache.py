@@ -0,0 +1,171 @@
+"""
+Persistent HTTP Cache for wiki pages
+Stores each response body on disk with its ETag / Last-Modified validators
+and revalidates with If-None-Match / If-Modified-Since on the next run, so
+unchanged pages come back as 304 with no body to download or re-parse
+
+Body and metadata are each replaced atomically through a unique temp file
+(several threads may cache the same URL). The body is written first and the
+metadata last; metadata whose recorded size does not match the body on disk
+(a crash or a concurrent writer in between) is treated as a cache miss.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+import downloads
+import wiki_client
+
+CACHE_DIR = Path('data/http_cache')
+
+# Entries younger than this are served without asking the server at all
+DEFAULT_MAX_AGE = 600
+
+
+class CachedResponse:
+    """Minimal stand-in for requests.Response backed by the cache"""
+
+    def __init__(self, url, status_code, content, encoding='utf-8', headers=None, unchanged=False):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding or 'utf-8'
+        self.headers = headers or {}
+        self.unchanged = unchanged
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors='replace')
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class HttpCache:
+    """On-disk response cache keyed by URL, revalidated with conditional requests"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_age=DEFAULT_MAX_AGE):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'revalidated': 0,
+            'misses': 0
+        }
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def _load_meta(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            size = body_path.stat().st_size
+        except (OSError, ValueError):
+            return None
+        # Metadata written for a different body than the one on disk
+        if meta.get('size') != size:
+            return None
+        return meta
+
+    def _save_meta(self, url, meta):
+        meta_path, _ = self._paths(url)
+        downloads.write_bytes(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+    def _save_body(self, url, content):
+        _, body_path = self._paths(url)
+        downloads.write_bytes(body_path, content)
+
+    def _count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def _from_cache(self, url, meta):
+        _, body_path = self._paths(url)
+        with open(body_path, 'rb') as f:
+            content = f.read()
+        return CachedResponse(url, 200, content, meta.get('encoding'), meta.get('headers'), unchanged=True)
+
+    def get(self, url):
+        """Fetch a URL, using the cached copy when the server says it is unchanged"""
+        meta = self._load_meta(url)
+
+        if meta and time.time() - meta.get('fetched_at', 0) < self.max_age:
+            self._count('hits')
+            return self._from_cache(url, meta)
+
+        headers = {}
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = wiki_client.get(url, headers=headers)
+
+        if response.status_code == 304 and meta:
+            self._count('revalidated')
+            meta['fetched_at'] = time.time()
+            self._save_meta(url, meta)
+            return self._from_cache(url, meta)
+
+        self._count('misses')
+
+        if response.status_code != 200:
+            return CachedResponse(url, response.status_code, response.content, response.encoding)
+
+        kept_headers = {k: v for k, v in response.headers.items() if k.lower() == 'content-type'}
+        self._save_body(url, response.content)
+        self._save_meta(url, {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'encoding': response.encoding,
+            'headers': kept_headers,
+            'size': len(response.content),
+            'fetched_at': time.time(),
+            'parsed': {}
+        })
+
+        return CachedResponse(url, 200, response.content, response.encoding, kept_headers)
+
+    def get_parsed(self, url, name):
+        """Return data previously extracted from the cached body, if any"""
+        meta = self._load_meta(url)
+        if not meta:
+            return None
+        return meta.get('parsed', {}).get(name)
+
+    def set_parsed(self, url, name, data):
+        """Remember data extracted from the cached body (dropped when the body changes)"""
+        meta = self._load_meta(url)
+        if not meta:
+            return
+        meta.setdefault('parsed', {})[name] = data
+        self._save_meta(url, meta)
+
+    def summary(self):
+        """One-line hit/miss/revalidate summary for run reports"""
+        s = self.stats
+        return f"{s['hits']} hits, {s['revalidated']} revalidated (304), {s['misses']} misses"
+
+
+_default_cache = None
+
+
+def get_cache():
+    """Return the shared cache instance (created on first use)"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = HttpCache()
+    return _default_cache
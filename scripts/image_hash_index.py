@@ -0,0 +1,241 @@
+"""
+Perceptual Hash Index for Thumbnails
+Sidecar index (data/thumbnail_hash_index.json) of 64-bit dHash and pHash
+values so thumbnail comparison is mostly lookups:
+
+- local thumbnails are keyed by path and only re-hashed when their
+  mtime/size change; stale entries are hashed in parallel across cores
+  (the file's SHA-1 is kept too, to match the wiki's imageinfo hashes)
+- wiki images are keyed by URL together with their CDN validators
+  (ETag / Last-Modified); they are only downloaded again when the CDN
+  says the image changed
+
+Two images count as the same when both hashes are within
+DEFAULT_THRESHOLD bits (Hamming distance), which tolerates re-encoding and
+small resizes but not a different picture.
+"""
+
+import hashlib
+import io
+import json
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+import downloads
+import wiki_client
+
+INDEX_PATH = Path('data/thumbnail_hash_index.json')
+
+# Max differing bits (of 64) for two images to count as the same
+DEFAULT_THRESHOLD = 10
+
+# Below this many stale files a process pool costs more than it saves
+PARALLEL_MIN = 8
+
+DCT_SIZE = 32
+DCT_KEEP = 8
+
+
+def _flatten(image):
+    """Grayscale image with transparency composited onto white"""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+        image = Image.alpha_composite(background, image)
+    return image.convert('L')
+
+
+def _bits_to_hex(bits):
+    value = 0
+    for bit in bits:
+        value = (value << 1) | bit
+    return f"{value:016x}"
+
+
+def dhash(image):
+    """Difference hash: brighter-than-right-neighbour bits on a 9x8 grayscale"""
+    pixels = list(_flatten(image).resize((9, 8), Image.Resampling.LANCZOS).getdata())
+    bits = [1 if pixels[row * 9 + col] > pixels[row * 9 + col + 1] else 0
+            for row in range(8) for col in range(8)]
+    return _bits_to_hex(bits)
+
+
+_dct_matrix = [
+    [math.cos(math.pi * (2 * x + 1) * u / (2 * DCT_SIZE)) for x in range(DCT_SIZE)]
+    for u in range(DCT_KEEP)
+]
+
+
+def phash(image):
+    """DCT hash: low-frequency 8x8 DCT coefficients above/below their median"""
+    pixels = list(_flatten(image).resize((DCT_SIZE, DCT_SIZE), Image.Resampling.LANCZOS).getdata())
+    rows = [pixels[i * DCT_SIZE:(i + 1) * DCT_SIZE] for i in range(DCT_SIZE)]
+
+    # Separable 2D DCT, keeping only the top-left 8x8 block
+    row_dct = [[sum(c * p for c, p in zip(basis, row)) for basis in _dct_matrix] for row in rows]
+    coeffs = [
+        sum(_dct_matrix[u][x] * row_dct[x][v] for x in range(DCT_SIZE))
+        for u in range(DCT_KEEP) for v in range(DCT_KEEP)
+    ]
+
+    # Skip the DC term when picking the median
+    median = sorted(coeffs[1:])[len(coeffs[1:]) // 2]
+    return _bits_to_hex([1 if c > median else 0 for c in coeffs])
+
+
+def hamming(a, b):
+    """Number of differing bits between two hex hashes"""
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+
+def hash_image_bytes(data):
+    """dHash/pHash of encoded image bytes, or None if it cannot be decoded"""
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+            return {'dhash': dhash(image), 'phash': phash(image)}
+    except Exception:
+        return None
+
+
+def hash_image_file(path):
+    """Perceptual hashes plus the SHA-1 of a file on disk
+
+    Top-level so process pools can pickle it.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    hashes = hash_image_bytes(data) or {'dhash': None, 'phash': None}
+    return dict(hashes, sha1=hashlib.sha1(data).hexdigest())
+
+
+def is_similar(a, b, threshold=DEFAULT_THRESHOLD):
+    """True when both hashes of two index entries are within the threshold"""
+    if not a or not b or a['dhash'] is None or b['dhash'] is None:
+        return False
+    return hamming(a['dhash'], b['dhash']) <= threshold and hamming(a['phash'], b['phash']) <= threshold
+
+
+class ImageHashIndex:
+    """Persistent perceptual hashes for local files and remote image URLs"""
+
+    def __init__(self, path=INDEX_PATH, threshold=DEFAULT_THRESHOLD):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.stats = {
+            'local_hits': 0,
+            'local_hashed': 0,
+            'remote_unchanged': 0,
+            'remote_fetched': 0
+        }
+
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        else:
+            data = {}
+
+        self.local = data.get('local', {})
+        self.remote = data.get('remote', {})
+
+    @staticmethod
+    def _signature(path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _local_entry(self, path):
+        """Index entry for a file if it is still current, else None"""
+        entry = self.local.get(str(path))
+        if entry is None or 'sha1' not in entry or not os.path.exists(path):
+            return None
+        mtime_ns, size = self._signature(path)
+        if entry['mtime_ns'] != mtime_ns or entry['size'] != size:
+            return None
+        return entry
+
+    def _store_local(self, path, hashes):
+        mtime_ns, size = self._signature(path)
+        entry = dict(hashes, mtime_ns=mtime_ns, size=size)
+        with self.lock:
+            self.local[str(path)] = entry
+            self.stats['local_hashed'] += 1
+        return entry
+
+    def refresh_local(self, paths, workers=None):
+        """Hash every stale or new file in `paths`, in parallel across cores"""
+        stale = [str(p) for p in paths if os.path.exists(p) and self._local_entry(p) is None]
+
+        if len(stale) < PARALLEL_MIN:
+            results = map(hash_image_file, stale)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(hash_image_file, stale, chunksize=8))
+
+        for path, hashes in zip(stale, results):
+            self._store_local(path, hashes)
+
+        return len(stale)
+
+    def local_hash(self, path):
+        """Hashes of a local file, computed only if it changed since last time"""
+        entry = self._local_entry(path)
+        if entry is not None:
+            self.stats['local_hits'] += 1
+            return entry
+        return self._store_local(path, hash_image_file(path))
+
+    def remote_hash(self, url):
+        """Hashes of a remote image, revalidated with the CDN
+
+        Returns (entry, data). `data` holds the image bytes when they were
+        downloaded on this call and is None when the CDN answered 304.
+        """
+        entry = self.remote.get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = wiki_client.get(url, headers=headers)
+
+        if response.status_code == 304 and entry:
+            with self.lock:
+                self.stats['remote_unchanged'] += 1
+            return entry, None
+
+        response.raise_for_status()
+        data = response.content
+        entry = dict(hash_image_bytes(data) or {'dhash': None, 'phash': None},
+                     size=len(data),
+                     etag=response.headers.get('ETag'),
+                     last_modified=response.headers.get('Last-Modified'))
+
+        with self.lock:
+            self.remote[url] = entry
+            self.stats['remote_fetched'] += 1
+        return entry, data
+
+    def is_same(self, a, b):
+        return is_similar(a, b, self.threshold)
+
+    def save(self):
+        """Write the index atomically"""
+        with self.lock:
+            data = {
+                'threshold': self.threshold,
+                'local': dict(sorted(self.local.items())),
+                'remote': dict(sorted(self.remote.items()))
+            }
+        downloads.write_bytes(self.path, json.dumps(data, indent=2).encode('utf-8'))
+
+    def summary(self):
+        return (f"{self.stats['local_hits']} local lookups, {self.stats['local_hashed']} hashed, "
+                f"{self.stats['remote_unchanged']} remote unchanged (304), {self.stats['remote_fetched']} fetched")
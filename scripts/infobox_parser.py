@@ -0,0 +1,161 @@
+"""
+Fast Infobox Parser
+Pluggable backends for reading the portable-infobox out of a wiki page
+without building a tree for the whole document:
+
+- lxml:     slice out the <aside class="portable-infobox"> and parse only
+            that with lxml + XPath (falls back to a full lxml parse)
+- strainer: BeautifulSoup with a SoupStrainer, so only the infobox is built
+- soup:     full BeautifulSoup tree (the original, slowest path)
+
+'auto' picks lxml when it is installed, otherwise the strainer.
+"""
+
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+INFOBOX_START = re.compile(r'<aside\b[^>]*\bportable-infobox\b[^>]*>', re.IGNORECASE)
+ASIDE_TAG = re.compile(r'<(/?)aside\b', re.IGNORECASE)
+
+# Strainers see the raw class attribute ("portable-infobox pi-background ..."),
+# so match the class as a word rather than an exact value
+INFOBOX_CLASS = re.compile(r'(^|\s)portable-infobox(\s|$)')
+
+
+def has_class(name):
+    """XPath predicate matching one class in a space-separated class list"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+XPATH_INFOBOX = f"//aside[{has_class('portable-infobox')}]"
+XPATH_DATA = f".//div[{has_class('pi-data')}]"
+XPATH_LABEL = f".//h3[{has_class('pi-data-label')}]"
+XPATH_VALUE = f".//div[{has_class('pi-data-value')}]"
+XPATH_IMAGE = f".//img[{has_class('pi-image-thumbnail')}]"
+
+
+def to_text(html):
+    """Accept page HTML as bytes or str"""
+    if isinstance(html, bytes):
+        return html.decode('utf-8', errors='replace')
+    return html
+
+
+def slice_infobox(html):
+    """Return just the <aside class="portable-infobox">...</aside> markup, or None"""
+    start = INFOBOX_START.search(html)
+    if not start:
+        return None
+
+    depth = 0
+    for tag in ASIDE_TAG.finditer(html, start.start()):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            end = html.find('>', tag.end())
+            return html[start.start():end + 1]
+
+    return None
+
+
+def image_source(img):
+    """src of an <img>, or data-src when src is a lazy-load placeholder"""
+    src = img.get('src')
+    if not src or src.startswith('data:'):
+        src = img.get('data-src') or src
+    return src
+
+
+def empty_infobox():
+    return {'found': False, 'fields': [], 'image': None}
+
+
+def parse_with_lxml(html):
+    html = to_text(html)
+    fragment = slice_infobox(html)
+
+    if fragment is not None:
+        infobox = lxml_html.fragment_fromstring(fragment)
+    else:
+        # No clean slice (e.g. malformed nesting) - fall back to the full document
+        if not INFOBOX_START.search(html):
+            return empty_infobox()
+        matches = lxml_html.document_fromstring(html).xpath(XPATH_INFOBOX)
+        if not matches:
+            return empty_infobox()
+        infobox = matches[0]
+
+    fields = []
+    for item in infobox.xpath(XPATH_DATA):
+        label = item.xpath(XPATH_LABEL)
+        value = item.xpath(XPATH_VALUE)
+        if not label or not value:
+            continue
+        fields.append((
+            ''.join(s.strip() for s in label[0].itertext()),
+            ''.join(s.strip() for s in value[0].itertext())
+        ))
+
+    image = infobox.xpath(XPATH_IMAGE) or infobox.xpath('.//img')
+    image_src = image_source(image[0]) if image else None
+
+    return {'found': True, 'fields': fields, 'image': image_src}
+
+
+def parse_infobox_tag(infobox):
+    """Read fields and image out of a BeautifulSoup infobox tag"""
+    if not infobox:
+        return empty_infobox()
+
+    fields = []
+    for item in infobox.find_all('div', class_='pi-data'):
+        label = item.find('h3', class_='pi-data-label')
+        value = item.find('div', class_='pi-data-value')
+        if not label or not value:
+            continue
+        fields.append((label.get_text(strip=True), value.get_text(strip=True)))
+
+    image = infobox.find('img', class_='pi-image-thumbnail') or infobox.find('img')
+    image_src = image_source(image) if image else None
+
+    return {'found': True, 'fields': fields, 'image': image_src}
+
+
+def parse_with_strainer(html):
+    strainer = SoupStrainer('aside', class_=INFOBOX_CLASS)
+    soup = BeautifulSoup(html, 'html.parser', parse_only=strainer)
+    return parse_infobox_tag(soup.find('aside', class_='portable-infobox'))
+
+
+def parse_with_soup(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    return parse_infobox_tag(soup.find('aside', class_='portable-infobox'))
+
+
+BACKENDS = {
+    'lxml': parse_with_lxml,
+    'strainer': parse_with_strainer,
+    'soup': parse_with_soup,
+}
+
+
+def available_backends():
+    """Backends that can run with the installed packages"""
+    return [name for name in BACKENDS if name != 'lxml' or lxml_html is not None]
+
+
+def parse_infobox(html, backend='auto'):
+    """Parse a page's portable-infobox
+
+    Returns {'found': bool, 'fields': [(label, value), ...], 'image': src or None}.
+    """
+    if backend == 'auto':
+        backend = 'lxml' if lxml_html is not None else 'strainer'
+    if backend == 'lxml' and lxml_html is None:
+        raise ImportError("lxml is not installed (pip install lxml)")
+    return BACKENDS[backend](html)
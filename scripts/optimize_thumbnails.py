@@ -0,0 +1,218 @@
+"""
+Thumbnail Optimizer
+Builds WebP (and AVIF, when Pillow supports it) copies of every thumbnail at
+the sizes the cards use, 1x and 2x:
+
+    app/public/thumbnails/variants/Strawberry_Elephant.png-ab12cd34ef56-128w.webp
+    app/public/thumbnails/variants/Strawberry_Elephant.png-ab12cd34ef56-256w.webp
+
+Variants are named after the full source file name (so X.png and X.jpg do not
+collide) plus the start of its sha256, so a rebuild never overwrites the
+variants the current manifest points at. If a rebuild fails the previous
+variants stay in use; superseded files are only deleted once the new manifest
+has been written.
+
+Sources are never upscaled. The width in a file name is the real width of
+that file: a source narrower than a target is written at its own width, and a
+density it is too small for (one that would repeat the previous density's
+width) is left out of the manifest: a 200px source gets "1x" at 128w and "2x"
+at 200w, a 100px source only "1x" at 100w.
+
+Images are processed across a process pool. A thumbnail whose sha256 has not
+changed since the last run is skipped. app/public/thumbnail_variants.json maps
+each `image` value from brainrots.json to its variants:
+
+    {"thumbnails/Strawberry_Elephant.png": {
+        "sha256": "ab12...", "width": 256, "height": 240,
+        "webp": {"1x": "thumbnails/variants/Strawberry_Elephant.png-ab12cd34ef56-128w.webp",
+                 "2x": "thumbnails/variants/Strawberry_Elephant.png-ab12cd34ef56-256w.webp"}}}
+
+    python scripts/optimize_thumbnails.py            # build what changed
+    python scripts/optimize_thumbnails.py --force    # rebuild everything
+    python scripts/optimize_thumbnails.py --no-avif  # WebP only
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image, features
+
+import downloads
+import thumbnail_store
+
+PUBLIC_DIR = thumbnail_store.THUMB_DIR.parent
+VARIANT_DIR = thumbnail_store.THUMB_DIR / 'variants'
+MANIFEST_PATH = PUBLIC_DIR / 'thumbnail_variants.json'
+
+# Card image width in CSS pixels (h-36 card image minus padding)
+CARD_WIDTH = 128
+DENSITIES = {'1x': 1, '2x': 2}
+
+# Bump when variant naming or sizing changes, so existing variants are rebuilt
+LAYOUT_VERSION = 2
+
+# Pillow save options per format; changing them rebuilds every variant
+FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 6},
+    'avif': {'format': 'AVIF', 'quality': 60, 'speed': 6}
+}
+
+
+def available_formats(avif=True):
+    """Output formats this Pillow build can write"""
+    formats = ['webp']
+    if avif and features.check('avif'):
+        formats.append('avif')
+    return formats
+
+
+def settings_key(formats):
+    """Everything that changes the output besides the source image"""
+    return {
+        'layout': LAYOUT_VERSION,
+        'card_width': CARD_WIDTH,
+        'densities': DENSITIES,
+        'formats': {fmt: FORMATS[fmt] for fmt in formats}
+    }
+
+
+def variant_path(source, digest, width, fmt):
+    return VARIANT_DIR / f"{Path(source).name}-{digest[:12]}-{width}w.{fmt}"
+
+
+def variant_files(entry):
+    """Paths of every variant listed in a manifest entry"""
+    return {PUBLIC_DIR / p for value in entry.values() if isinstance(value, dict) for p in value.values()}
+
+
+def build_variants(source, digest, formats):
+    """Write every size/format of one thumbnail, returning its manifest entry
+
+    Top-level so process pools can pickle it.
+    """
+    with Image.open(source) as image:
+        image.load()
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        width, height = image.size
+
+        entry = {'width': width, 'height': height}
+        for fmt in formats:
+            entry[fmt] = {}
+            written = set()
+            for density, scale in DENSITIES.items():
+                # Never upscale: small sources are re-encoded at their own size
+                target = min(CARD_WIDTH * scale, width)
+                if target in written:
+                    # Source too small for this density; don't advertise it
+                    continue
+                written.add(target)
+                resized = image if target == width else image.resize(
+                    (target, max(1, round(height * target / width))), Image.Resampling.LANCZOS)
+
+                path = variant_path(source, digest, target, fmt)
+                with downloads.atomic_write(path) as f:
+                    resized.save(f, **FORMATS[fmt])
+                entry[fmt][density] = path.relative_to(PUBLIC_DIR).as_posix()
+
+    return entry
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def outputs_exist(entry, formats):
+    return all(fmt in entry and all((PUBLIC_DIR / p).exists() for p in entry[fmt].values()) for fmt in formats)
+
+
+def optimize_thumbnails(force=False, avif=True, workers=None):
+    """Build variants for new or changed thumbnails and rewrite the manifest
+
+    Returns (built, skipped, removed) counts.
+    """
+    formats = available_formats(avif)
+    settings = settings_key(formats)
+    manifest = load_manifest()
+    published = manifest.get('images', {})
+    previous = published if manifest.get('settings') == settings and not force else {}
+
+    sources = sorted(p for p in thumbnail_store.THUMB_DIR.glob('*')
+                     if p.is_file() and not p.name.startswith('.'))
+
+    images = {}
+    stale = []
+    for path in sources:
+        key = path.relative_to(PUBLIC_DIR).as_posix()
+        digest = thumbnail_store.hash_file(path)[0]
+        entry = previous.get(key)
+        if entry and entry['sha256'] == digest and outputs_exist(entry, formats):
+            images[key] = entry
+        else:
+            stale.append((key, path, digest))
+
+    VARIANT_DIR.mkdir(parents=True, exist_ok=True)
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {key: (digest, pool.submit(build_variants, str(path), digest, formats))
+                       for key, path, digest in stale}
+            for key, (digest, future) in futures.items():
+                try:
+                    images[key] = dict(future.result(), sha256=digest)
+                except Exception as e:
+                    # Keep serving the last good variants rather than none
+                    fallback = published.get(key)
+                    if fallback and all(p.exists() for p in variant_files(fallback)):
+                        images[key] = fallback
+                        print(f"   ❌ {key}: {e} (keeping previous variants)")
+                    else:
+                        print(f"   ❌ {key}: {e}")
+
+    data = {'settings': settings, 'images': dict(sorted(images.items()))}
+    downloads.write_bytes(MANIFEST_PATH, json.dumps(data, indent=2).encode('utf-8'))
+
+    # Superseded variants and those of thumbnails that no longer exist; only
+    # once the manifest no longer points at them
+    keep = set().union(*(variant_files(entry) for entry in images.values()))
+    removed = 0
+    for path in VARIANT_DIR.glob('*'):
+        if path.is_file() and path not in keep:
+            os.remove(path)
+            removed += 1
+
+    return len(stale), len(sources) - len(stale), removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build WebP/AVIF thumbnail variants')
+    parser.add_argument('--force', action='store_true', help='rebuild every variant')
+    parser.add_argument('--no-avif', action='store_true', help='only build WebP')
+    parser.add_argument('--workers', type=int, help='processes to use (default: one per core)')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("🗜️  OPTIMIZING THUMBNAILS")
+    print("=" * 80)
+    print(f"   Formats: {', '.join(available_formats(not args.no_avif))}")
+    print(f"   Widths:  {', '.join(f'{CARD_WIDTH * s}px ({d})' for d, s in DENSITIES.items())}\n")
+
+    built, skipped, removed = optimize_thumbnails(args.force, not args.no_avif, args.workers)
+
+    before = sum(p.stat().st_size for p in thumbnail_store.THUMB_DIR.glob('*') if p.is_file())
+    after = sum(p.stat().st_size for p in VARIANT_DIR.glob('*.webp'))
+
+    print(f"✅ Built:   {built}")
+    print(f"⏭️  Unchanged: {skipped}")
+    print(f"🗑️  Removed: {removed} stale variants")
+    print(f"📦 Originals {before / 1024 / 1024:.1f} MB → WebP variants {after / 1024 / 1024:.1f} MB")
+    print(f"📄 Manifest: {MANIFEST_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Wiki Revision Manifest
+Remembers the wiki revision id each brainrot page had when it was last
+scraped, so a refresh only re-fetches and re-parses pages that were edited.
+
+Each entry also lists the passes that were applied at that revision
+('thumbnail', 'compare', 'data'): a page is only current for the passes
+it was actually processed with, so a thumbnails-only run does not make a
+later --update-data run skip it.
+"""
+
+import json
+import os
+from datetime import datetime
+
+MANIFEST_PATH = 'data/wiki_revisions.json'
+
+
+class RevisionManifest:
+    """name -> {'revid', 'passes', 'scraped_at'} for every successfully scraped page"""
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.entries = {}
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get('pages', {})
+
+    def is_current(self, name, revid, passes):
+        """True if the page was processed at exactly this revision with every pass in `passes`"""
+        entry = self.entries.get(name)
+        if revid is None or entry is None or entry.get('revid') != revid:
+            return False
+        # Entries written before passes were tracked count as none applied
+        return set(passes) <= set(entry.get('passes', []))
+
+    def record(self, name, revid, passes):
+        """Remember that a page was processed at this revision with these passes"""
+        entry = self.entries.get(name)
+        applied = set(passes)
+        if entry is not None and entry.get('revid') == revid:
+            applied |= set(entry.get('passes', []))
+        self.entries[name] = {
+            'revid': revid,
+            'passes': sorted(applied),
+            'scraped_at': datetime.now().isoformat(timespec='seconds')
+        }
+
+    def changed(self, current_revids, passes):
+        """Return the names that still need these passes at their current revision"""
+        return [name for name, revid in current_revids.items() if not self.is_current(name, revid, passes)]
+
+    def save(self):
+        """Write the manifest to disk"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'updated_at': datetime.now().isoformat(timespec='seconds'),
+                'total': len(self.entries),
+                'pages': dict(sorted(self.entries.items()))
+            }, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
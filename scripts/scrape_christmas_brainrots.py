@@ -3,11 +3,12 @@
 Scrape Christmas Brainrots from Santa's Fuse and Christmas Brainrots wiki pages
 """
 
-import requests
 from bs4 import BeautifulSoup
 import json
 import re
 
+import wiki_client
+
 def parse_income(income_str):
     """Convert income string like '$3.2M/s' to number"""
     if not income_str:
@@ -63,7 +64,7 @@ def scrape_santas_fuse():
     print("🎅 Scraping Santa's Fuse...")
     
     url = 'https://stealabrainrot.fandom.com/wiki/Santa%27s_Fuse'
-    response = requests.get(url)
+    response = wiki_client.get(url)
     soup = BeautifulSoup(response.text, 'html.parser')
     
     brainrots = []
@@ -109,7 +110,7 @@ def scrape_christmas_page():
     print("\n🎄 Scraping Christmas Brainrots page...")
     
     url = 'https://stealabrainrot.fandom.com/wiki/Christmas_Brainrots'
-    response = requests.get(url)
+    response = wiki_client.get(url)
     soup = BeautifulSoup(response.text, 'html.parser')
     
     brainrots = []
@@ -0,0 +1,73 @@
+"""
+Scrape Progress Journal
+Append-only JSONL checkpoint for long scrape runs: one line per finished
+title, flushed to disk immediately. A restarted run with --resume replays
+the journal and skips everything already done.
+
+Only successful results belong in the journal: a title that failed (network
+error, page not fetched) must stay pending so --resume retries it.
+"""
+
+import json
+import os
+import threading
+
+
+class ScrapeJournal:
+    """Append-only record of finished work, keyed by brainrot name"""
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.completed = {}
+        self.lock = threading.Lock()
+
+        if resume and os.path.exists(path):
+            self.completed = self._replay()
+            mode = 'a'
+        else:
+            mode = 'w'
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(path, mode, encoding='utf-8')
+
+        # Terminate a torn last line so the next record starts cleanly
+        if mode == 'a' and self.file.tell() > 0:
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self.file.write('\n')
+
+    def _replay(self):
+        completed = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A crash mid-write leaves at most one torn line at the end
+                    continue
+                completed[entry['key']] = entry['data']
+        return completed
+
+    def __len__(self):
+        return len(self.completed)
+
+    def is_done(self, key):
+        return key in self.completed
+
+    def get(self, key):
+        return self.completed.get(key)
+
+    def record(self, key, data):
+        """Append a finished item and flush it to disk before returning"""
+        with self.lock:
+            self.completed[key] = data
+            self.file.write(json.dumps({'key': key, 'data': data}, ensure_ascii=False) + '\n')
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def finish(self):
+        """Close and delete the journal once the run's results are safely saved"""
+        self.file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -3,22 +3,19 @@ Scrape Traits from Steal a Brainrot Wiki
 Gets accurate trait names, multipliers, and details
 """
 
-import requests
 from bs4 import BeautifulSoup
 import json
 import re
 
+import http_cache
+
 def scrape_traits():
     url = "https://stealabrainrot.fandom.com/wiki/Traits"
     
     print(f"Fetching traits from: {url}")
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
-    
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_cache.get_cache().get(url)
         response.raise_for_status()
         
         # Save debug HTML
@@ -106,6 +103,7 @@ def scrape_traits():
         
         print(f"\n=== Summary ===")
         print(f"Total traits found: {len(all_traits)}")
+        print(f"HTTP cache: {http_cache.get_cache().summary()}")
         
         # Save to JSON
         output_file = 'data/traits_scraped.json'
@@ -4,46 +4,24 @@ Steal a Brainrot Wiki Card Scraper
 Scrapes from individual brainrot cards/figures on the wiki
 """
 
-import requests
-from bs4 import BeautifulSoup
+import argparse
+import asyncio
 import json
 import re
 import os
-import time
+from concurrent.futures import ThreadPoolExecutor
 
-def parse_number(text):
-    """Parse numbers with K, M, B, T suffixes"""
-    if not text or text in ['N/A', '?', 'Unknown', '']:
-        return None
-    
-    # Remove dollar signs, spaces, commas, "/s" suffix
-    text = str(text).replace('$', '').replace(',', '').replace(' ', '').replace('/s', '').strip()
-    
-    if not text:
-        return None
-    
-    # Handle K, M, B, T suffixes
-    multipliers = {
-        'K': 1_000,
-        'M': 1_000_000,
-        'B': 1_000_000_000,
-        'T': 1_000_000_000_000
-    }
-    
-    for suffix, multiplier in multipliers.items():
-        if text.upper().endswith(suffix):
-            try:
-                number = float(text[:-1])
-                return int(number * multiplier)
-            except:
-                return None
-    
-    # Try parsing as plain number
-    try:
-        return int(float(text))
-    except:
-        return None
+import infobox_parser
+import wiki_api
+import wiki_client
+from catalogue_io import DATA_DB_PATH, load_brainrots
+from scrape_journal import ScrapeJournal
+from wiki_page import WikiPage, stats_from_fields
+
+JOURNAL_PATH = 'data/scrape_wiki_cards.journal.jsonl'
 
+# Infobox parser backend for HTML pages (see infobox_parser.py)
+INFOBOX_PARSER = 'auto'
 
 def generate_id(name):
     """Generate URL-safe ID from name"""
@@ -56,55 +34,25 @@ def generate_id(name):
 def scrape_brainrot_page(name):
     """Scrape individual brainrot wiki page"""
     
-    url_name = name.replace(' ', '_')
-    url = f"https://stealabrainrot.fandom.com/wiki/{url_name}"
-    
     print(f"  Fetching {name}...")
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
-    
     try:
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
+        page = WikiPage.fetch(name, parser=INFOBOX_PARSER)
     except Exception as e:
         print(f"    [WARN] Could not fetch page: {e}")
         return None
     
-    soup = BeautifulSoup(response.content, 'html.parser')
-    
-    data = {
-        'name': name,
-        'cost': None,
-        'income_per_second': None,
-        'rarity': None,
-        'id': generate_id(name)
-    }
-    
-    # Look for portable-infobox
-    infobox = soup.find('aside', class_='portable-infobox')
+    if not page.exists:
+        print(f"    [WARN] Could not fetch page: 404 Not Found")
+        return None
     
-    if infobox:
-        # Find all data items
-        data_items = infobox.find_all('div', class_='pi-data')
-        
-        for item in data_items:
-            label_elem = item.find('h3', class_='pi-data-label')
-            value_elem = item.find('div', class_='pi-data-value')
-            
-            if not label_elem or not value_elem:
-                continue
-            
-            label = label_elem.get_text(strip=True).lower()
-            value = value_elem.get_text(strip=True)
-            
-            if 'cost' in label or 'price' in label:
-                data['cost'] = parse_number(value)
-            elif 'income' in label or 'money' in label or '/s' in label:
-                data['income_per_second'] = parse_number(value)
-            elif 'rarity' in label or 'tier' in label or 'type' in label:
-                data['rarity'] = value.lower().replace(' ', '_')
+    # Only the portable-infobox is parsed, not the whole page
+    return card_from_infobox(name, page.infobox['fields'])
+
+
+def card_from_infobox(name, fields):
+    """Build card data from (label, value) infobox pairs, or None if it has no stats"""
+    data = {'name': name, **stats_from_fields(fields), 'id': generate_id(name)}
     
     if data['cost'] or data['income_per_second']:
         print(f"    [OK] Cost: ${data['cost']}, Income: ${data['income_per_second']}/s, Rarity: {data['rarity']}")
@@ -114,7 +62,159 @@ def scrape_brainrot_page(name):
         return None
 
 
+def card_from_wikitext(name, page):
+    """Build card data from a page fetched through the MediaWiki API"""
+    print(f"  Parsing {name}...")
+    
+    if not page:
+        print(f"    [WARN] Could not fetch page: not found")
+        return None
+    
+    return card_from_infobox(name, wiki_api.parse_infobox(page['wikitext']).items())
+
+
+def scrape_with_corrections(name, name_corrections):
+    """Scrape a brainrot page, retrying with the corrected wiki name if needed"""
+    result = scrape_brainrot_page(name)
+    
+    # If failed and we have a correction, try the corrected name
+    if not result and name in name_corrections:
+        corrected_name = name_corrections[name]
+        print(f"    [RETRY] Trying corrected name: {corrected_name}")
+        result = scrape_brainrot_page(corrected_name)
+        if result:
+            # Use the original name in the result
+            result['name'] = name
+            result['id'] = generate_id(name)
+            print(f"    [OK] Success with corrected name!")
+    
+    return result
+
+
+def crawl_sequential(brainrot_names, name_corrections, journal=None):
+    """Scrape brainrots one at a time, returning results in input order"""
+    results = []
+    
+    for idx, name in enumerate(brainrot_names, 1):
+        # Progress indicator every 10 items
+        if idx % 10 == 0 or idx == 1:
+            print(f"\n[{idx}/{len(brainrot_names)}] Progress: {idx/len(brainrot_names)*100:.1f}%")
+        
+        result = scrape_with_corrections(name, name_corrections)
+        if journal is not None and result:
+            journal.record(name, result)
+        results.append(result)
+    
+    return results
+
+
+async def crawl_async(brainrot_names, name_corrections, concurrency=8, rps=None, journal=None):
+    """Scrape brainrots concurrently, returning results in input order
+    
+    This is a thread pool, not async I/O: every page is a blocking
+    requests call run on one of `concurrency` executor threads (each with
+    its own pooled connection), and asyncio only collects the results.
+    The wiki rate limiter caps the crawl at `rps` requests per second
+    (default: the wiki's rate in wiki_client.HOST_RATES); the override
+    only lasts for this crawl.
+    """
+    if rps is None:
+        rps = wiki_client.HOST_RATES[wiki_client.WIKI_HOST][0]
+    wiki_client.set_pool_size(concurrency)
+    
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    # Bursts never exceed one second's worth of requests
+    rate = wiki_client.host_rate(wiki_client.WIKI_HOST, rps, burst=max(1, min(concurrency, int(rps))))
+    done = 0
+    
+    async def scrape_one(name):
+        nonlocal done
+        result = await loop.run_in_executor(executor, scrape_with_corrections, name, name_corrections)
+        
+        if journal is not None and result:
+            journal.record(name, result)
+        
+        done += 1
+        if done % 10 == 0 or done == len(brainrot_names):
+            print(f"\n[{done}/{len(brainrot_names)}] Progress: {done/len(brainrot_names)*100:.1f}%")
+        return result
+    
+    try:
+        with rate:
+            return await asyncio.gather(*(scrape_one(name) for name in brainrot_names))
+    finally:
+        executor.shutdown(wait=False)
+
+
+def crawl_api(brainrot_names, name_corrections, backend, journal=None):
+    """Scrape brainrots through the MediaWiki API, 50 pages per request
+    
+    Returns results in input order, like crawl_sequential.
+    """
+    print(f"Fetching {len(brainrot_names)} pages in batches of {wiki_api.MAX_TITLES}...")
+    results = []
+    for batch in wiki_api.chunked(brainrot_names):
+        pages = wiki_api.fetch_wikitext(backend, batch)
+        for name in batch:
+            result = card_from_wikitext(name, pages.get(name))
+            # Journal each title as soon as it is done, so a crash keeps finished batches
+            if journal is not None and result:
+                journal.record(name, result)
+            results.append(result)
+    
+    # Retry failures with their corrected wiki names in one more batch
+    retry = {name: name_corrections[name] for name, result in zip(brainrot_names, results)
+             if not result and name in name_corrections}
+    
+    if retry:
+        print(f"\n[RETRY] Trying {len(retry)} corrected names...")
+        corrected_pages = wiki_api.fetch_wikitext(backend, list(retry.values()))
+        
+        for idx, name in enumerate(brainrot_names):
+            if name not in retry:
+                continue
+            result = card_from_wikitext(retry[name], corrected_pages.get(retry[name]))
+            if result:
+                # Use the original name in the result
+                result['name'] = name
+                result['id'] = generate_id(name)
+                print(f"    [OK] Success with corrected name!")
+                results[idx] = result
+                if journal is not None:
+                    journal.record(name, result)
+    
+    print(f"\n[API] {backend.requests_made} API requests for {len(brainrot_names)} brainrots")
+    return results
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Scrape brainrot cards from the Fandom wiki')
+    parser.add_argument('--backend', choices=['html', 'api'], default='html',
+                        help='fetch rendered HTML pages or batched wikitext from the MediaWiki API')
+    parser.add_argument('--api-fixture', metavar='PATH',
+                        help='serve API requests from a local JSON file instead of the wiki')
+    parser.add_argument('--parser', choices=['auto'] + list(infobox_parser.BACKENDS), default='auto',
+                        help='infobox parser for HTML pages (default: lxml if installed)')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue an interrupted run, skipping brainrots already in the journal')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='crawl pages on a thread pool instead of one at a time')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='max pages in flight in async mode (default: 8)')
+    parser.add_argument('--rps', type=float, default=wiki_client.HOST_RATES[wiki_client.WIKI_HOST][0],
+                        help='max requests per second to the wiki in async mode '
+                             f'(default: {wiki_client.HOST_RATES[wiki_client.WIKI_HOST][0]:g}, the wiki rate limit)')
+    return parser.parse_args()
+
+
 def main():
+    global INFOBOX_PARSER
+    
+    args = parse_args()
+    INFOBOX_PARSER = args.parser
+    
     print("="*70)
     print("STEAL A BRAINROT WIKI CARD SCRAPER")
     print("Scrapes accurate data from individual brainrot wiki pages")
@@ -126,9 +226,7 @@ def main():
         print("We need this file to know which brainrots to scrape.")
         return
     
-    with open('data/brainrots.json', 'r', encoding='utf-8') as f:
-        existing_data = json.load(f)
-        existing_brainrots = existing_data.get('brainrots', []) if isinstance(existing_data, dict) else existing_data
+    existing_brainrots = load_brainrots(DATA_DB_PATH, mutable=False)
     
     print(f"Loaded {len(existing_brainrots)} brainrot names\n")
     
@@ -150,8 +248,15 @@ def main():
     print(f"Created lookup for {len(existing_lookup)} existing brainrots\n")
     
     # Scrape ALL brainrots
+    rate = args.rps if args.use_async else wiki_client.HOST_RATES[wiki_client.WIKI_HOST][0]
+    if args.backend == 'api':
+        rate *= wiki_api.MAX_TITLES
     print(f"Starting full scrape of {len(existing_brainrots)} brainrots...")
-    print(f"This will take approximately {len(existing_brainrots) * 0.5 / 60:.1f} minutes\n")
+    if args.backend == 'api':
+        print(f"API mode: wikitext for up to {wiki_api.MAX_TITLES} brainrots per request")
+    elif args.use_async:
+        print(f"Async mode: {args.concurrency} concurrent requests, max {args.rps} requests/second")
+    print(f"This will take approximately {len(existing_brainrots) / rate / 60:.1f} minutes\n")
     print("Progress will be shown every 10 brainrots...\n")
     
     # Get all brainrot names from existing data
@@ -167,24 +272,22 @@ def main():
     successful = 0
     failed = 0
     
-    for idx, name in enumerate(brainrot_names, 1):
-        # Progress indicator every 10 items
-        if idx % 10 == 0 or idx == 1:
-            print(f"\n[{idx}/{len(brainrot_names)}] Progress: {idx/len(brainrot_names)*100:.1f}%")
-        
-        result = scrape_brainrot_page(name)
-        
-        # If failed and we have a correction, try the corrected name
-        if not result and name in name_corrections:
-            corrected_name = name_corrections[name]
-            print(f"    [RETRY] Trying corrected name: {corrected_name}")
-            result = scrape_brainrot_page(corrected_name)
-            if result:
-                # Use the original name in the result
-                result['name'] = name
-                result['id'] = generate_id(name)
-                print(f"    [OK] Success with corrected name!")
-        
+    # Every finished brainrot is journaled so an interrupted run can --resume
+    journal = ScrapeJournal(JOURNAL_PATH, resume=args.resume)
+    pending = [name for name in brainrot_names if not journal.is_done(name)]
+    if args.resume:
+        print(f"[RESUME] {len(brainrot_names) - len(pending)} already scraped, {len(pending)} remaining\n")
+    
+    if args.backend == 'api':
+        crawl_api(pending, name_corrections, wiki_api.get_backend(args.api_fixture), journal)
+    elif args.use_async:
+        asyncio.run(crawl_async(pending, name_corrections, args.concurrency, args.rps, journal))
+    else:
+        crawl_sequential(pending, name_corrections, journal)
+    
+    results = [journal.get(name) for name in brainrot_names]
+    
+    for name, result in zip(brainrot_names, results):
         if result:
             # Merge with existing data to preserve thumbnails
             if name in existing_lookup:
@@ -225,9 +328,6 @@ def main():
                 'wiki_url': f"https://stealabrainrot.fandom.com/wiki/{wiki_name.replace(' ', '_')}"
             })
             failed += 1
-        
-        # Be nice to the server (0.5 second delay)
-        time.sleep(0.5)
     
     print("\n" + "="*70)
     print("SCRAPING COMPLETE!")
@@ -284,6 +384,9 @@ def main():
         
         print(f"[FAILED] Saved {len(failed_scrapes)} failed brainrots to {failed_file}")
     
+    # Results are saved - the journal is no longer needed
+    journal.finish()
+    
     # Show sample of scraped data
     if scraped_data:
         print("\n" + "="*70)
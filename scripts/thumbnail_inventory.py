@@ -0,0 +1,123 @@
+"""
+Thumbnail Inventory
+One os.scandir pass over app/public/thumbnails records the name, size and
+mtime of every thumbnail; existence checks after that are dictionary
+lookups instead of one stat per brainrot (slow on network mounts).
+
+Besides missing files it flags broken ones by size alone:
+
+- empty      zero bytes
+- truncated  smaller than the blob the thumbnail store recorded for that
+             name, or too small to be an image at all
+
+Temp files from interrupted downloads and links (.*.part, .*.link) are
+ignored.
+
+    inventory = get_inventory()
+    inventory.exists('thumbnails/Strawberry_Elephant.png')
+"""
+
+import os
+from pathlib import Path
+
+import thumbnail_store
+
+THUMB_DIR = thumbnail_store.THUMB_DIR
+PUBLIC_DIR = THUMB_DIR.parent
+
+# Smallest possible PNG (signature + IHDR + IDAT + IEND chunks)
+MIN_IMAGE_BYTES = 67
+
+
+class ThumbnailInventory:
+    """Snapshot of the thumbnail folder: {name: (size, mtime_ns)}"""
+
+    def __init__(self, thumb_dir=THUMB_DIR, store=None):
+        self.thumb_dir = Path(thumb_dir)
+        self.store = store
+        self.files = {}
+        self.scan()
+
+    def scan(self):
+        """(Re)read the whole folder in one pass"""
+        self.files = {}
+        try:
+            with os.scandir(self.thumb_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.') or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    self.files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+        return self
+
+    def update(self, name):
+        """Re-stat a single thumbnail after writing or deleting it"""
+        try:
+            stat = os.stat(self.thumb_dir / name)
+            self.files[name] = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            self.files.pop(name, None)
+
+    def _name(self, image):
+        """File name for a brainrot `image` value (thumbnails/X.png) or bare name"""
+        path = Path(image)
+        if len(path.parts) == 1:
+            return path.name
+        if (PUBLIC_DIR / path).parent == self.thumb_dir:
+            return path.name
+        return None
+
+    def status(self, image):
+        """'ok', 'missing', 'empty' or 'truncated'"""
+        name = self._name(image)
+        if name is None:
+            # Outside the thumbnail folder: fall back to a stat
+            return 'ok' if (PUBLIC_DIR / image).is_file() else 'missing'
+
+        entry = self.files.get(name)
+        if entry is None:
+            return 'missing'
+
+        size = entry[0]
+        if size == 0:
+            return 'empty'
+
+        expected = None
+        if self.store is not None:
+            digest = self.store.names.get(name)
+            expected = self.store.blobs.get(digest, {}).get('size') if digest else None
+        if size < MIN_IMAGE_BYTES or (expected and size < expected):
+            return 'truncated'
+        return 'ok'
+
+    def exists(self, image):
+        """True if the thumbnail is on disk and not empty or truncated"""
+        return bool(image) and self.status(image) == 'ok'
+
+    def size(self, image):
+        entry = self.files.get(self._name(image) or '')
+        return entry[0] if entry else None
+
+    def mtime_ns(self, image):
+        entry = self.files.get(self._name(image) or '')
+        return entry[1] if entry else None
+
+    def problems(self):
+        """{name: 'empty' | 'truncated'} for every broken file in the folder"""
+        statuses = {name: self.status(name) for name in self.files}
+        return {name: status for name, status in sorted(statuses.items()) if status != 'ok'}
+
+
+_inventory = None
+
+
+def get_inventory(refresh=False):
+    """Return the shared inventory for this run (scanned on first use)"""
+    global _inventory
+    if _inventory is None:
+        _inventory = ThumbnailInventory(store=thumbnail_store.get_store())
+    elif refresh:
+        _inventory.scan()
+    return _inventory
@@ -0,0 +1,228 @@
+"""
+Thumbnail Pack File
+All thumbnails concatenated into one file (data/thumbnails.pack) with a
+fixed-width index, read through mmap: opening the pack is one open() and
+every thumbnail after that is a zero-copy slice, instead of an open/stat per
+image in app/public/thumbnails.
+
+Layout (little-endian):
+
+    header   16 bytes   magic b'BRTP', version u16, reserved u16, count u32, reserved u32
+    index    count x 32 bytes, sorted by name:
+                        data offset u64, source mtime_ns u64, data length u32,
+                        name offset u32, name length u16, pad 6
+    names    UTF-8 file names, concatenated
+    data     image bytes, concatenated
+
+The index keeps each source thumbnail's size and mtime, so changes() can
+tell when the pack no longer matches app/public/thumbnails; --serve rebuilds
+a stale pack before serving it.
+
+get() returns memoryviews into the mapping. Release them (or let them go
+out of scope) before close(): the mapping cannot be closed while a view of
+it is alive.
+
+    python scripts/thumbnail_pack.py --build           # pack app/public/thumbnails
+    python scripts/thumbnail_pack.py --list            # names and sizes
+    python scripts/thumbnail_pack.py --serve 8001      # serve /thumbnails/<name> from the pack
+"""
+
+import argparse
+import bisect
+import mmap
+import struct
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import downloads
+import thumbnail_store
+
+PACK_PATH = Path('data/thumbnails.pack')
+
+MAGIC = b'BRTP'
+VERSION = 2
+HEADER = struct.Struct('<4sHHII')
+ENTRY = struct.Struct('<QqIIH6x')
+
+
+def _source_files(thumb_dir):
+    return sorted((p.name.encode('utf-8'), p) for p in Path(thumb_dir).glob('*')
+                  if p.is_file() and not p.name.startswith('.'))
+
+
+def build_pack(thumb_dir=thumbnail_store.THUMB_DIR, path=PACK_PATH):
+    """Write every thumbnail in `thumb_dir` into a pack file, returning (count, bytes)"""
+    files = _source_files(thumb_dir)
+
+    names = b''.join(name for name, _ in files)
+    data_start = HEADER.size + ENTRY.size * len(files) + len(names)
+
+    index = []
+    offset = data_start
+    name_offset = HEADER.size + ENTRY.size * len(files)
+    for name, file_path in files:
+        stat = file_path.stat()
+        length = stat.st_size
+        index.append(ENTRY.pack(offset, stat.st_mtime_ns, length, name_offset, len(name)))
+        offset += length
+        name_offset += len(name)
+
+    with downloads.atomic_write(path) as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(files), 0))
+        f.write(b''.join(index))
+        f.write(names)
+        for _, file_path in files:
+            with open(file_path, 'rb') as src:
+                f.write(src.read())
+        written = f.tell()
+
+    if written != offset:
+        raise IOError(f"Thumbnails changed while packing ({written} bytes written, expected {offset})")
+    return len(files), written
+
+
+class ThumbnailPack:
+    """Read-only, memory-mapped view of a pack file"""
+
+    def __init__(self, path=PACK_PATH):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mmap)
+
+        magic, version, _, count, _ = HEADER.unpack_from(self.mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} thumbnail pack (rebuild it with --build)")
+
+        self.count = count
+        self._names = None
+
+    def _entry(self, i):
+        return ENTRY.unpack_from(self.mmap, HEADER.size + i * ENTRY.size)
+
+    def _name(self, i):
+        _, _, _, name_offset, name_length = self._entry(i)
+        return bytes(self.view[name_offset:name_offset + name_length]).decode('utf-8')
+
+    def names(self):
+        """All file names, in index (sorted) order"""
+        if self._names is None:
+            self._names = [self._name(i) for i in range(self.count)]
+        return self._names
+
+    def _find(self, name):
+        """Index position of `name`, or None (binary search over the sorted index)"""
+        names = self.names()
+        i = bisect.bisect_left(names, name)
+        return i if i < len(names) and names[i] == name else None
+
+    def __contains__(self, name):
+        return self._find(name) is not None
+
+    def __len__(self):
+        return self.count
+
+    def size(self, name):
+        """Byte length of a thumbnail, or None if it is not in the pack"""
+        i = self._find(name)
+        return None if i is None else self._entry(i)[2]
+
+    def get(self, name):
+        """Zero-copy memoryview of a thumbnail's bytes, or None if it is not in the pack
+
+        The view points into the mapping: release() it (or drop every
+        reference to it) before the pack is closed, or close() fails.
+        Copy it with bytes() to keep the data past the pack's lifetime.
+        """
+        i = self._find(name)
+        if i is None:
+            return None
+        offset, _, length, _, _ = self._entry(i)
+        return self.view[offset:offset + length]
+
+    def changes(self, thumb_dir=thumbnail_store.THUMB_DIR):
+        """Names added, removed or modified in `thumb_dir` since the pack was built"""
+        current = {name.decode('utf-8'): path.stat() for name, path in _source_files(thumb_dir)}
+        changed = [name for name in self.names() if name not in current]
+        for name, stat in current.items():
+            i = self._find(name)
+            if i is None:
+                changed.append(name)
+                continue
+            _, mtime_ns, length, _, _ = self._entry(i)
+            if (stat.st_size, stat.st_mtime_ns) != (length, mtime_ns):
+                changed.append(name)
+        return sorted(changed)
+
+    def close(self):
+        self.view.release()
+        try:
+            self.mmap.close()
+        except BufferError:
+            raise BufferError(f"{self.path}: release every memoryview returned by get() before closing the pack") from None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def serve(pack, port):
+    """Serve /thumbnails/<name> straight from the pack (for local development)"""
+    content_types = {'.png': 'image/png', '.webp': 'image/webp', '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg'}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            name = self.path.split('?')[0].rsplit('/', 1)[-1]
+            data = pack.get(name) if self.path.startswith('/thumbnails/') else None
+            if data is None:
+                self.send_error(404)
+                return
+            with data:
+                self.send_response(200)
+                self.send_header('Content-Type', content_types.get(Path(name).suffix.lower(), 'application/octet-stream'))
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+    print(f"🌐 Serving {len(pack)} thumbnails on http://localhost:{port}/thumbnails/")
+    ThreadingHTTPServer(('', port), Handler).serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memory-mapped thumbnail pack file')
+    parser.add_argument('--build', action='store_true', help='pack app/public/thumbnails')
+    parser.add_argument('--list', action='store_true', help='list the packed thumbnails')
+    parser.add_argument('--serve', type=int, metavar='PORT', help='serve thumbnails from the pack')
+    parser.add_argument('--pack', default=PACK_PATH, type=Path, help=f'pack file (default: {PACK_PATH})')
+    args = parser.parse_args()
+
+    if args.serve and not args.build:
+        try:
+            with ThumbnailPack(args.pack) as pack:
+                changed = pack.changes()
+            reason = f"{len(changed)} thumbnails changed since it was built" if changed else None
+        except (OSError, ValueError) as e:
+            reason = str(e)
+        if reason:
+            print(f"⚠️  Rebuilding {args.pack}: {reason}")
+            args.build = True
+
+    if args.build:
+        count, size = build_pack(path=args.pack)
+        print(f"📦 Packed {count} thumbnails into {args.pack} ({size / 1024 / 1024:.1f} MB)")
+
+    if args.list or args.serve:
+        with ThumbnailPack(args.pack) as pack:
+            if args.list:
+                for name in pack.names():
+                    print(f"{pack.size(name):>10,}  {name}")
+                print(f"\n{len(pack)} thumbnails")
+            if args.serve:
+                serve(pack, args.serve)
+
+
+if __name__ == '__main__':
+    main()
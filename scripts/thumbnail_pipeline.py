@@ -0,0 +1,213 @@
+"""
+Parallel Thumbnail Pipeline
+Two bounded worker pools instead of one brainrot at a time:
+
+1. resolve  - fetch wiki pages (stealabrainrot.fandom.com) and find the
+              full-size image URL, trying each candidate page in turn
+2. download - stream the images from the CDN (static.wikia.nocookie.net)
+              into the content-addressed thumbnail store, so an image URL
+              shared by several brainrots is fetched once
+
+Images are requested as the CDN's scale-to-width-down variant at the width
+the app displays (wiki_page.THUMBNAIL_WIDTH); width=None fetches originals.
+
+Each host gets its own concurrency limit on top of the per-host rate limits
+in wiki_client. Every run ends with one consolidated report in
+data/thumbnail_report.json.
+"""
+
+import json
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import http_cache
+import thumbnail_store
+import wiki_client
+from wiki_page import THUMBNAIL_WIDTH, WikiPage, scaled_image
+
+THUMB_DIR = thumbnail_store.THUMB_DIR
+REPORT_PATH = 'data/thumbnail_report.json'
+
+# Concurrent requests per host (matches the burst sizes in wiki_client.HOST_RATES)
+WIKI_WORKERS = 2
+CDN_WORKERS = 8
+
+STATUS_LABELS = {
+    'downloaded': '✅ Downloaded',
+    'skipped': '⏭️  Already on disk',
+    'not_found': '❌ Not found on wiki',
+    'download_failed': '⚠️  Download failed'
+}
+
+
+def make_job(name, filename, wiki_names=None, wiki_urls=None, br_id=None, image_url=None, sha1=None):
+    """Describe one thumbnail to fetch
+
+    Candidate pages are tried in order: wiki_urls first, then wiki_names
+    (defaults to the brainrot name itself). A job that already knows its
+    image_url (e.g. from the wiki's imageinfo) skips the page fetch, and its
+    sha1 lets the store reuse identical bytes without downloading.
+    """
+    urls = list(wiki_urls or [])
+    for wiki_name in wiki_names or ([] if wiki_urls else [name]):
+        url = wiki_client.wiki_url(wiki_name)
+        if url not in urls:
+            urls.append(url)
+
+    return {
+        'name': name,
+        'id': br_id,
+        'filename': filename,
+        'path': str(THUMB_DIR / filename),
+        'wiki_urls': urls,
+        'image_url': image_url,
+        'sha1': sha1
+    }
+
+
+def resolve_image_url(job, cache=None):
+    """Return (image_url, page_url, error) for the first candidate page with an image"""
+    error = 'No candidate pages'
+
+    for url in job['wiki_urls']:
+        try:
+            page = WikiPage.fetch_url(url, name=job['name'], cache=cache)
+        except Exception as e:
+            error = f"Request error: {e}"
+            continue
+
+        if not page.exists:
+            error = '404 Not Found'
+            continue
+
+        image_url = page.get('image_url')
+        if image_url:
+            return image_url, url, None
+        error = 'No image found in infobox'
+
+    return None, None, error
+
+
+class ThumbnailPipeline:
+    """Resolve and download many thumbnails with separate wiki/CDN worker pools"""
+
+    def __init__(self, wiki_workers=WIKI_WORKERS, cdn_workers=CDN_WORKERS, skip_existing=True, cache=None, store=None,
+                 width=THUMBNAIL_WIDTH):
+        self.wiki_workers = wiki_workers
+        self.cdn_workers = cdn_workers
+        self.skip_existing = skip_existing
+        self.width = width
+        self.cache = cache if cache is not None else http_cache.get_cache()
+        self.store = store if store is not None else thumbnail_store.get_store()
+        self.print_lock = threading.Lock()
+        self.finished = 0
+        self.total = 0
+
+    def log(self, result):
+        with self.print_lock:
+            self.finished += 1
+            detail = result.get('error') or result['path']
+            print(f"[{self.finished}/{self.total}] {STATUS_LABELS[result['status']]}: {result['name']} - {detail}")
+
+    def resolve(self, job):
+        image_url, page_url, error = resolve_image_url(job, self.cache)
+        result = dict(job, image_url=image_url, page_url=page_url)
+        if not image_url:
+            result.update(status='not_found', error=error)
+            self.log(result)
+        return result
+
+    def download(self, result):
+        result['image_url'] = scaled_image(result['image_url'], self.width)
+        try:
+            digest = self.store.put_url(result['image_url'], result['filename'], sha1=result.get('sha1'))
+            result.update(status='downloaded', sha256=digest, bytes=self.store.blobs[digest]['size'])
+        except Exception as e:
+            result.update(status='download_failed', error=str(e))
+        self.log(result)
+        return result
+
+    def run(self, jobs):
+        """Process every job, returning one result dict per job in input order"""
+        self.total = len(jobs)
+        self.finished = 0
+        results = [None] * len(jobs)
+
+        with ThreadPoolExecutor(max_workers=self.wiki_workers) as wiki_pool, \
+                ThreadPoolExecutor(max_workers=self.cdn_workers) as cdn_pool:
+            resolving = {}
+            downloading = {}
+            for i, job in enumerate(jobs):
+                if self.skip_existing and os.path.exists(job['path']) and os.path.getsize(job['path']) > 0:
+                    results[i] = dict(job, status='skipped')
+                    self.log(results[i])
+                elif job.get('image_url'):
+                    downloading[cdn_pool.submit(self.download, dict(job, page_url=None))] = i
+                else:
+                    resolving[wiki_pool.submit(self.resolve, job)] = i
+
+            # Downloads start as soon as each page is resolved
+            for future in as_completed(resolving):
+                i = resolving[future]
+                result = future.result()
+                if result.get('status') == 'not_found':
+                    results[i] = result
+                else:
+                    downloading[cdn_pool.submit(self.download, result)] = i
+
+            for future in as_completed(downloading):
+                results[downloading[future]] = future.result()
+
+        self.store.save()
+        return results
+
+
+def run_pipeline(jobs, wiki_workers=WIKI_WORKERS, cdn_workers=CDN_WORKERS, skip_existing=True, width=THUMBNAIL_WIDTH):
+    """Run the pipeline with default settings"""
+    return ThumbnailPipeline(wiki_workers, cdn_workers, skip_existing, width=width).run(jobs)
+
+
+def save_report(results, source, path=REPORT_PATH):
+    """Write the consolidated success/failure report"""
+    counts = Counter(result['status'] for result in results)
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'source': source,
+        'total': len(results),
+        'counts': {status: counts.get(status, 0) for status in STATUS_LABELS},
+        'results': [
+            {key: result[key] for key in ('name', 'id', 'filename', 'status', 'image_url', 'page_url', 'sha256', 'bytes', 'error')
+             if result.get(key) is not None}
+            for result in results
+        ]
+    }
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    return report
+
+
+def print_report(results, path=REPORT_PATH):
+    """Print the run summary and where the report was saved"""
+    counts = Counter(result['status'] for result in results)
+
+    print("\n" + "=" * 80)
+    print("📊 THUMBNAIL SUMMARY")
+    print("=" * 80)
+    for status, label in STATUS_LABELS.items():
+        print(f"  {label}: {counts.get(status, 0)}")
+
+    failures = [r for r in results if r['status'] in ('not_found', 'download_failed')]
+    if failures:
+        print(f"\n⚠️  Failed brainrots:")
+        for result in failures[:10]:
+            print(f"  - {result['name']}: {result.get('error')}")
+        if len(failures) > 10:
+            print(f"  ... and {len(failures) - 10} more")
+
+    print(f"\n📦 Store: {thumbnail_store.get_store().summary()}")
+    print(f"📄 Report: {path}")
@@ -0,0 +1,384 @@
+"""
+Content-Addressed Thumbnail Store
+Every thumbnail is stored once as a blob named by the sha256 of its bytes
+(data/thumbnail_store/ab/abcdef...). A manifest maps each public filename
+and each source URL to its blob hash:
+
+    {"names": {"Strawberry_Elephant.png": "ab12..."},
+     "urls":  {"https://static.wikia.nocookie.net/...": "ab12..."},
+     "blobs": {"ab12...": {"size": 48213, "sha1": "9f3c...", "source_sha1": "07d1...",
+                           "variants": ["/scale-to-width-down/256"]}},
+     "validators": {"https://static.wikia.nocookie.net/...": {"etag": "...", "last_modified": "..."}}}
+
+The files in app/public/thumbnails/ are hard links to the blobs (copies
+where links are not supported), so names that share an image share its
+bytes on disk, an image URL already in the store is never downloaded again,
+and renaming a thumbnail is a manifest update. Blobs also record their SHA-1
+so images can be matched against the wiki's own file hashes; a blob that is a
+scaled-down CDN variant records the SHA-1 of the wiki original as
+source_sha1. Blobs fetched by URL also record which rendition of the file
+they are ("variants": the URL path after /revision/<id>, "" for the original),
+so a download of the original is never reused as a scaled variant or the
+other way round.
+
+Fandom's /revision/latest URLs stay the same when a file is re-uploaded.
+When no wiki SHA-1 is given to check a stored one against, such a URL is
+revalidated with the CDN (If-None-Match / If-Modified-Since, once per run)
+and downloaded again only if it changed.
+
+Blobs are never modified in place: every write goes through a temp file and
+an atomic rename, which replaces the public file's link rather than the
+blob it pointed to.
+
+    python scripts/thumbnail_store.py --import   # adopt existing thumbnails
+    python scripts/thumbnail_store.py            # show store statistics
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+
+import downloads
+
+# URLs whose content can change without the URL changing
+MUTABLE_URL_MARKER = '/revision/latest'
+
+# The rendition part of a Fandom CDN URL: .../revision/latest/scale-to-width-down/256?cb=...
+VARIANT_PATTERN = re.compile(r'/revision/[^/?#]+(/[^?#]*)?')
+
+STORE_DIR = Path('data/thumbnail_store')
+MANIFEST_PATH = Path('data/thumbnail_manifest.json')
+THUMB_DIR = Path('app/public/thumbnails')
+
+
+def hash_file(path, chunk_size=downloads.CHUNK_SIZE):
+    """(sha256, sha1) hex digests of a file, read once in chunks"""
+    sha256 = hashlib.sha256()
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha256.update(chunk)
+            sha1.update(chunk)
+    return sha256.hexdigest(), sha1.hexdigest()
+
+
+def url_variant(url):
+    """Which rendition of a wiki file `url` serves ('' for the original)"""
+    match = VARIANT_PATTERN.search(url)
+    return (match.group(1) or '').rstrip('/') if match else ''
+
+
+class ThumbnailStore:
+    """sha256 blob store with a name -> hash and url -> hash manifest"""
+
+    def __init__(self, store_dir=STORE_DIR, manifest_path=MANIFEST_PATH, public_dir=THUMB_DIR):
+        self.store_dir = Path(store_dir)
+        self.manifest_path = Path(manifest_path)
+        self.public_dir = Path(public_dir)
+        self.lock = threading.Lock()
+        self.url_locks = {}
+        self.revalidated = set()
+        self.stats = {
+            'downloaded': 0,
+            'reused': 0,
+            'revalidated': 0,
+            'linked': 0
+        }
+
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        else:
+            manifest = {}
+
+        self.names = manifest.get('names', {})
+        self.urls = manifest.get('urls', {})
+        self.blobs = manifest.get('blobs', {})
+        self.validators = manifest.get('validators', {})
+
+    def blob_path(self, digest):
+        return self.store_dir / digest[:2] / digest
+
+    def has_blob(self, digest):
+        return digest in self.blobs and self.blob_path(digest).exists()
+
+    def _add_file(self, path):
+        """Move a finished temp file into the store, returning its hash"""
+        digest, sha1 = hash_file(path)
+        target = self.blob_path(digest)
+
+        with self.lock:
+            if target.exists():
+                os.remove(path)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(path, target)
+            self.blobs[digest] = {'size': target.stat().st_size, 'sha1': sha1}
+
+        return digest
+
+    def add_bytes(self, data):
+        """Store bytes, returning their hash (no-op if already stored)"""
+        digest = hashlib.sha256(data).hexdigest()
+        if not self.has_blob(digest):
+            downloads.write_bytes(self.blob_path(digest), data)
+            with self.lock:
+                self.blobs[digest] = {'size': len(data), 'sha1': hashlib.sha1(data).hexdigest()}
+        return digest
+
+    def _note_variant(self, digest, url):
+        """Record that the blob is the rendition `url` serves (caller holds the lock)"""
+        variants = self.blobs[digest].setdefault('variants', [])
+        variant = url_variant(url)
+        if variant not in variants:
+            variants.append(variant)
+            variants.sort()
+
+    def find_sha1(self, sha1, variant=''):
+        """Hash of a stored blob that is the `variant` rendition of the wiki file with this SHA-1, or None
+
+        The original ('') matches on the blob's own SHA-1; a scaled variant
+        only matches a blob downloaded as that same variant of the file.
+        """
+        with self.lock:
+            missing = [d for d, blob in self.blobs.items() if 'sha1' not in blob]
+        for digest in missing:
+            if self.blob_path(digest).exists():
+                blob_sha1 = hash_file(self.blob_path(digest))[1]
+                with self.lock:
+                    self.blobs[digest]['sha1'] = blob_sha1
+
+        def matches(blob):
+            if variant in blob.get('variants', []):
+                return sha1 in (blob.get('sha1'), blob.get('source_sha1'))
+            return not variant and blob.get('sha1') == sha1
+
+        with self.lock:
+            candidates = [d for d, blob in self.blobs.items() if matches(blob)]
+        for digest in candidates:
+            if self.blob_path(digest).exists():
+                return digest
+        return None
+
+    def is_current(self, digest, sha1=None):
+        """True if the blob is stored and, given the wiki's SHA-1, was made from that file"""
+        if not self.has_blob(digest):
+            return False
+        blob = self.blobs[digest]
+        return not sha1 or sha1 in (blob.get('sha1'), blob.get('source_sha1'))
+
+    def is_from(self, filename, sha1):
+        """True if public thumbnail `filename` is the wiki file with this SHA-1 or a scaled copy of it"""
+        digest = self.names.get(filename)
+        return bool(digest) and self.is_current(digest, sha1) and self.is_published(filename, digest)
+
+    def is_published(self, filename, digest):
+        """True if public thumbnail `filename` holds the blob's bytes (a link to it, or a copy)"""
+        target = self.public_dir / filename
+        blob = self.blob_path(digest)
+        if not target.exists() or not blob.exists():
+            return False
+        if os.path.samefile(target, blob):
+            return True
+        # Copy fallback (no hard links): compare contents
+        return target.stat().st_size == blob.stat().st_size and hash_file(target)[0] == digest
+
+    def needs_revalidation(self, url):
+        """True for a mutable CDN URL not yet checked with the server in this run"""
+        return MUTABLE_URL_MARKER in url and url not in self.revalidated
+
+    def add_url(self, url, sha1=None):
+        """Return the hash of a URL's image, downloading it only if it is not stored yet
+
+        `sha1` is the wiki's SHA-1 of the original file. With it, a stored
+        URL whose wiki file has since changed is downloaded again, and a blob
+        that is the same rendition (original or scaled variant) of that file is
+        reused even if it came from a different URL. Without it, a stored /revision/latest URL is revalidated with the
+        CDN instead. Concurrent calls for the same URL wait for a single download.
+        """
+        with self.lock:
+            url_lock = self.url_locks.setdefault(url, threading.Lock())
+
+        with url_lock:
+            digest = self.urls.get(url)
+            if not (digest and self.is_current(digest, sha1)) and sha1:
+                digest = self.find_sha1(sha1, url_variant(url))
+            elif digest and not sha1 and self.has_blob(digest) and self.needs_revalidation(url):
+                # Nothing to check the stored copy against: ask the CDN
+                return self._download(url, sha1, current=digest)
+
+            if digest and self.has_blob(digest):
+                with self.lock:
+                    self.urls[url] = digest
+                    self.stats['reused'] += 1
+                return digest
+
+            return self._download(url, sha1)
+
+    def _download(self, url, sha1=None, current=None):
+        """Fetch `url` into the store; with `current`, only if the CDN says it changed"""
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.store_dir / f".download-{threading.get_ident()}-{hashlib.sha1(url.encode()).hexdigest()}"
+        validators = dict(self.validators.get(url, {})) if current else {}
+        written = downloads.download_file(url, tmp_path, validators=validators)
+
+        with self.lock:
+            self.revalidated.add(url)
+            if written is None:
+                self.stats['revalidated'] += 1
+                return current
+
+        digest = self._add_file(tmp_path)
+
+        with self.lock:
+            # A scaled variant: remember which original it came from
+            if sha1 and self.blobs[digest]['sha1'] != sha1:
+                self.blobs[digest]['source_sha1'] = sha1
+            self._note_variant(digest, url)
+            self.urls[url] = digest
+            if validators.get('etag') or validators.get('last_modified'):
+                self.validators[url] = validators
+            else:
+                self.validators.pop(url, None)
+            self.stats['downloaded'] += 1
+        return digest
+
+    def link(self, filename, digest):
+        """Point public thumbnail `filename` at a stored blob"""
+        target = self.public_dir / filename
+        blob = self.blob_path(digest)
+
+        # Already pointing at this blob (or an identical copy of it)
+        if self.is_published(filename, digest):
+            with self.lock:
+                self.names[filename] = digest
+            return target
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.{threading.get_ident()}.link")
+        try:
+            os.link(blob, tmp_path)
+            os.replace(tmp_path, target)
+        except OSError:
+            if tmp_path.exists():
+                os.remove(tmp_path)
+            with downloads.atomic_write(target) as f, open(blob, 'rb') as src:
+                shutil.copyfileobj(src, f)
+
+        with self.lock:
+            self.names[filename] = digest
+            self.stats['linked'] += 1
+        return target
+
+    def put_url(self, url, filename, sha1=None):
+        """Store the image at `url` (fetching it at most once) and publish it as `filename`
+
+        `sha1` is the wiki's SHA-1 of the original file, also when `url` is a
+        scaled-down variant of it.
+        """
+        digest = self.add_url(url, sha1)
+        self.link(filename, digest)
+        return digest
+
+    def put_bytes(self, data, filename, url=None):
+        """Store `data` (already fetched from `url`, if given) and publish it as `filename`"""
+        digest = self.add_bytes(data)
+        if url:
+            with self.lock:
+                self._note_variant(digest, url)
+                self.urls[url] = digest
+        self.link(filename, digest)
+        return digest
+
+    def rename(self, old_filename, new_filename):
+        """Rename a public thumbnail without touching its bytes"""
+        digest = self.names[old_filename]
+        self.link(new_filename, digest)
+        old_path = self.public_dir / old_filename
+        if old_path.exists():
+            os.remove(old_path)
+        with self.lock:
+            del self.names[old_filename]
+        return digest
+
+    def import_existing(self):
+        """Adopt the files already in the public thumbnail folder
+
+        Returns (files imported, duplicate files now sharing a blob).
+        """
+        imported = 0
+        duplicates = 0
+
+        for path in sorted(self.public_dir.glob('*')):
+            if not path.is_file() or path.name.startswith('.'):
+                continue
+
+            digest, sha1 = hash_file(path)
+            if self.has_blob(digest):
+                duplicates += 1
+            else:
+                self.blob_path(digest).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(path, self.blob_path(digest))
+                with self.lock:
+                    self.blobs[digest] = {'size': path.stat().st_size, 'sha1': sha1}
+
+            self.link(path.name, digest)
+            imported += 1
+
+        return imported, duplicates
+
+    def save(self):
+        """Write the manifest atomically"""
+        with self.lock:
+            manifest = {
+                'names': dict(sorted(self.names.items())),
+                'urls': dict(sorted(self.urls.items())),
+                'blobs': dict(sorted(self.blobs.items())),
+                'validators': dict(sorted(self.validators.items()))
+            }
+        data = json.dumps(manifest, indent=2, ensure_ascii=False).encode('utf-8')
+        downloads.write_bytes(self.manifest_path, data)
+
+    def summary(self):
+        """One-line description of the store"""
+        stored = sum(blob['size'] for blob in self.blobs.values())
+        referenced = sum(self.blobs[d]['size'] for d in self.names.values() if d in self.blobs)
+        return (f"{len(self.names)} thumbnails, {len(self.blobs)} unique images, "
+                f"{stored / 1024 / 1024:.1f} MB stored ({(referenced - stored) / 1024 / 1024:.1f} MB saved by deduplication)")
+
+
+_store = None
+
+
+def get_store():
+    """Return the shared thumbnail store (created on first use)"""
+    global _store
+    if _store is None:
+        _store = ThumbnailStore()
+    return _store
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Content-addressed thumbnail store')
+    parser.add_argument('--import', dest='import_existing', action='store_true',
+                        help='adopt the existing files in app/public/thumbnails')
+    args = parser.parse_args()
+
+    store = get_store()
+
+    if args.import_existing:
+        print(f"📥 Importing thumbnails from {store.public_dir}...")
+        imported, duplicates = store.import_existing()
+        store.save()
+        print(f"✅ Imported {imported} thumbnails ({duplicates} duplicates now share a blob)")
+
+    print(f"📦 {store.summary()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,25 +6,36 @@ Update Existing Brainrots Database
 - Optionally updates brainrot data (income, cost, rarity)
 """
 
-import json
 import requests
-from bs4 import BeautifulSoup
 from pathlib import Path
-import time
-import re
-import hashlib
-from PIL import Image
-import io
+
+import http_cache
+import thumbnail_store
+import wiki_api
+import wiki_client
+import wiki_image_info
+from catalogue_db import CatalogueConflict
+from change_log import ChangeLog
+from image_hash_index import ImageHashIndex
+from revision_manifest import RevisionManifest
+from scrape_journal import ScrapeJournal
+from thumbnail_inventory import get_inventory
+from wiki_page import THUMBNAIL_WIDTH, WikiPage, scaled_image
 
 class BrainrotUpdater:
-    def __init__(self):
+    def __init__(self, thumbnail_width=THUMBNAIL_WIDTH):
         self.db_path = Path("app/public/brainrots.json")
         self.thumb_dir = Path("app/public/thumbnails")
         self.thumb_dir.mkdir(parents=True, exist_ok=True)
-        
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        self.http_cache = http_cache.get_cache()
+        self.store = thumbnail_store.get_store()
+        self.inventory = get_inventory()
+        self.hash_index = ImageHashIndex()
+        self.image_info = {}
+        self.thumbnail_width = thumbnail_width
+        self.manifest = RevisionManifest()
+        self.journal_path = "data/update_existing_brainrots.journal.jsonl"
+        self.changes = ChangeLog(self.db_path)
         
         self.stats = {
             'total': 0,
@@ -35,102 +46,72 @@ class BrainrotUpdater:
             'thumbnails_different': 0,
             'thumbnails_updated': 0,
             'data_updated': 0,
-            'wiki_not_found': 0
+            'wiki_not_found': 0,
+            'unchanged_skipped': 0,
+            'resumed': 0
         }
     
     def load_database(self):
-        """Load the brainrots database."""
-        with open(self.db_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        """Load the brainrots database (plus changes logged but not yet compacted)."""
+        brainrots = self.changes.load()
+        if self.changes.conflicts:
+            # brainrots.json was rewritten by another tool since these were logged
+            print(f"⚠️  Skipped {len(self.changes.conflicts)} logged changes that conflict with newer edits:")
+            for patch in self.changes.conflicts[:10]:
+                print(f"   {patch['id']}.{patch['field']}: logged {patch['old']!r} → {patch['new']!r}")
+        return brainrots
     
-    def save_database(self, brainrots):
-        """Save the updated database."""
-        # Sort by income
-        brainrots.sort(key=lambda x: x.get('income_per_second') or 0)
-        
-        with open(self.db_path, 'w', encoding='utf-8') as f:
-            json.dump(brainrots, f, indent=2, ensure_ascii=False)
+    def save_database(self, brainrots, compact=False):
+        """Log changed fields; with compact=True also rewrite the database file."""
+        patches = self.changes.record(brainrots, source='update_existing_brainrots')
+        self.store.save()
         
-        print("💾 Database saved!")
+        if compact:
+            # Fold the logged changes into the catalogue database and re-export brainrots.json
+            try:
+                self.changes.compact()
+            except CatalogueConflict as e:
+                # The patches stay in the log; compact again once the conflict is resolved
+                print(f"❌ {e}")
+                print(f"💾 Logged {patches} field changes (not compacted)")
+                return
+            print("💾 Database saved!")
+        else:
+            print(f"💾 Logged {patches} field changes")
     
     def name_to_wiki_url(self, name):
         """Convert brainrot name to wiki URL."""
-        # Replace spaces with underscores
-        wiki_name = name.replace(' ', '_')
-        return f"https://stealabrainrot.fandom.com/wiki/{wiki_name}"
+        return wiki_client.wiki_url(name)
     
     def check_thumbnail_exists(self, image_path):
-        """Check if thumbnail file exists."""
-        if not image_path:
-            return False
-        filepath = Path("app/public") / image_path
-        return filepath.exists()
+        """Check if thumbnail file exists (empty or truncated files count as missing)."""
+        return self.inventory.exists(image_path)
     
     def scrape_brainrot_data(self, name):
         """Scrape brainrot data from wiki."""
         wiki_url = self.name_to_wiki_url(name)
         
         try:
-            response = requests.get(wiki_url, headers=self.headers, timeout=10)
+            # Unchanged pages reuse what was extracted on the last run
+            page = WikiPage.fetch_url(wiki_url, name=name, cache=self.http_cache)
             
-            if response.status_code == 404:
+            if not page.exists:
                 return None
             
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            extracted = page.extract('image_url', 'stats')
             
             data = {
                 'name': name,
                 'wiki_url': wiki_url
             }
             
-            # Find thumbnail image
-            image = None
-            infobox_img = soup.select_one('.pi-image-thumbnail')
-            if infobox_img:
-                image = infobox_img.get('src')
+            if extracted['image_url']:
+                # Card-sized CDN variant unless originals were asked for
+                data['image_url'] = scaled_image(extracted['image_url'], self.thumbnail_width)
             
-            if not image:
-                article_img = soup.select_one('.mw-parser-output img')
-                if article_img:
-                    image = article_img.get('src')
-            
-            if image:
-                if image.startswith('//'):
-                    image = 'https:' + image
-                elif image.startswith('/'):
-                    image = 'https://stealabrainrot.fandom.com' + image
-                
-                # Remove size parameters
-                if '/revision/latest/scale-to-width-down/' in image:
-                    image = image.split('/revision/latest/scale-to-width-down/')[0] + '/revision/latest'
-                
-                data['image_url'] = image
-            
-            # Find income and cost in infobox
-            infobox_data = soup.select('.pi-data-value')
-            for item in infobox_data:
-                text = item.get_text(strip=True)
-                
-                # Income (e.g., "$2M/s", "$500K/s")
-                if '/s' in text:
-                    income_str = text.replace('$', '').replace('/s', '').strip()
-                    income = self.parse_income_string(income_str)
-                    if income:
-                        data['income_per_second'] = income
-                
-                # Cost (e.g., "$550M", "$10K")
-                elif '$' in text and '/s' not in text:
-                    cost_str = text.replace('$', '').strip()
-                    cost = self.parse_income_string(cost_str)
-                    if cost:
-                        data['cost'] = cost
-            
-            # Find rarity
-            rarity_elem = soup.find(string=re.compile(r'Secret|Brainrot God|OG|Legendary|Mythic|Epic|Rare|Common'))
-            if rarity_elem:
-                rarity = rarity_elem.strip().lower().replace(' ', '_')
-                data['rarity'] = rarity
+            for field, value in extracted['stats'].items():
+                if value:
+                    data[field] = value
             
             return data
             
@@ -138,50 +119,18 @@ class BrainrotUpdater:
             print(f"  ⚠️  Error accessing wiki: {e}")
             return None
     
-    def parse_income_string(self, s):
-        """Parse income string like '2M', '500K', '1.5B' to number."""
-        s = s.strip().upper()
-        
-        try:
-            if 'B' in s:
-                return int(float(s.replace('B', '')) * 1_000_000_000)
-            elif 'M' in s:
-                return int(float(s.replace('M', '')) * 1_000_000)
-            elif 'K' in s:
-                return int(float(s.replace('K', '')) * 1_000)
-            else:
-                return int(float(s))
-        except:
-            return None
-    
-    def get_image_hash(self, image_data):
-        """Get perceptual hash of image for comparison."""
-        try:
-            img = Image.open(io.BytesIO(image_data))
-            # Convert to RGB and resize to standard size for comparison
-            img = img.convert('RGB').resize((64, 64), Image.Resampling.LANCZOS)
-            return hashlib.md5(img.tobytes()).hexdigest()
-        except Exception as e:
-            return None
-    
     def compare_images(self, local_path, wiki_url):
-        """Compare local thumbnail with wiki version."""
+        """Compare local thumbnail with wiki version (perceptual hashes from the index)."""
         try:
-            # Read local image
-            with open(local_path, 'rb') as f:
-                local_data = f.read()
-            local_hash = self.get_image_hash(local_data)
-            local_size = len(local_data)
+            local = self.hash_index.local_hash(local_path)
             
-            # Download wiki image
-            response = requests.get(wiki_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            wiki_data = response.content
-            wiki_hash = self.get_image_hash(wiki_data)
-            wiki_size = len(wiki_data)
+            # Only downloads the wiki image if the CDN says it changed
+            wiki, wiki_data = self.hash_index.remote_hash(wiki_url)
             
             # Compare
-            is_same = (local_hash == wiki_hash)
+            is_same = self.hash_index.is_same(local, wiki)
+            local_size = local['size']
+            wiki_size = wiki['size']
             size_diff = abs(local_size - wiki_size)
             size_diff_pct = (size_diff / local_size * 100) if local_size > 0 else 0
             
@@ -197,24 +146,23 @@ class BrainrotUpdater:
             print(f"  ⚠️  Comparison failed: {e}")
             return None
     
-    def download_thumbnail(self, image_url, filename):
+    def download_thumbnail(self, image_url, filename, sha1=None):
         """Download thumbnail image."""
         try:
-            response = requests.get(image_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            filepath = self.thumb_dir / filename
-            
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
-            
+            # Images already in the thumbnail store are linked, not re-downloaded
+            self.store.put_url(image_url, filename, sha1=sha1)
+            self.inventory.update(filename)
             return True
         except Exception as e:
             print(f"  ❌ Download failed: {e}")
             return False
     
-    def update_brainrot(self, brainrot, update_data=True, compare_thumbnails=False):
-        """Update a single brainrot (thumbnail and optionally data)."""
+    def update_brainrot(self, brainrot, update_data=True, compare_thumbnails=False, revid=None):
+        """Update a single brainrot (thumbnail and optionally data).
+        
+        Returns (updated, ok); ok is False when the wiki page could not be
+        fetched or a thumbnail download or comparison failed.
+        """
         name = brainrot['name']
         print(f"\n📦 {name}")
         print("-" * 60)
@@ -229,7 +177,7 @@ class BrainrotUpdater:
             print("  ✅ Thumbnail exists - will compare with wiki")
         else:
             print("  ✅ Thumbnail exists")
-            return False
+            return False, True
         
         # Scrape wiki
         wiki_data = self.scrape_brainrot_data(name)
@@ -238,17 +186,27 @@ class BrainrotUpdater:
             print("  ⚠️  Wiki page not found")
             self.stats['wiki_not_found'] += 1
             self.stats['thumbnails_failed'] += 1
-            return False
+            return False, False
         
         updated = False
+        failed = False
         
         # Handle thumbnail
         if 'image_url' in wiki_data:
             filename = name.replace(' ', '_') + '.png'
             filepath = self.thumb_dir / filename
             
+            info = self.image_info.get(name)
+            
             # If thumbnail exists and we're comparing
-            if has_thumbnail and compare_thumbnails:
+            if has_thumbnail and compare_thumbnails and info and filepath.exists() \
+                    and (self.store.is_from(filename, info['sha1'])
+                         or self.hash_index.local_hash(filepath)['sha1'] == info['sha1']):
+                # The wiki's file (or our scaled copy of it) - nothing to download
+                self.stats['thumbnails_compared'] += 1
+                print(f"  ✅ Thumbnail matches wiki (identical SHA-1)")
+            
+            elif has_thumbnail and compare_thumbnails:
                 print(f"  🔍 Comparing with wiki version...")
                 self.stats['thumbnails_compared'] += 1
                 
@@ -264,24 +222,28 @@ class BrainrotUpdater:
                         print(f"      Diff:   {comparison['size_diff_pct']:.1f}%")
                         self.stats['thumbnails_different'] += 1
                         
-                        # Update with wiki version
+                        # Update with wiki version (fetched now if the CDN answered 304)
                         if comparison['wiki_data']:
-                            with open(filepath, 'wb') as f:
-                                f.write(comparison['wiki_data'])
-                            print(f"  ✅ Updated with wiki version")
-                            self.stats['thumbnails_updated'] += 1
-                            updated = True
+                            self.store.put_bytes(comparison['wiki_data'], filename, url=wiki_data['image_url'])
+                        else:
+                            self.store.put_url(wiki_data['image_url'], filename)
+                        print(f"  ✅ Updated with wiki version")
+                        self.stats['thumbnails_updated'] += 1
+                        updated = True
+                else:
+                    failed = True
             
             # If thumbnail missing, download it
             elif not has_thumbnail:
                 print(f"  📥 Downloading thumbnail...")
-                if self.download_thumbnail(wiki_data['image_url'], filename):
+                if self.download_thumbnail(wiki_data['image_url'], filename, sha1=(info or {}).get('sha1')):
                     print(f"  ✅ Downloaded: {filename}")
                     brainrot['image'] = f"thumbnails/{filename}"
                     self.stats['thumbnails_downloaded'] += 1
                     updated = True
                 else:
                     self.stats['thumbnails_failed'] += 1
+                    failed = True
         else:
             if not has_thumbnail:
                 print("  ⚠️  No image found on wiki")
@@ -320,22 +282,108 @@ class BrainrotUpdater:
                 self.stats['data_updated'] += 1
                 updated = True
         
-        return updated
+        # Remember the revision and passes applied, unless something failed and needs another try
+        if revid is not None and not failed:
+            self.manifest.record(name, revid, self.passes(update_data, compare_thumbnails))
+        
+        return updated, not failed
     
-    def update_all(self, update_data=True, compare_thumbnails=False, save_every=10):
-        """Update all brainrots in the database."""
+    def passes(self, update_data, compare_thumbnails):
+        """Names of the passes a run applies, as stored in the revision manifest."""
+        passes = ['thumbnail']
+        if compare_thumbnails:
+            passes.append('compare')
+        if update_data:
+            passes.append('data')
+        return passes
+    
+    def is_unchanged(self, brainrot, revid, passes):
+        """True if the page was already processed at this revision with these passes and its thumbnail is intact."""
+        return (self.manifest.is_current(brainrot['name'], revid, passes)
+                and self.check_thumbnail_exists(brainrot.get('image')))
+    
+    def fetch_current_revisions(self, brainrots):
+        """Batch-query the current wiki revision id of every brainrot page."""
+        names = [br['name'] for br in brainrots]
+        print(f"🔁 Checking wiki revisions for {len(names)} pages...")
+        
+        backend = wiki_api.get_backend()
+        revids = wiki_api.fetch_revision_ids(backend, names)
+        
+        print(f"   {backend.requests_made} API requests")
+        return revids
+    
+    def update_all(self, update_data=True, compare_thumbnails=False, save_every=10, incremental=False, resume=False,
+                   use_sha1=False):
+        """Update all brainrots in the database.
+        
+        With incremental=True, pages whose wiki revision has not moved since
+        they were last scraped are skipped without being fetched.
+        
+        Every finished brainrot is appended to a journal; with resume=True an
+        interrupted run replays it and continues where it stopped.
+        
+        With use_sha1=True the wiki's file SHA-1s are fetched up front (50 per
+        request) and thumbnails that already match are not compared further.
+        """
         print("🔄 Loading database...")
         brainrots = self.load_database()
         self.stats['total'] = len(brainrots)
         
         print(f"📊 Found {len(brainrots)} brainrots\n")
+        
+        revids = {}
+        passes = self.passes(update_data, compare_thumbnails)
+        if incremental:
+            revids = self.fetch_current_revisions(brainrots)
+            unchanged = sum(1 for br in brainrots if self.is_unchanged(br, revids.get(br['name']), passes))
+            print(f"   {len(brainrots) - unchanged} changed, new or not yet done with {'+'.join(passes)}, "
+                  f"{unchanged} unchanged since last scrape\n")
+        
+        if compare_thumbnails:
+            # Hash new or modified local thumbnails up front, across all cores
+            paths = [Path("app/public") / br['image'] for br in brainrots if self.check_thumbnail_exists(br.get('image'))]
+            hashed = self.hash_index.refresh_local(paths)
+            print(f"🔍 Hash index: {len(paths) - hashed} thumbnails unchanged, {hashed} re-hashed\n")
+        
+        if use_sha1:
+            print("🔐 Looking up wiki file SHA-1s...")
+            self.image_info = wiki_image_info.lookup_image_info(brainrots, store=self.store)
+            print(f"   {sum(1 for info in self.image_info.values() if info)}/{len(brainrots)} wiki files found\n")
+        
         print("=" * 60)
         
         any_updated = False
         update_count = 0
         
+        journal = ScrapeJournal(self.journal_path, resume=resume)
+        if resume:
+            # Re-apply finished work that may not have reached a database save
+            for brainrot in brainrots:
+                done = journal.get(brainrot['name'])
+                if done:
+                    brainrot.clear()
+                    brainrot.update(done['brainrot'])
+                    any_updated = any_updated or done['updated']
+            print(f"⏩ Resuming: {len(journal)} brainrots already done\n")
+        
         for i, brainrot in enumerate(brainrots, 1):
-            if self.update_brainrot(brainrot, update_data, compare_thumbnails):
+            revid = revids.get(brainrot['name'])
+            
+            if journal.is_done(brainrot['name']):
+                self.stats['resumed'] += 1
+                continue
+            
+            if incremental and self.is_unchanged(brainrot, revid, passes):
+                self.stats['unchanged_skipped'] += 1
+                continue
+            
+            updated, ok = self.update_brainrot(brainrot, update_data, compare_thumbnails, revid)
+            if ok:
+                # Failed brainrots stay out of the journal so --resume retries them
+                journal.record(brainrot['name'], {'brainrot': brainrot, 'updated': updated})
+            
+            if updated:
                 any_updated = True
                 update_count += 1
                 
@@ -343,19 +391,26 @@ class BrainrotUpdater:
                 if update_count % save_every == 0:
                     print("\n💾 Saving progress...")
                     self.save_database(brainrots)
-            
-            # Be nice to the server
-            time.sleep(0.5)
+                    if incremental:
+                        self.manifest.save()
             
             # Progress indicator
             if i % 20 == 0:
                 print(f"\n📊 Progress: {i}/{len(brainrots)}")
         
-        # Final save
-        if any_updated:
+        # Final save (also folds in changes logged by an interrupted run)
+        if any_updated or self.changes.pending():
             print("\n" + "=" * 60)
             print("\n💾 Saving final changes...")
-            self.save_database(brainrots)
+            self.save_database(brainrots, compact=True)
+        
+        if incremental:
+            self.manifest.save()
+        if compare_thumbnails:
+            self.hash_index.save()
+        
+        # Everything is saved - the journal is no longer needed
+        journal.finish()
         
         # Print summary
         self.print_summary()
@@ -374,6 +429,10 @@ class BrainrotUpdater:
         print(f"Download failures:     {self.stats['thumbnails_failed']}")
         print(f"Data updated:          {self.stats['data_updated']}")
         print(f"Wiki not found:        {self.stats['wiki_not_found']}")
+        print(f"Unchanged (skipped):   {self.stats['unchanged_skipped']}")
+        print(f"Resumed from journal:  {self.stats['resumed']}")
+        print(f"HTTP cache:            {self.http_cache.summary()}")
+        print(f"Hash index:            {self.hash_index.summary()}")
         print("=" * 60)
 
 def main():
@@ -385,6 +444,10 @@ def main():
     # Parse arguments
     update_data = '--update-data' in sys.argv or '-u' in sys.argv
     compare_thumbnails = '--compare' in sys.argv or '-c' in sys.argv
+    incremental = '--incremental' in sys.argv or '-i' in sys.argv
+    resume = '--resume' in sys.argv or '-r' in sys.argv
+    use_sha1 = '--sha1' in sys.argv
+    original = '--original' in sys.argv
     
     # Display mode
     modes = []
@@ -396,6 +459,18 @@ def main():
     if update_data:
         modes.append("Update brainrot data (income, cost, rarity)")
     
+    if incremental:
+        modes.append("Only re-scrape pages edited since the last run")
+    
+    if resume:
+        modes.append("Resume the interrupted run from its journal")
+    
+    if use_sha1:
+        modes.append("Skip thumbnails whose SHA-1 matches the wiki's file")
+    
+    if original:
+        modes.append("Download full-resolution originals")
+    
     print("📊 Mode:")
     for mode in modes:
         print(f"   ✅ {mode}")
@@ -404,12 +479,15 @@ def main():
         print("\n   💡 Use --compare or -c to compare existing thumbnails with wiki")
     if not update_data:
         print("   💡 Use --update-data or -u to also update brainrot data")
+    if not incremental:
+        print("   💡 Use --incremental or -i to skip pages unchanged since the last run")
     
     print("\n" + "=" * 60)
     
     # Create updater and run
-    updater = BrainrotUpdater()
-    updater.update_all(update_data=update_data, compare_thumbnails=compare_thumbnails)
+    updater = BrainrotUpdater(thumbnail_width=None if original else THUMBNAIL_WIDTH)
+    updater.update_all(update_data=update_data, compare_thumbnails=compare_thumbnails,
+                       incremental=incremental, resume=resume, use_sha1=use_sha1)
     
     print("\n✅ Complete!")
 
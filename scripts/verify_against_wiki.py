@@ -3,10 +3,14 @@ Verify Brainrots Against Official Wiki
 Cross-checks our database with the wiki's brainrot list to find invalid entries
 """
 
-import requests
 from bs4 import BeautifulSoup
 import json
-import time
+import requests
+import sys
+
+import http_cache
+import wiki_titles
+from catalogue_io import DATA_DB_PATH, load_brainrots
 
 def get_wiki_brainrot_list():
     """Scrape the main brainrots page to get list of all valid brainrots"""
@@ -14,12 +18,8 @@ def get_wiki_brainrot_list():
     
     print(f"Fetching brainrot list from wiki: {url}\n")
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
-    
     try:
-        response = requests.get(url, headers=headers, timeout=15)
+        response = http_cache.get_cache().get(url)
         response.raise_for_status()
         
         # Save debug HTML
@@ -64,6 +64,7 @@ def get_wiki_brainrot_list():
                 wiki_brainrots.add(name)
         
         print(f"📊 Found {len(wiki_brainrots)} brainrots on wiki")
+        print(f"📦 HTTP cache: {http_cache.get_cache().summary()}")
         
         return wiki_brainrots
         
@@ -79,8 +80,15 @@ def verify_against_wiki():
     print("=" * 80)
     print()
     
-    # Get wiki brainrot list
-    wiki_brainrots = get_wiki_brainrot_list()
+    # Get wiki brainrot list (shared title set from category listings, or the old page scrape)
+    if '--html' in sys.argv:
+        wiki_brainrots = get_wiki_brainrot_list()
+    else:
+        try:
+            wiki_brainrots = wiki_titles.load_titles(refresh='--refresh-titles' in sys.argv)
+        except (wiki_titles.IncompleteTitleList, requests.RequestException) as e:
+            print(f"⚠️  {e}")
+            wiki_brainrots = None
     
     if not wiki_brainrots:
         print("❌ Failed to fetch wiki brainrot list. Check network connection.")
@@ -90,11 +98,7 @@ def verify_against_wiki():
     wiki_brainrots_lower = {name.lower().strip() for name in wiki_brainrots}
     
     # Load our database
-    with open('data/brainrots.json', 'r', encoding='utf-8') as f:
-        our_brainrots = json.load(f)
-    
-    if not isinstance(our_brainrots, list):
-        our_brainrots = our_brainrots.get('brainrots', [])
+    our_brainrots = load_brainrots(DATA_DB_PATH, mutable=False)
     
     print(f"📊 Our database: {len(our_brainrots)} brainrots")
     print(f"📊 Wiki list: {len(wiki_brainrots)} brainrots\n")
@@ -6,17 +6,15 @@ Finds duplicates, near-duplicates, and potential naming errors
 import json
 from difflib import SequenceMatcher
 
+from catalogue_io import DATA_DB_PATH, load_brainrots
+
 def similar(a, b):
     """Check if two strings are similar"""
     return SequenceMatcher(None, a.lower(), b.lower()).ratio()
 
 def verify_brainrots():
     # Load current brainrots
-    with open('data/brainrots.json', 'r', encoding='utf-8') as f:
-        brainrots = json.load(f)
-    
-    if not isinstance(brainrots, list):
-        brainrots = brainrots.get('brainrots', [])
+    brainrots = load_brainrots(DATA_DB_PATH, mutable=False)
     
     print(f"=== Verifying {len(brainrots)} Brainrots ===\n")
     
@@ -0,0 +1,383 @@
+"""
+MediaWiki API backend for the wiki scripts
+Fetches wikitext for up to 50 pages per request (action=query&titles=A|B|...)
+instead of downloading the full rendered Fandom HTML for every brainrot.
+
+LocalWikiBackend answers the same queries from a JSON file so the batch
+code can be run and checked offline.
+"""
+
+import json
+import re
+from urllib.parse import unquote, urlsplit
+
+import wiki_client
+
+API_URL = f"{wiki_client.WIKI_BASE}/api.php"
+
+# MediaWiki accepts at most 50 titles per query for normal (non-bot) clients
+MAX_TITLES = 50
+
+
+def chunked(items, size=MAX_TITLES):
+    """Split a list into chunks of at most `size` items"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def normalize_title(title):
+    """Normalize a page title the way MediaWiki does (underscores, first letter)"""
+    title = title.replace('_', ' ').strip()
+    title = re.sub(r'\s+', ' ', title)
+    return title[:1].upper() + title[1:]
+
+
+class WikiApiBackend:
+    """Talks to the live wiki's api.php through the shared HTTP client"""
+
+    def __init__(self, api_url=API_URL):
+        self.api_url = api_url
+        self.requests_made = 0
+
+    def query(self, params):
+        """Run one API query and return the decoded JSON"""
+        params = dict(params, format='json', formatversion=2)
+        self.requests_made += 1
+        response = wiki_client.get(self.api_url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+
+class LocalWikiBackend:
+    """Offline stand-in for WikiApiBackend
+
+    Reads a JSON file of the form
+    {"Page Title": {"revid": 1, "wikitext": "...", "categories": ["Secret"]},
+     "File:Name.png": {"imageinfo": {"sha1": "...", "size": 1, "url": "..."}}}
+    and answers prop=revisions, prop=imageinfo, list=categorymembers and
+    list=allpages queries with the same response shape as api.php. Lists are served in small pages
+    so continuation is exercised too.
+    """
+
+    def __init__(self, pages, list_limit=2):
+        self.pages = {normalize_title(title): page for title, page in pages.items()}
+        self.list_limit = list_limit
+        self.requests_made = 0
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def query(self, params):
+        self.requests_made += 1
+
+        if params.get('list') == 'categorymembers':
+            category = normalize_title(params['cmtitle'].split(':', 1)[-1])
+            members = [title for title, page in self.pages.items()
+                       if category in {normalize_title(c) for c in page.get('categories', [])}]
+            return self._list_page(params, 'categorymembers', 'cmcontinue', 'cmlimit', members)
+
+        if params.get('list') == 'allpages':
+            articles = [title for title in self.pages if not title.startswith('File:')]
+            return self._list_page(params, 'allpages', 'apcontinue', 'aplimit', articles)
+
+        titles = params.get('titles', '').split('|')
+        if len(titles) > MAX_TITLES:
+            raise ValueError(f"Too many titles in one query: {len(titles)}")
+
+        normalized = []
+        pages = []
+        for title in titles:
+            norm = normalize_title(title)
+            if norm != title:
+                normalized.append({'from': title, 'to': norm})
+
+            page = self.pages.get(norm)
+            if page is None:
+                pages.append({'title': norm, 'missing': True})
+                continue
+
+            if params.get('prop') == 'imageinfo':
+                pages.append({'title': norm, 'imageinfo': [page['imageinfo']] if 'imageinfo' in page else []})
+                continue
+
+            revision = {'revid': page.get('revid', 0)}
+            if 'content' in params.get('rvprop', ''):
+                revision['slots'] = {'main': {'content': page.get('wikitext', '')}}
+            pages.append({'title': norm, 'revisions': [revision]})
+
+        return {'query': {'normalized': normalized, 'pages': pages}}
+
+    def _list_page(self, params, key, continue_key, limit_key, titles):
+        titles = sorted(titles)
+        limit = params.get(limit_key, 10)
+        limit = self.list_limit if limit == 'max' else int(limit)
+        start = int(params.get(continue_key, 0))
+        chunk = titles[start:start + limit]
+
+        data = {'query': {key: [{'ns': 0, 'title': title} for title in chunk]}}
+        if start + limit < len(titles):
+            data['continue'] = {continue_key: str(start + limit), 'continue': '-||'}
+        return data
+
+
+def get_backend(fixture=None):
+    """Return the local stand-in when a fixture file is given, else the live API"""
+    if fixture:
+        return LocalWikiBackend.from_file(fixture)
+    return WikiApiBackend()
+
+
+def query_titles(backend, titles, params):
+    """Run a titles= query in batches of 50, following continuation
+
+    Returns {requested title: page dict or None if the page does not exist}.
+    """
+    results = {}
+
+    for batch in chunked(list(dict.fromkeys(titles))):
+        query_params = dict(params, titles='|'.join(batch), redirects=1)
+        pages_by_title = {}
+        normalized = {}
+        redirects = {}
+
+        while True:
+            data = backend.query(query_params)
+            query = data.get('query', {})
+
+            for item in query.get('normalized', []):
+                normalized[item['from']] = item['to']
+            for item in query.get('redirects', []):
+                redirects[item['from']] = item['to']
+            for page in query.get('pages', []):
+                existing = pages_by_title.setdefault(page['title'], page)
+                if existing is not page and page.get('revisions'):
+                    existing.setdefault('revisions', []).extend(page['revisions'])
+
+            if 'continue' not in data:
+                break
+            query_params = dict(query_params, **data['continue'])
+
+        for title in batch:
+            resolved = normalized.get(title, title)
+            resolved = redirects.get(resolved, resolved)
+            page = pages_by_title.get(resolved)
+            results[title] = None if page is None or page.get('missing') else page
+
+    return results
+
+
+def query_list(backend, params, key):
+    """Run a list= query, following continuation until every item is returned"""
+    items = []
+    query_params = dict(params)
+
+    while True:
+        data = backend.query(query_params)
+        items.extend(data.get('query', {}).get(key, []))
+
+        if 'continue' not in data:
+            return items
+        query_params = dict(params, **data['continue'])
+
+
+def list_category_members(backend, category):
+    """Return every article title in a category (all pages, not just the first)"""
+    members = query_list(backend, {
+        'action': 'query',
+        'list': 'categorymembers',
+        'cmtitle': f"Category:{category.replace('_', ' ')}",
+        'cmnamespace': 0,
+        'cmlimit': 'max'
+    }, 'categorymembers')
+    return [member['title'] for member in members]
+
+
+def list_all_pages(backend):
+    """Return every article title on the wiki"""
+    pages = query_list(backend, {
+        'action': 'query',
+        'list': 'allpages',
+        'apnamespace': 0,
+        'apfilterredir': 'nonredirects',
+        'aplimit': 'max'
+    }, 'allpages')
+    return [page['title'] for page in pages]
+
+
+def fetch_wikitext(backend, titles):
+    """Fetch the current wikitext and revision id of each title
+
+    Returns {requested title: {'title', 'revid', 'wikitext'} or None}.
+    """
+    pages = query_titles(backend, titles, {
+        'action': 'query',
+        'prop': 'revisions',
+        'rvprop': 'ids|content',
+        'rvslots': 'main'
+    })
+
+    results = {}
+    for title, page in pages.items():
+        if not page or not page.get('revisions'):
+            results[title] = None
+            continue
+
+        revision = page['revisions'][0]
+        results[title] = {
+            'title': page['title'],
+            'revid': revision.get('revid'),
+            'wikitext': revision.get('slots', {}).get('main', {}).get('content', '')
+        }
+
+    return results
+
+
+def fetch_revision_ids(backend, titles):
+    """Fetch only the current revision id of each title (no page content)
+
+    Returns {requested title: revid or None if the page does not exist}.
+    """
+    pages = query_titles(backend, titles, {
+        'action': 'query',
+        'prop': 'revisions',
+        'rvprop': 'ids'
+    })
+
+    return {
+        title: page['revisions'][0].get('revid') if page and page.get('revisions') else None
+        for title, page in pages.items()
+    }
+
+
+def file_title_from_url(url):
+    """File page title for a wiki image URL
+
+    https://static.wikia.nocookie.net/stealabr/images/e/e2/ListListListSahur.png/revision/latest
+    -> File:ListListListSahur.png
+    """
+    path = urlsplit(url).path.split('/revision/')[0]
+    return 'File:' + unquote(path.rstrip('/').rsplit('/', 1)[-1]).replace('_', ' ')
+
+
+def fetch_image_info(backend, file_titles):
+    """Fetch the SHA-1, size and original URL of each file (50 per request)
+
+    Returns {requested title: {'sha1', 'size', 'url'} or None if the file does not exist}.
+    """
+    pages = query_titles(backend, file_titles, {
+        'action': 'query',
+        'prop': 'imageinfo',
+        'iiprop': 'sha1|size|url'
+    })
+
+    results = {}
+    for title, page in pages.items():
+        info = (page or {}).get('imageinfo') or [None]
+        info = info[0]
+        results[title] = {'sha1': info['sha1'], 'size': info['size'], 'url': info['url']} if info else None
+
+    return results
+
+
+def split_template_params(body):
+    """Split template parameters on '|' that are not inside nested {{ }} or [[ ]]"""
+    params = []
+    depth = 0
+    current = []
+    i = 0
+
+    while i < len(body):
+        pair = body[i:i + 2]
+        if pair in ('{{', '[['):
+            depth += 1
+            current.append(pair)
+            i += 2
+            continue
+        if pair in ('}}', ']]'):
+            depth -= 1
+            current.append(pair)
+            i += 2
+            continue
+        if body[i] == '|' and depth == 0:
+            params.append(''.join(current))
+            current = []
+        else:
+            current.append(body[i])
+        i += 1
+
+    params.append(''.join(current))
+    return params
+
+
+def clean_wikitext(value):
+    """Reduce a wikitext value to its display text"""
+    value = re.sub(r'<!--.*?-->', '', value, flags=re.DOTALL)
+    value = re.sub(r'<br\s*/?>', ' ', value, flags=re.IGNORECASE)
+    value = re.sub(r'<[^>]+>', '', value)
+
+    # [[Target|Label]] -> Label, [[Target]] -> Target
+    value = re.sub(r'\[\[(?:[^\]|]*\|)?([^\]]*)\]\]', r'\1', value)
+
+    # {{Template|a|b}} -> b (last positional value), repeated for nesting
+    previous = None
+    while previous != value:
+        previous = value
+        value = re.sub(r'\{\{[^{}|]*\|(?:[^{}]*\|)?([^{}|]*)\}\}', r'\1', value)
+        value = re.sub(r'\{\{[^{}]*\}\}', '', value)
+
+    value = value.replace("'''", '').replace("''", '')
+    return value.strip()
+
+
+def find_templates(wikitext):
+    """Yield (name, body) for each top-level template in the wikitext"""
+    i = 0
+    while True:
+        start = wikitext.find('{{', i)
+        if start == -1:
+            return
+
+        depth = 0
+        j = start
+        while j < len(wikitext):
+            pair = wikitext[j:j + 2]
+            if pair == '{{':
+                depth += 1
+                j += 2
+            elif pair == '}}':
+                depth -= 1
+                j += 2
+                if depth == 0:
+                    break
+            else:
+                j += 1
+
+        inner = wikitext[start + 2:j - 2]
+        name, _, body = inner.partition('|')
+        yield name.strip(), body
+        i = j
+
+
+def parse_infobox(wikitext):
+    """Return the infobox fields of a page as {label: display text}
+
+    Uses the first template whose name mentions "infobox", falling back to
+    the first template with named parameters.
+    """
+    fallback = None
+
+    for name, body in find_templates(wikitext or ''):
+        fields = {}
+        for param in split_template_params(body):
+            key, sep, value = param.partition('=')
+            if sep and key.strip():
+                fields[key.strip().lower()] = clean_wikitext(value)
+
+        if 'infobox' in name.lower():
+            return fields
+        if fields and fallback is None:
+            fallback = fields
+
+    return fallback or {}
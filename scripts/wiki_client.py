@@ -0,0 +1,157 @@
+"""
+Shared Wiki HTTP Client
+One pooled keep-alive session for every wiki script, with a single
+User-Agent/timeout policy and a per-host token bucket instead of
+hard-coded time.sleep() calls between requests
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+WIKI_BASE = 'https://stealabrainrot.fandom.com'
+WIKI_HOST = 'stealabrainrot.fandom.com'
+CDN_HOST = 'static.wikia.nocookie.net'
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+DEFAULT_TIMEOUT = 15
+
+# Requests per second and burst size for each host
+HOST_RATES = {
+    WIKI_HOST: (2.0, 2),
+    CDN_HOST: (8.0, 8),
+}
+DEFAULT_RATE = (2.0, 2)
+
+# Keep-alive connections kept per host; raise with set_pool_size() for more threads
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+_retry = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=['GET', 'HEAD'],
+    raise_on_status=False
+)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `burst` saved up"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+
+_session = None
+_session_lock = threading.Lock()
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def _mount_adapter(session):
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=_retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+
+def get_session():
+    """Return the shared keep-alive session (created on first use)"""
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+            _mount_adapter(session)
+            _session = session
+
+        return _session
+
+
+def set_pool_size(size):
+    """Keep at least `size` connections per host, for that many worker threads
+
+    Without this, threads beyond the pool size each open a throwaway
+    connection (and urllib3 warns that the pool is full).
+    """
+    global POOL_MAXSIZE
+
+    with _session_lock:
+        if size <= POOL_MAXSIZE:
+            return
+        POOL_MAXSIZE = size
+        if _session is not None:
+            _mount_adapter(_session)
+
+
+def get_bucket(host):
+    """Return the token bucket for a host (created on first use)"""
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            rate, burst = HOST_RATES.get(host, DEFAULT_RATE)
+            bucket = TokenBucket(rate, burst)
+            _buckets[host] = bucket
+        return bucket
+
+
+@contextmanager
+def host_rate(host, rate, burst=None):
+    """Limit a host to `rate` requests per second inside the `with` block
+
+    HOST_RATES is left alone; the host's previous bucket is put back on exit.
+    """
+    bucket = TokenBucket(rate, burst or HOST_RATES.get(host, DEFAULT_RATE)[1])
+    with _buckets_lock:
+        previous = _buckets.get(host)
+        _buckets[host] = bucket
+    try:
+        yield bucket
+    finally:
+        with _buckets_lock:
+            if previous is None:
+                _buckets.pop(host, None)
+            else:
+                _buckets[host] = previous
+
+
+def throttle(url):
+    """Wait for the rate limiter of the URL's host"""
+    get_bucket(urlsplit(url).hostname or '').acquire()
+
+
+def get(url, **kwargs):
+    """GET a URL through the shared session, respecting the host's rate limit"""
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    throttle(url)
+    return get_session().get(url, **kwargs)
+
+
+def wiki_url(name):
+    """Build the wiki page URL for a page title"""
+    return f"{WIKI_BASE}/wiki/{name.replace(' ', '_')}"
@@ -0,0 +1,186 @@
+"""
+Wiki Image Info (SHA-1 comparison)
+The wiki already knows the SHA-1, size and URL of every uploaded file
+(prop=imageinfo&iiprop=sha1|size|url). Querying that for all thumbnails,
+50 files per request, and comparing against local SHA-1s finds the
+thumbnails that really differ without downloading a single image.
+
+File names come from the thumbnail store's URL manifest when the image was
+downloaded before, otherwise from the infobox image parameter of each
+page's wikitext (also fetched 50 pages per request).
+
+    python scripts/wiki_image_info.py               # report only
+    python scripts/wiki_image_info.py --download    # re-fetch only what differs
+
+Thumbnails downloaded as scaled-down CDN variants count as identical when the
+store recorded them as made from the wiki file with the same SHA-1.
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+
+import thumbnail_store
+import wiki_api
+from catalogue_io import load_brainrots
+from image_hash_index import ImageHashIndex
+from wiki_page import THUMBNAIL_WIDTH, scaled_image
+
+DB_PATH = Path('app/public/brainrots.json')
+CORRECTIONS_PATH = Path('data/wiki_name_corrections.json')
+
+INFOBOX_IMAGE = re.compile(r'\|\s*image\d*\s*=\s*(?:\[\[)?(?:File:|Image:)?([^\n|\]}<]+)', re.IGNORECASE)
+
+
+def load_corrections(path=CORRECTIONS_PATH):
+    """Database name -> wiki page name"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('corrections', data)
+
+
+def infobox_file_title(wikitext):
+    """File title of the infobox image in a page's wikitext, or None"""
+    match = INFOBOX_IMAGE.search(wikitext or '')
+    if not match or not match.group(1).strip():
+        return None
+    return 'File:' + match.group(1).strip().replace('_', ' ')
+
+
+def stored_file_title(store, filename):
+    """File title of the wiki URL a stored thumbnail was downloaded from, or None"""
+    digest = store.names.get(filename)
+    if not digest:
+        return None
+    for url, url_digest in store.urls.items():
+        if url_digest == digest:
+            return wiki_api.file_title_from_url(url)
+    return None
+
+
+def lookup_image_info(brainrots, backend=None, store=None, corrections=None):
+    """Return {brainrot name: {'file', 'sha1', 'size', 'url'} or None}"""
+    backend = backend or wiki_api.get_backend()
+    store = store or thumbnail_store.get_store()
+    corrections = load_corrections() if corrections is None else corrections
+
+    file_titles = {}
+    need_wikitext = {}
+    for brainrot in brainrots:
+        name = brainrot['name']
+        filename = Path(brainrot.get('image') or '').name
+        title = stored_file_title(store, filename) if filename else None
+        if title:
+            file_titles[name] = title
+        else:
+            need_wikitext[name] = corrections.get(name, name)
+
+    if need_wikitext:
+        pages = wiki_api.fetch_wikitext(backend, list(need_wikitext.values()))
+        for name, page_title in need_wikitext.items():
+            page = pages.get(page_title)
+            title = infobox_file_title(page['wikitext']) if page else None
+            if title:
+                file_titles[name] = title
+
+    infos = wiki_api.fetch_image_info(backend, list(set(file_titles.values())))
+
+    results = {}
+    for brainrot in brainrots:
+        title = file_titles.get(brainrot['name'])
+        info = infos.get(title) if title else None
+        results[brainrot['name']] = dict(info, file=title) if info else None
+    return results
+
+
+def compare_with_local(brainrots, image_info, hash_index=None, public_dir=thumbnail_store.THUMB_DIR.parent, store=None):
+    """Classify each brainrot's thumbnail against the wiki's SHA-1
+
+    Returns [{'name', 'filename', 'status', 'info'}] where status is one of
+    same, different, missing_local, no_wiki_file.
+    """
+    hash_index = hash_index or ImageHashIndex()
+    store = store or thumbnail_store.get_store()
+    rows = []
+
+    for brainrot in brainrots:
+        name = brainrot['name']
+        info = image_info.get(name)
+        image = brainrot.get('image')
+        path = public_dir / image if image else None
+        filename = Path(image).name if image else name.replace(' ', '_') + '.png'
+
+        if not info:
+            status = 'no_wiki_file'
+        elif not path or not path.exists():
+            status = 'missing_local'
+        elif store.is_from(filename, info['sha1']) or hash_index.local_hash(path)['sha1'] == info['sha1']:
+            status = 'same'
+        else:
+            status = 'different'
+
+        rows.append({'name': name, 'filename': filename, 'status': status, 'info': info})
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare thumbnails with the wiki file SHA-1s')
+    parser.add_argument('--download', action='store_true', help='re-download the thumbnails that differ from the wiki')
+    parser.add_argument('--original', action='store_true', help='re-download full-resolution originals instead of card-sized images')
+    parser.add_argument('--api-fixture', help='answer API queries from a local JSON file')
+    args = parser.parse_args()
+
+    brainrots = load_brainrots(DB_PATH, mutable=False)
+
+    print("=" * 80)
+    print("🔐 THUMBNAIL SHA-1 CHECK")
+    print("=" * 80)
+
+    backend = wiki_api.get_backend(args.api_fixture)
+    store = thumbnail_store.get_store()
+    hash_index = ImageHashIndex()
+
+    image_info = lookup_image_info(brainrots, backend, store)
+    hash_index.refresh_local([DB_PATH.parent / br['image'] for br in brainrots
+                              if br.get('image') and (DB_PATH.parent / br['image']).exists()])
+    rows = compare_with_local(brainrots, image_info, hash_index, store=store)
+    hash_index.save()
+
+    counts = {}
+    for row in rows:
+        counts[row['status']] = counts.get(row['status'], 0) + 1
+
+    print(f"\n📡 API requests: {backend.requests_made}")
+    print(f"✅ Identical:        {counts.get('same', 0)}")
+    print(f"⚠️  Different:        {counts.get('different', 0)}")
+    print(f"❌ Missing locally:  {counts.get('missing_local', 0)}")
+    print(f"❓ No wiki file:     {counts.get('no_wiki_file', 0)}")
+
+    to_fetch = [row for row in rows if row['status'] == 'different']
+    for row in to_fetch[:10]:
+        print(f"   • {row['name']}")
+    if len(to_fetch) > 10:
+        print(f"   ... and {len(to_fetch) - 10} more")
+
+    if counts.get('missing_local'):
+        print("\n💡 Missing thumbnails: python scripts/download_missing_thumbnails.py --sha1")
+
+    if args.download and to_fetch:
+        print(f"\n📥 Downloading {len(to_fetch)} thumbnails...")
+        width = None if args.original else THUMBNAIL_WIDTH
+        for row in to_fetch:
+            try:
+                store.put_url(scaled_image(row['info']['url'], width), row['filename'], sha1=row['info']['sha1'])
+                print(f"   ✅ {row['filename']}")
+            except Exception as e:
+                print(f"   ❌ {row['filename']}: {e}")
+        store.save()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+"""
+Wiki Page Model
+One brainrot wiki page, fetched once and parsed once, feeding any number of
+registered extractors:
+
+- stats:          cost, income_per_second, rarity from the infobox
+- image_url:      full-size infobox image (falls back to the first article image)
+- categories:     the page's wiki categories
+- trait_mentions: known trait names mentioned in the article text
+
+    page = WikiPage.fetch('Strawberry Elephant', cache=http_cache.get_cache())
+    data = page.extract('stats', 'image_url')
+
+With an HttpCache, a page that has not changed since the last run is not
+re-parsed: the extractor results saved then are reused.
+"""
+
+import html as html_lib
+import json
+import re
+
+import infobox_parser
+import wiki_client
+
+TRAITS_PATH = 'data/traits_scraped.json'
+
+RARITIES = ['Secret', 'Brainrot God', 'OG', 'Legendary', 'Mythic', 'Epic', 'Rare', 'Common']
+
+CATEGORIES_JS = re.compile(r'"wgCategories":(\[[^\]]*\])')
+ARTICLE_START = re.compile(r'<div[^>]*\bclass="mw-parser-output"[^>]*>')
+ARTICLE_END = re.compile(r'<div[^>]*\bclass="printfooter"')
+ARTICLE_IMG = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+IMG_ATTR = re.compile(r'\b(src|data-src)="([^"]*)"')
+SCRIPT_OR_STYLE = re.compile(r'<(script|style)\b.*?</\1>', re.IGNORECASE | re.DOTALL)
+TAG = re.compile(r'<[^>]+>')
+
+# Widest the app shows a thumbnail: the h-36 card image in BrainrotCard and
+# TotalBrainrotCard (~128px after padding) at 2x pixel density
+THUMBNAIL_WIDTH = 256
+
+# name -> function(page) returning that extractor's result
+EXTRACTORS = {}
+
+
+def extractor(name):
+    """Register a function as a page extractor"""
+    def register(func):
+        EXTRACTORS[name] = func
+        return func
+    return register
+
+
+def parse_number(text):
+    """Parse numbers with K, M, B, T suffixes"""
+    if not text or text in ['N/A', '?', 'Unknown', '']:
+        return None
+
+    # Remove dollar signs, spaces, commas, "/s" suffix
+    text = str(text).replace('$', '').replace(',', '').replace(' ', '').replace('/s', '').strip()
+
+    if not text:
+        return None
+
+    # Handle K, M, B, T suffixes
+    multipliers = {
+        'K': 1_000,
+        'M': 1_000_000,
+        'B': 1_000_000_000,
+        'T': 1_000_000_000_000
+    }
+
+    for suffix, multiplier in multipliers.items():
+        if text.upper().endswith(suffix):
+            try:
+                number = float(text[:-1])
+                return int(number * multiplier)
+            except:
+                return None
+
+    # Try parsing as plain number
+    try:
+        return int(float(text))
+    except:
+        return None
+
+
+def stats_from_fields(fields):
+    """Read cost, income and rarity out of (label, value) infobox pairs
+
+    Labels are matched first; values that look like "$2M/s" or "$550M" are
+    used when the label is something else.
+    """
+    stats = {'cost': None, 'income_per_second': None, 'rarity': None}
+
+    for label, value in fields:
+        label = label.lower()
+
+        if 'cost' in label or 'price' in label:
+            stats['cost'] = parse_number(value)
+        elif 'income' in label or 'money' in label or '/s' in label:
+            stats['income_per_second'] = parse_number(value)
+        elif 'rarity' in label or 'tier' in label or 'type' in label:
+            stats['rarity'] = value.lower().replace(' ', '_')
+        elif '/s' in value and stats['income_per_second'] is None:
+            stats['income_per_second'] = parse_number(value)
+        elif '$' in value and stats['cost'] is None:
+            stats['cost'] = parse_number(value)
+        elif value in RARITIES and stats['rarity'] is None:
+            stats['rarity'] = value.lower().replace(' ', '_')
+
+    return stats
+
+
+def full_size_image(src):
+    """Absolute URL of the original image (size parameters removed)"""
+    if src.startswith('//'):
+        src = 'https:' + src
+    elif src.startswith('/'):
+        src = wiki_client.WIKI_BASE + src
+
+    if '/revision/' in src:
+        src = src.split('/revision/')[0] + '/revision/latest'
+
+    return src
+
+
+def scaled_image(src, width=THUMBNAIL_WIDTH):
+    """CDN URL of the image scaled down to at most `width` pixels wide
+
+    Uses the CDN's /scale-to-width-down/<N> variant (images narrower than
+    `width` are served unchanged). width=None returns the original.
+    """
+    src = full_size_image(src)
+    if not width or not src.endswith('/revision/latest'):
+        return src
+    return f"{src}/scale-to-width-down/{width}"
+
+
+_trait_names = None
+
+
+def load_trait_names(path=TRAITS_PATH):
+    """Trait names from the scraped traits list (empty if it is missing)"""
+    global _trait_names
+    if _trait_names is None:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                _trait_names = [trait['name'] for trait in json.load(f)['traits']]
+        except (OSError, ValueError, KeyError):
+            _trait_names = []
+    return _trait_names
+
+
+class WikiPage:
+    """A fetched wiki page with lazily parsed, memoized extractor results"""
+
+    def __init__(self, name, url, html, status_code=200, parser='auto', cached=None, cache=None):
+        self.name = name
+        self.url = url
+        self.html = html
+        self.status_code = status_code
+        self.parser = parser
+        self.results = dict(cached or {})
+        self.cache = cache
+        self._infobox = None
+        self._text = None
+
+    @classmethod
+    def fetch(cls, name, cache=None, parser='auto'):
+        """Fetch a page by brainrot name"""
+        return cls.fetch_url(wiki_client.wiki_url(name), name=name, cache=cache, parser=parser)
+
+    @classmethod
+    def fetch_url(cls, url, name=None, cache=None, parser='auto'):
+        """Fetch a page by URL (through the HTTP cache when one is given)
+
+        A 404 gives a page with exists == False; other HTTP errors raise.
+        """
+        response = cache.get(url) if cache else wiki_client.get(url)
+
+        if response.status_code == 404:
+            return cls(name, url, '', status_code=404, parser=parser)
+
+        response.raise_for_status()
+
+        cached = None
+        if cache and response.unchanged:
+            cached = cache.get_parsed(url, 'extracted')
+
+        return cls(name, url, response.text, response.status_code, parser, cached, cache)
+
+    @property
+    def exists(self):
+        return self.status_code != 404
+
+    @property
+    def infobox(self):
+        """Parsed portable-infobox ({'found', 'fields', 'image'})"""
+        if self._infobox is None:
+            self._infobox = infobox_parser.parse_infobox(self.html, self.parser)
+        return self._infobox
+
+    @property
+    def text(self):
+        """Plain text of the article body (no navigation, scripts or footer)"""
+        if self._text is None:
+            start = ARTICLE_START.search(self.html)
+            body = self.html[start.end():] if start else self.html
+            end = ARTICLE_END.search(body)
+            if end:
+                body = body[:end.start()]
+            body = SCRIPT_OR_STYLE.sub(' ', body)
+            self._text = html_lib.unescape(TAG.sub(' ', body))
+        return self._text
+
+    def extract(self, *names):
+        """Run the named extractors (all registered ones by default)
+
+        Returns {name: result}. Each extractor runs at most once per page.
+        """
+        names = names or tuple(EXTRACTORS)
+        fresh = False
+
+        for name in names:
+            if name not in self.results:
+                self.results[name] = EXTRACTORS[name](self)
+                fresh = True
+
+        if fresh and self.cache is not None:
+            self.cache.set_parsed(self.url, 'extracted', self.results)
+
+        return {name: self.results[name] for name in names}
+
+    def get(self, name):
+        """Result of a single extractor"""
+        return self.extract(name)[name]
+
+
+@extractor('stats')
+def extract_stats(page):
+    return stats_from_fields(page.infobox['fields'])
+
+
+@extractor('image_url')
+def extract_image_url(page):
+    src = page.infobox['image']
+
+    if not src:
+        # No infobox image - use the first real image in the article body
+        start = ARTICLE_START.search(page.html)
+        for tag in ARTICLE_IMG.finditer(page.html, start.end()) if start else []:
+            attrs = dict(IMG_ATTR.findall(tag.group(0)))
+            candidate = attrs.get('src', '')
+            if candidate.startswith('data:'):
+                candidate = attrs.get('data-src', '')
+            if candidate:
+                src = html_lib.unescape(candidate)
+                break
+
+    return full_size_image(src) if src else None
+
+
+@extractor('categories')
+def extract_categories(page):
+    match = CATEGORIES_JS.search(page.html)
+    if not match:
+        return []
+    try:
+        return json.loads(match.group(1))
+    except ValueError:
+        return []
+
+
+@extractor('trait_mentions')
+def extract_trait_mentions(page):
+    text = page.text
+    mentions = {}
+    for trait in load_trait_names():
+        count = len(re.findall(r'(?<!\w)' + re.escape(trait) + r'(?!\w)', text))
+        if count:
+            mentions[trait] = count
+    return mentions
@@ -0,0 +1,132 @@
+"""
+Shared Wiki Title Set
+Complete, deduplicated list of brainrot page titles built from the wiki's
+category listings (list=categorymembers, following cmcontinue), so the
+compare/verify scripts reuse one list instead of each re-scraping pages.
+
+A listing where any category failed is never saved: the compare/verify
+scripts would report every brainrot in that category as missing from the
+wiki.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import wiki_api
+
+TITLES_PATH = 'data/wiki_titles.json'
+
+BRAINROT_CATEGORIES = [
+    'Brainrots',
+    'Secret_Brainrots',
+    'Brainrot_God',
+    'OG_Brainrots',
+    'Mythic_Brainrots',
+    'Legendary_Brainrots',
+    'Epic_Brainrots',
+    'Rare_Brainrots',
+    'Common_Brainrots',
+    'Halloween',
+    'Christmas',
+    'Limited_Brainrots',
+    'Event_Brainrots'
+]
+
+
+class IncompleteTitleList(RuntimeError):
+    """Some categories could not be listed"""
+
+    def __init__(self, failed):
+        self.failed = failed
+        super().__init__(f"could not list {len(failed)} categories: {', '.join(sorted(failed))}")
+
+
+def list_categories(backend, categories, workers=4):
+    """List several categories in parallel
+
+    Returns ({category: [titles]}, {category: error}) - failed categories are
+    left out of the first dict, never reported as empty.
+    """
+    def list_one(category):
+        try:
+            return wiki_api.list_category_members(backend, category), None
+        except Exception as e:
+            print(f"   ❌ {category}: {e}")
+            return None, e
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = dict(zip(categories, pool.map(list_one, categories)))
+
+    by_category = {category: members for category, (members, error) in results.items() if error is None}
+    failed = {category: error for category, (members, error) in results.items() if error is not None}
+    return by_category, failed
+
+
+def build_title_set(backend, categories=BRAINROT_CATEGORIES, include_all_pages=True):
+    """Build the shared title set from category listings (and optionally all pages)
+
+    Raises IncompleteTitleList if any category failed to list.
+    """
+    by_category, failed = list_categories(backend, categories)
+    if failed:
+        raise IncompleteTitleList(failed)
+    all_pages = wiki_api.list_all_pages(backend) if include_all_pages else None
+    return title_set_from_categories(by_category, all_pages)
+
+
+def title_set_from_categories(by_category, all_pages=None):
+    """Deduplicate category listings into the saved title set format"""
+    titles = set()
+    for members in by_category.values():
+        titles.update(members)
+
+    data = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'total_titles': len(titles),
+        'titles': sorted(titles),
+        'categories': {category: sorted(members) for category, members in by_category.items()}
+    }
+
+    if all_pages is not None:
+        data['all_pages'] = sorted(set(all_pages))
+
+    return data
+
+
+def save_title_set(data, path=TITLES_PATH):
+    """Save the title set to disk"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _load_saved(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    print(f"📄 Loaded {len(data['titles'])} wiki titles from {path} ({data.get('generated_at', 'unknown date')})")
+    return set(data['titles'])
+
+
+def load_titles(path=TITLES_PATH, refresh=False, backend=None):
+    """Return the set of brainrot page titles
+
+    Uses the saved title set when it exists; otherwise (or with refresh=True)
+    lists the categories through the API and saves the result for next time.
+    If a category fails to list, the saved set is kept and used instead (or
+    IncompleteTitleList is raised when there is none).
+    """
+    if not refresh and os.path.exists(path):
+        return _load_saved(path)
+
+    print("🔍 Listing wiki categories through the API...")
+    try:
+        data = build_title_set(backend or wiki_api.get_backend())
+    except IncompleteTitleList as e:
+        if not os.path.exists(path):
+            raise
+        print(f"⚠️  {e} - keeping the saved list")
+        return _load_saved(path)
+    save_title_set(data, path)
+    print(f"💾 Saved {len(data['titles'])} wiki titles to {path}")
+    return set(data['titles'])